@@ -15,7 +15,7 @@ _drex_completion() {
     local dataset_commands="stats"
     
     # Robot subcommands
-    local robot_commands="run"
+    local robot_commands="run export-onnx serve"
     
     # Wandb subcommands
     local wandb_commands="download"
@@ -23,7 +23,9 @@ _drex_completion() {
     # Common options
     local common_options="--help -h"
     local wandb_options="--base-dir"
-    local robot_run_options="--robot-port --robot-id --screwdriver-camera --side-camera --top-camera --camera-width --camera-height --camera-fps --duration --fps --device --screwdriver-current-limit --clutch-ratio --clutch-cooldown-s --base-dir"
+    local robot_run_options="--robot-port --robot-id --screwdriver-camera --side-camera --top-camera --camera-width --camera-height --camera-fps --duration --fps --device --screwdriver-current-limit --clutch-ratio --clutch-cooldown-s --base-dir --backend --policy-server"
+    local robot_export_onnx_options="--output --opset --num-samples --atol --benchmark-iterations"
+    local robot_serve_options="--socket-path --device --backend --batch-window-ms"
 
     case $cword in
         1)
@@ -84,6 +86,10 @@ _drex_completion() {
                     # First positional argument is required wandb_weights_path, no completion for that
                     COMPREPLY=($(compgen -W "$robot_run_options $common_options" -- "$cur"))
                     ;;
+                export-onnx|serve)
+                    # First positional argument is the pretrained_model directory
+                    COMPREPLY=($(compgen -d -- "$cur"))
+                    ;;
                 *)
                     COMPREPLY=()
                     ;;
@@ -159,6 +165,12 @@ _drex_completion() {
                             # Directory completion
                             COMPREPLY=($(compgen -d -- "$cur"))
                             ;;
+                        --backend)
+                            COMPREPLY=($(compgen -W "torch onnx" -- "$cur"))
+                            ;;
+                        --policy-server)
+                            COMPREPLY=($(compgen -f -- "$cur"))
+                            ;;
                         *)
                             # Check if command is for robot run
                             if [[ "${words[1]}" == "robot" && "${words[2]}" == "run" ]]; then
@@ -169,6 +181,33 @@ _drex_completion() {
                             ;;
                     esac
                     ;;
+                export-onnx)
+                    case $prev in
+                        --output)
+                            COMPREPLY=($(compgen -f -- "$cur"))
+                            ;;
+                        *)
+                            COMPREPLY=($(compgen -W "$robot_export_onnx_options $common_options" -- "$cur"))
+                            ;;
+                    esac
+                    ;;
+                serve)
+                    case $prev in
+                        --socket-path)
+                            COMPREPLY=($(compgen -f -- "$cur"))
+                            ;;
+                        --device)
+                            COMPREPLY=($(compgen -W "cuda cpu" -- "$cur"))
+                            ;;
+                        --backend)
+                            COMPREPLY=($(compgen -W "torch onnx" -- "$cur"))
+                            ;;
+                        *)
+                            # More pretrained_model directories or options
+                            COMPREPLY=($(compgen -d -- "$cur") $(compgen -W "$robot_serve_options $common_options" -- "$cur"))
+                            ;;
+                    esac
+                    ;;
                 *)
                     COMPREPLY=()
                     ;;
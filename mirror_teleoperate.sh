@@ -0,0 +1,19 @@
+#!/bin/bash
+
+# One screwdriver leader mirrored onto several screwdriver followers
+python -m assembler0_robot.scripts.mirror_teleoperate \
+    --robot_ports /dev/servo_5837053138 /dev/servo_5837053139 \
+    --robot_ids koch_screwdriver_follower_20250814 koch_screwdriver_follower_b \
+    --robot_cameras "screwdriver=/dev/video0,side=/dev/video2" "screwdriver=/dev/video4" \
+    --leader_port=/dev/servo_585A007782 \
+    --leader_id=koch_screwdriver_leader_20250814 \
+    --camera_width=800 \
+    --camera_height=600 \
+    --camera_fps=30 \
+    --fps=30 \
+    --screwdriver_current_limit=300 \
+    --clutch_ratio=0.5 \
+    --clutch_cooldown_s=1.0 \
+    --gripper_open_pos=50.0 \
+    --haptic_range=4.0 \
+    --latency_sweep_s=5
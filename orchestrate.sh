@@ -0,0 +1,9 @@
+#!/bin/bash
+
+CONFIG=${1:-cells.example.json}
+
+# Record with several screwdriver cells from a single process
+python -m assembler0_robot.scripts.orchestrate \
+    --config=${CONFIG} \
+    --status_interval_s=5 \
+    --log_level=INFO
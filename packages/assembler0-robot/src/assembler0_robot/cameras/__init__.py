@@ -0,0 +1,22 @@
+#!/usr/bin/env python
+
+from .capture_transform import (
+    CaptureTransform,
+    TransformedOpenCVCamera,
+    camera_feature_shape,
+    make_cameras,
+    parse_camera_transforms,
+)
+from .mjpeg import MJPEGCamera, MJPEGCameraConfig, MJPEGFrame, as_pixels
+
+__all__ = [
+    "CaptureTransform",
+    "MJPEGCamera",
+    "MJPEGCameraConfig",
+    "MJPEGFrame",
+    "TransformedOpenCVCamera",
+    "as_pixels",
+    "camera_feature_shape",
+    "make_cameras",
+    "parse_camera_transforms",
+]
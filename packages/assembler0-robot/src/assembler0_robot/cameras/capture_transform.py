@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+
+import json
+import logging
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+from lerobot.cameras import Camera, CameraConfig
+from lerobot.cameras.opencv import OpenCVCamera
+from lerobot.cameras.utils import make_cameras_from_configs
+
+from .mjpeg import MJPEGCamera
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CaptureTransform:
+    # Region of the captured frame to keep, as (x, y, width, height) in capture pixels. Applied first.
+    crop: tuple[int, int, int, int] | None = None
+    # Output size as (height, width), applied after the crop.
+    resize: tuple[int, int] | None = None
+    # Convert to grayscale. The gray value is replicated over 3 channels so the frames stay compatible with
+    # the video encoders and policies, while the constant chroma costs next to nothing once encoded.
+    grayscale: bool = False
+
+    def __post_init__(self):
+        if self.crop is not None:
+            self.crop = tuple(int(v) for v in self.crop)
+            if len(self.crop) != 4 or self.crop[0] < 0 or self.crop[1] < 0 or min(self.crop[2:]) <= 0:
+                raise ValueError(f"crop must be (x, y, width, height) with a positive size, got {self.crop}")
+        if self.resize is not None:
+            self.resize = tuple(int(v) for v in self.resize)
+            if len(self.resize) != 2 or min(self.resize) <= 0:
+                raise ValueError(f"resize must be (height, width) with a positive size, got {self.resize}")
+
+    @property
+    def is_identity(self) -> bool:
+        return self.crop is None and self.resize is None and not self.grayscale
+
+    def output_shape(self, height: int, width: int) -> tuple[int, int, int]:
+        """Shape of the transformed frame for a camera capturing `height` x `width` frames."""
+        if self.crop is not None:
+            x, y, crop_width, crop_height = self.crop
+            if x + crop_width > width or y + crop_height > height:
+                raise ValueError(f"crop {self.crop} does not fit in a {width}x{height} frame")
+            height, width = crop_height, crop_width
+        if self.resize is not None:
+            height, width = self.resize
+        return (height, width, 3)
+
+    def apply(self, image: np.ndarray) -> np.ndarray:
+        if self.crop is not None:
+            x, y, crop_width, crop_height = self.crop
+            # Slicing is a view, the pixels are only copied by the resize or the final copy below
+            image = image[y : y + crop_height, x : x + crop_width]
+        if self.resize is not None:
+            height, width = self.resize
+            if image.shape[:2] != (height, width):
+                # INTER_AREA averages source pixels when shrinking, which avoids aliasing at no extra cost
+                image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+        if self.grayscale:
+            image = cv2.cvtColor(cv2.cvtColor(image, cv2.COLOR_RGB2GRAY), cv2.COLOR_GRAY2RGB)
+        return np.ascontiguousarray(image)
+
+
+class TransformedOpenCVCamera(OpenCVCamera):
+    """OpenCV camera that applies a `CaptureTransform` to every frame it reads.
+
+    The transform runs inside `read()`, so with `async_read()` it happens once per frame on the camera's
+    background thread and the control loop only ever sees the small frame.
+    """
+
+    def __init__(self, config, transform: CaptureTransform):
+        super().__init__(config)
+        self.transform = transform
+
+    def _postprocess_image(self, image: np.ndarray, color_mode=None) -> np.ndarray:
+        return self.transform.apply(super()._postprocess_image(image, color_mode))
+
+
+def make_cameras(
+    camera_configs: dict[str, CameraConfig], transforms: dict[str, CaptureTransform] | None = None
+) -> dict[str, Camera]:
+    """`make_cameras_from_configs` with optional per-camera capture transforms and MJPEG passthrough."""
+    transforms = {name: t for name, t in (transforms or {}).items() if not t.is_identity}
+    unknown = set(transforms) - set(camera_configs)
+    if unknown:
+        raise ValueError(f"Capture transforms given for unknown cameras: {sorted(unknown)}")
+
+    cameras = make_cameras_from_configs(
+        {
+            name: cfg
+            for name, cfg in camera_configs.items()
+            if name not in transforms and cfg.type != "opencv_mjpeg"
+        }
+    )
+    for name, cfg in camera_configs.items():
+        if cfg.type == "opencv_mjpeg":
+            if name in transforms:
+                raise ValueError(f"Capture transforms need decoded frames, {name} uses MJPEG passthrough")
+            cameras[name] = MJPEGCamera(cfg)
+    for name, transform in transforms.items():
+        cfg = camera_configs[name]
+        if cfg.type != "opencv":
+            raise ValueError(f"Capture transforms are only supported for opencv cameras, {name} is {cfg.type}")
+        cameras[name] = TransformedOpenCVCamera(cfg, transform)
+    # Keep the configured camera order
+    return {name: cameras[name] for name in camera_configs}
+
+
+def camera_feature_shape(config: CameraConfig, transform: CaptureTransform | None = None) -> tuple[int, int, int]:
+    """Dataset feature shape of a camera, after its capture transform."""
+    if transform is None:
+        return (config.height, config.width, 3)
+    return transform.output_shape(config.height, config.width)
+
+
+def parse_camera_transforms(text: str | None) -> dict[str, CaptureTransform]:
+    """Parse `{"screwdriver": {"crop": [200, 150, 400, 300], "resize": [224, 224], "grayscale": false}}`."""
+    if not text:
+        return {}
+    return {name: CaptureTransform(**options) for name, options in json.loads(text).items()}
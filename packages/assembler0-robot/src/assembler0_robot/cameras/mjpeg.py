@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+from lerobot.cameras import CameraConfig, ColorMode, Cv2Rotation
+from lerobot.cameras.opencv import OpenCVCamera, OpenCVCameraConfig
+from lerobot.errors import DeviceNotConnectedError
+
+logger = logging.getLogger(__name__)
+
+# cv2.imdecode flags that let libjpeg scale down in the DCT domain, by reduction factor
+_REDUCED_DECODE_FLAGS = {2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}
+
+
+class MJPEGFrame:
+    """A camera frame kept as the JPEG the camera sent, decoded to RGB only when pixels are needed.
+
+    Behaves like an (height, width, 3) uint8 array for consumers that go through `np.asarray()`. The full
+    decode is cached, so the policy, the visualizer and the dataset can share one frame and pay for at
+    most one decode.
+    """
+
+    __slots__ = ("data", "height", "width", "_pixels", "_lock")
+
+    dtype = np.dtype(np.uint8)
+    ndim = 3
+
+    def __init__(self, data: bytes, height: int, width: int):
+        self.data = data
+        self.height = height
+        self.width = width
+        self._pixels: np.ndarray | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        return (self.height, self.width, 3)
+
+    @property
+    def nbytes(self) -> int:
+        # What the frame actually holds in memory, not the decoded size
+        return len(self.data)
+
+    def decode(self) -> np.ndarray:
+        with self._lock:
+            if self._pixels is None:
+                bgr = cv2.imdecode(np.frombuffer(self.data, dtype=np.uint8), cv2.IMREAD_COLOR)
+                if bgr is None:
+                    raise RuntimeError("Failed to decode MJPEG frame")
+                self._pixels = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+            return self._pixels
+
+    def decode_reduced(self, max_width: int) -> np.ndarray:
+        """Decode at 1/2, 1/4 or 1/8 scale, whichever is the largest that fits in `max_width`."""
+        factor = next((f for f in (2, 4, 8) if self.width // f <= max_width), None)
+        if max_width <= 0 or self.width <= max_width or factor is None:
+            return self.decode()
+        bgr = cv2.imdecode(np.frombuffer(self.data, dtype=np.uint8), _REDUCED_DECODE_FLAGS[factor])
+        return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+    def __array__(self, dtype=None, copy=None):
+        pixels = self.decode()
+        return pixels if dtype is None else pixels.astype(dtype)
+
+
+def as_pixels(image) -> np.ndarray:
+    """Pixels of a camera frame, decoding it if it is an `MJPEGFrame`."""
+    return image.decode() if isinstance(image, MJPEGFrame) else image
+
+
+@CameraConfig.register_subclass("opencv_mjpeg")
+@dataclass
+class MJPEGCameraConfig(OpenCVCameraConfig):
+    """OpenCV camera config that captures MJPEG and keeps frames compressed, see `MJPEGCamera`."""
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.color_mode != ColorMode.RGB or self.rotation != Cv2Rotation.NO_ROTATION:
+            raise ValueError("MJPEG passthrough only supports RGB frames without rotation")
+
+
+class MJPEGCamera(OpenCVCamera):
+    """OpenCV camera that returns `MJPEGFrame`s instead of decoded arrays.
+
+    The device is asked for MJPEG and OpenCV's conversion to BGR is turned off, so `read()` only copies
+    the compressed buffer the driver handed over. If the backend ignores that request and still returns
+    decoded frames, those are passed through as plain arrays.
+    """
+
+    def __init__(self, config: MJPEGCameraConfig):
+        super().__init__(config)
+        self.frames = 0
+        self.frame_bytes = 0
+        self._passthrough = True
+
+    def _configure_capture_settings(self) -> None:
+        self.videocapture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        super()._configure_capture_settings()
+        if not self.videocapture.set(cv2.CAP_PROP_CONVERT_RGB, 0):
+            logger.warning(f"{self} cannot disable frame decoding, MJPEG passthrough is off")
+
+    def read(self, color_mode: ColorMode | None = None):
+        if not self.is_connected:
+            raise DeviceNotConnectedError(f"{self} is not connected.")
+
+        start_time = time.perf_counter()
+        ret, buffer = self.videocapture.read()
+        if not ret or buffer is None:
+            raise RuntimeError(f"{self} read failed (status={ret}).")
+
+        if buffer.ndim == 3:
+            # The backend decoded the frame anyway
+            if self._passthrough:
+                logger.warning(f"{self} returned decoded frames, MJPEG passthrough is off")
+                self._passthrough = False
+            return self._postprocess_image(buffer, color_mode)
+
+        frame = MJPEGFrame(buffer.tobytes(), self.capture_height, self.capture_width)
+        self.frames += 1
+        self.frame_bytes += frame.nbytes
+        logger.debug(f"{self} read took: {(time.perf_counter() - start_time) * 1e3:.1f}ms")
+        return frame
+
+    def format_stats(self) -> str:
+        if not self.frames:
+            return f"{self}: no MJPEG frames captured"
+        mean_bytes = self.frame_bytes / self.frames
+        raw_bytes = self.capture_height * self.capture_width * 3
+        return (
+            f"{self}: {self.frames} MJPEG frames, {mean_bytes / 1e3:.1f} KB/frame "
+            f"({100 * mean_bytes / raw_bytes:.1f}% of decoded size)"
+        )
@@ -0,0 +1 @@
+# Policy execution helpers shared by the inference scripts.
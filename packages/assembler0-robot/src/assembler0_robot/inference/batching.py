@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import torch
+
+from assembler0_robot.inference.packing import ObservationPacker
+from assembler0_robot.inference.registry import predicts_chunks
+from assembler0_robot.utils.timing import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Request:
+    observation: dict[str, Any]
+    horizon: int
+    task: str | None
+    arrival_t: float
+    done: threading.Event = field(default_factory=threading.Event)
+    actions: np.ndarray | None = None
+    error: Exception | None = None
+
+
+class RequestBatcher:
+    """Run action chunk requests for one model from many clients as batched `predict_action_chunk` calls.
+
+    The first request to arrive opens a window of `window_s`. Requests arriving before it closes join
+    the batch, up to `max_batch_size`. The batch is then packed into one preallocated
+    `ObservationPacker` batch and run through the model once, and each client gets its own row back.
+    Requests that arrive while the model runs wait for the next batch, so under load batches fill up
+    without waiting for the window.
+
+    All clients of a model must send the same state keys and cameras. Each request carries its client's
+    task, and either every client sends one or none does. The model itself keeps no per-client state.
+    Policies that stack an observation history inside the policy (`n_obs_steps` > 1) cannot share it
+    between clients and are refused.
+    """
+
+    def __init__(
+        self,
+        policy,
+        lock: threading.Lock,
+        device: str,
+        window_s: float = 0.005,
+        max_batch_size: int = 8,
+    ):
+        if not predicts_chunks(policy):
+            raise ValueError(f"{type(policy).__name__} only predicts actions through select_action")
+        if getattr(policy.config, "n_obs_steps", 1) > 1:
+            raise ValueError(
+                f"{type(policy).__name__} keeps an observation history and cannot be batched across clients"
+            )
+        self.policy = policy
+        self.lock = lock
+        self.device = device
+        self.window_s = window_s
+        self.max_batch_size = max_batch_size
+        self.packer: ObservationPacker | None = None
+        self.with_task: bool | None = None
+        self.model_time = LatencyStats()
+        self.request_latency = LatencyStats()
+        self.batch_sizes: Counter[int] = Counter()
+
+        self._requests: list[_Request] = []
+        self._condition = threading.Condition()
+        self._stop = False
+        self._start_t = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="request-batcher", daemon=True)
+        self._thread.start()
+
+    def configure(self, state_keys: list[str], camera_names: list[str], task: str | None = None) -> None:
+        """Set up the batch packer on the first client, check that later ones send the same observations."""
+        with self._condition:
+            if self.packer is None:
+                # Tasks are packed per request
+                self.packer = ObservationPacker(state_keys, camera_names, self.device, batch_size=self.max_batch_size)
+                self.with_task = task is not None
+            elif state_keys != self.packer.state_keys or camera_names != self.packer.camera_names:
+                raise ValueError(
+                    f"Clients of a batched model must send the same observations: got state {state_keys} and "
+                    f"cameras {camera_names}, expected {self.packer.state_keys} and {self.packer.camera_names}"
+                )
+            elif (task is not None) != self.with_task:
+                raise ValueError(
+                    "Clients of a batched model must all send a task or all send none, "
+                    f"{'the first one did' if self.with_task else 'the first one did not'}"
+                )
+
+    def submit(self, observation: dict[str, Any], horizon: int, task: str | None = None) -> np.ndarray:
+        """First `horizon` actions of a chunk predicted for `observation` and `task`, (horizon, action_dim).
+
+        Blocks until the batch the request joins has run. `observation` must stay valid until then.
+        """
+        request = _Request(observation, horizon, task, time.perf_counter())
+        with self._condition:
+            self._requests.append(request)
+            self._condition.notify()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.actions
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stop = True
+            self._condition.notify()
+        self._thread.join()
+
+    def summary(self) -> dict[str, float]:
+        requests = sum(size * count for size, count in self.batch_sizes.items())
+        batches = sum(self.batch_sizes.values())
+        return {
+            "requests": requests,
+            "batches": batches,
+            "mean_batch_size": requests / batches if batches else 0.0,
+            "requests_per_s": requests / (time.perf_counter() - self._start_t),
+            "model_p50_ms": self.model_time.summary()["p50_ms"],
+            "request_p50_ms": self.request_latency.summary()["p50_ms"],
+            "request_p95_ms": self.request_latency.summary()["p95_ms"],
+        }
+
+    def format_stats(self) -> str:
+        s = self.summary()
+        return (
+            f"{s['requests']} requests in {s['batches']} batches (mean size {s['mean_batch_size']:.1f}), "
+            f"model {self.model_time.format()}, request {self.request_latency.format()}"
+        )
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._requests and not self._stop:
+                    self._condition.wait()
+                if self._stop:
+                    for request in self._requests:
+                        request.error = RuntimeError("Request batcher stopped")
+                        request.done.set()
+                    return
+                deadline = self._requests[0].arrival_t + self.window_s
+                while len(self._requests) < self.max_batch_size and not self._stop:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._requests[: self.max_batch_size]
+                del self._requests[: self.max_batch_size]
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: list[_Request]) -> None:
+        start = time.perf_counter()
+        try:
+            with self.lock, torch.inference_mode():
+                tasks = [request.task for request in batch] if self.with_task else None
+                packed = self.packer.pack_batch([request.observation for request in batch], tasks)
+                horizon = max(request.horizon for request in batch)
+                chunks = self.policy.predict_action_chunk(packed)[:, :horizon]
+                chunks = chunks.to("cpu").numpy().astype(np.float32, copy=False)
+        except Exception as e:
+            logger.error(f"Batch of {len(batch)} failed: {e}")
+            for request in batch:
+                request.error = e
+                request.done.set()
+            return
+
+        end = time.perf_counter()
+        self.model_time.record(end - start)
+        self.batch_sizes[len(batch)] += 1
+        for request, chunk in zip(batch, chunks):
+            request.actions = chunk[: request.horizon]
+            self.request_latency.record(end - request.arrival_t)
+            request.done.set()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+
+import logging
+import threading
+import time
+
+import numpy as np
+
+from assembler0_robot.inference.engine import ActionSmoothness
+from assembler0_robot.utils.timing import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+VELOCITY_MODES = ["hold", "ramp"]
+
+
+class JointTrajectory:
+    """Goal for every action dimension as a function of time, through the actions of a chunk.
+
+    Position joints follow a shape-preserving piecewise cubic (PCHIP, Fritsch-Carlson slopes) through
+    the knots: it passes through every action, does not overshoot between them and has continuous
+    velocity. The first knot starts at `start_velocity` when given, so a trajectory replacing another
+    one mid-motion continues at the same speed, and the last knot is reached at rest.
+
+    Velocity joints (the screwdriver) are commands, not positions: with `ramp_velocity` they change
+    linearly from one knot to the next, otherwise each knot's command is held over the interval that
+    leads up to it. Past the last knot they are commanded to stop, like `hold_action()` does when the
+    action queue runs dry.
+    """
+
+    def __init__(
+        self,
+        times: np.ndarray,
+        actions: np.ndarray,
+        velocity_joints: list[int],
+        ramp_velocity: bool = False,
+        start_velocity: np.ndarray | None = None,
+    ):
+        self.times = np.asarray(times, dtype=np.float64)
+        self.actions = np.asarray(actions, dtype=np.float64)
+        self.velocity_joints = velocity_joints
+        self.ramp_velocity = ramp_velocity
+        self.position_joints = [i for i in range(self.actions.shape[1]) if i not in velocity_joints]
+        self._slopes = self._pchip_slopes(self.actions[:, self.position_joints], start_velocity)
+
+    def sample(self, t: float) -> np.ndarray:
+        goal = np.empty(self.actions.shape[1])
+        goal[self.position_joints] = self._position(t)
+        if self.velocity_joints:
+            goal[self.velocity_joints] = self._velocity_command(t)
+        return goal
+
+    def rate(self, t: float) -> np.ndarray:
+        """Time derivative of the position joints' goal at `t`."""
+        i, s, h = self._segment(t)
+        if i is None:
+            return np.zeros(len(self.position_joints))
+        y0, y1 = self.actions[i, self.position_joints], self.actions[i + 1, self.position_joints]
+        m0, m1 = self._slopes[i], self._slopes[i + 1]
+        return (
+            (6 * s**2 - 6 * s) / h * y0
+            + (3 * s**2 - 4 * s + 1) * m0
+            + (6 * s - 6 * s**2) / h * y1
+            + (3 * s**2 - 2 * s) * m1
+        )
+
+    def _position(self, t: float) -> np.ndarray:
+        i, s, h = self._segment(t)
+        positions = self.actions[:, self.position_joints]
+        if i is None:
+            return positions[0] if t <= self.times[0] else positions[-1]
+        # Cubic Hermite basis
+        return (
+            (2 * s**3 - 3 * s**2 + 1) * positions[i]
+            + (s**3 - 2 * s**2 + s) * h * self._slopes[i]
+            + (3 * s**2 - 2 * s**3) * positions[i + 1]
+            + (s**3 - s**2) * h * self._slopes[i + 1]
+        )
+
+    def _velocity_command(self, t: float) -> np.ndarray:
+        commands = self.actions[:, self.velocity_joints]
+        if t > self.times[-1]:
+            return np.zeros(len(self.velocity_joints))
+        if self.ramp_velocity:
+            return np.array([np.interp(t, self.times, commands[:, j]) for j in range(commands.shape[1])])
+        i = min(int(np.searchsorted(self.times, t, side="left")), len(self.times) - 1)
+        return commands[i]
+
+    def _segment(self, t: float) -> tuple[int | None, float, float]:
+        """Segment index, normalized position within it and its duration, or None outside the knots."""
+        if len(self.times) < 2 or t <= self.times[0] or t >= self.times[-1]:
+            return None, 0.0, 0.0
+        i = int(np.searchsorted(self.times, t, side="right")) - 1
+        h = self.times[i + 1] - self.times[i]
+        return i, (t - self.times[i]) / h, h
+
+    def _pchip_slopes(self, positions: np.ndarray, start_velocity: np.ndarray | None) -> np.ndarray:
+        slopes = np.zeros_like(positions)
+        if len(self.times) < 2:
+            return slopes
+        h = np.diff(self.times)[:, None]
+        secants = np.diff(positions, axis=0) / h
+        if len(self.times) > 2:
+            # Weighted harmonic mean of the neighbouring secants, flat where they disagree in sign
+            w1 = 2 * h[1:] + h[:-1]
+            w2 = h[1:] + 2 * h[:-1]
+            before, after = secants[:-1], secants[1:]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                harmonic = (w1 + w2) / (w1 / before + w2 / after)
+            slopes[1:-1] = np.where(before * after > 0, harmonic, 0.0)
+        if start_velocity is not None:
+            # Velocity continuity wins over monotonicity on the first, one control tick long, segment
+            slopes[0] = start_velocity
+        return slopes
+
+
+class InterpolatingController:
+    """Stream goals interpolated from the policy's action chunks to the robot on a dedicated thread.
+
+    The control loop hands over the upcoming actions every tick with `update()`. The controller fits a
+    `JointTrajectory` through them, starting from wherever its current goal is and at the speed it is
+    moving, and sends the goal at the current time to the robot every 1 / `rate_hz` seconds. Motion
+    quality no longer depends on the model or camera rate, and new chunks blend in without a step.
+
+    Nothing is sent before the first `update()`. When no new actions arrive the goal comes to rest at
+    the last one and velocity joints stop. `stop()` sends one last goal with the velocity joints at 0.
+    If `send_action` raises, the thread stops and the exception is kept in `error`.
+    """
+
+    def __init__(
+        self,
+        robot,
+        action_keys: list[str],
+        rate_hz: float = 100.0,
+        velocity_mode: str = "hold",
+    ):
+        if velocity_mode not in VELOCITY_MODES:
+            raise ValueError(f"Unknown velocity mode {velocity_mode}, expected one of {VELOCITY_MODES}")
+        self.robot = robot
+        self.action_keys = action_keys
+        self.period = 1 / rate_hz
+        self.velocity_joints = [i for i, key in enumerate(action_keys) if key.endswith(".vel")]
+        self.ramp_velocity = velocity_mode == "ramp"
+        self.send_time = LatencyStats()
+        self.smoothness = ActionSmoothness()
+        self.commands = 0
+        self.overruns = 0
+        self.stale = 0
+        self.error: Exception | None = None
+
+        self._trajectory: JointTrajectory | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="joint-control", daemon=True)
+        self._thread.start()
+
+    def update(self, actions: np.ndarray, first_t: float, dt: float) -> None:
+        """Follow `actions`, (n, action_dim), reaching the k-th one at `first_t + k * dt` (perf_counter time)."""
+        if not len(actions):
+            return
+        times = first_t + dt * np.arange(len(actions))
+        now = time.perf_counter()
+        with self._lock:
+            current = self._trajectory
+            start_velocity = None
+            if current is not None:
+                # Knots closer than a control period would make a needlessly steep first segment
+                keep = times > now + self.period
+                if not keep.any():
+                    self.stale += 1
+                    return
+                times = np.concatenate([[now], times[keep]])
+                actions = np.concatenate([current.sample(now)[None], actions[keep]])
+                start_velocity = current.rate(now)
+            self._trajectory = JointTrajectory(
+                times, actions, self.velocity_joints, self.ramp_velocity, start_velocity=start_velocity
+            )
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        with self._lock:
+            trajectory = self._trajectory
+        if trajectory is None or self.error is not None:
+            return
+        goal = trajectory.sample(time.perf_counter())
+        goal[self.velocity_joints] = 0.0
+        try:
+            self.robot.send_action(dict(zip(self.action_keys, goal.tolist())))
+        except Exception as e:
+            logger.error(f"Sending the final stop goal failed: {e}")
+
+    def format_stats(self) -> str:
+        return (
+            f"{self.commands} goals at {1 / self.period:.0f} Hz, send {self.send_time.format()}, "
+            f"{self.overruns} overruns, {self.stale} stale chunks, goals {self.smoothness.format()}"
+        )
+
+    def _run(self) -> None:
+        next_t = time.perf_counter()
+        while not self._stop.is_set():
+            with self._lock:
+                trajectory = self._trajectory
+            if trajectory is not None:
+                start = time.perf_counter()
+                goal = trajectory.sample(start)
+                try:
+                    self.robot.send_action(dict(zip(self.action_keys, goal.tolist())))
+                except Exception as e:
+                    logger.error(f"Sending interpolated goal failed: {e}")
+                    self.error = e
+                    return
+                self.send_time.record(time.perf_counter() - start)
+                self.smoothness.record(goal)
+                self.commands += 1
+
+            next_t += self.period
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Behind schedule (slow bus), skip the missed ticks rather than burst to catch up
+                self.overruns += 1
+                next_t = time.perf_counter()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from assembler0_robot.utils.timing import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+def hold_action(observation: dict[str, Any], action_names: list[str]) -> dict[str, float]:
+    """Action that keeps the robot where it is: joints hold their measured position, velocities stop."""
+    return {name: float(observation[name]) if name.endswith(".pos") else 0.0 for name in action_names}
+
+
+class ActionQueue:
+    """Actions planned for upcoming control ticks, filled by the policy thread and drained by the loop.
+
+    Every action belongs to the tick it was planned for. A chunk computed from the observation of tick
+    `t` starts at tick `t`, so the actions whose tick went by while the model was running are skipped
+    when it is pushed. The rest replace whatever was still queued, or, with `ensemble_coeff` set, are
+    blended into it with ACT's exponential temporal ensembling: the k-th prediction for a tick (k=0 for
+    the oldest) gets weight exp(-ensemble_coeff * k), so a positive coefficient favours older predictions
+    and a negative one newer predictions.
+    """
+
+    def __init__(
+        self, action_dim: int, max_size: int, ensemble_coeff: float | None = None, depth_window: int = 1024
+    ):
+        self.max_size = max_size
+        self.ensemble_coeff = ensemble_coeff
+        self.next_tick = 0
+        self.pushed = 0
+        self.stale = 0
+        self.popped = 0
+        self.empty = 0
+
+        self._actions = np.zeros((max_size, action_dim), dtype=np.float32)
+        # Sum of ensembling weights and number of predictions blended into each queued action
+        self._weights = np.zeros(max_size, dtype=np.float64)
+        self._counts = np.zeros(max_size, dtype=np.int64)
+        self._start_tick = 0
+        self._size = 0
+        self._depths: deque[int] = deque(maxlen=depth_window)
+        self._lock = threading.Lock()
+
+    @property
+    def depth(self) -> int:
+        """Number of queued actions for ticks that have not been popped yet."""
+        with self._lock:
+            return max(0, self._start_tick + self._size - self.next_tick)
+
+    def push(self, actions: np.ndarray, obs_tick: int) -> None:
+        with self._lock:
+            skip = max(0, self.next_tick - obs_tick)
+            fresh = actions[skip : skip + self.max_size]
+            self.pushed += 1
+            self.stale += min(skip, len(actions))
+            start_tick = obs_tick + skip
+
+            # Queued actions from `start_tick` on, the ones before it have been popped
+            offset = start_tick - self._start_tick
+            queued = max(0, self._size - offset) if self.ensemble_coeff is not None else 0
+            overlap = min(queued, len(fresh))
+            old_actions = self._actions[offset : offset + queued].copy()
+            old_weights = self._weights[offset : offset + queued].copy()
+            old_counts = self._counts[offset : offset + queued].copy()
+
+            size = max(len(fresh), queued)
+            self._actions[: len(fresh)] = fresh
+            self._weights[: len(fresh)] = 1.0
+            self._counts[: len(fresh)] = 1
+            if overlap:
+                new_weights = np.exp(-self.ensemble_coeff * old_counts[:overlap])
+                total = old_weights[:overlap] + new_weights
+                self._actions[:overlap] = (
+                    old_actions[:overlap] * (old_weights[:overlap] / total)[:, None]
+                    + fresh[:overlap] * (new_weights / total)[:, None]
+                )
+                self._weights[:overlap] = total
+                self._counts[:overlap] = old_counts[:overlap] + 1
+            if queued > len(fresh):
+                # Older chunk reaches further ahead than the new one, keep its tail
+                self._actions[len(fresh) : size] = old_actions[len(fresh) :]
+                self._weights[len(fresh) : size] = old_weights[len(fresh) :]
+                self._counts[len(fresh) : size] = old_counts[len(fresh) :]
+            self._start_tick = start_tick
+            self._size = size
+
+    def pop(self, tick: int) -> np.ndarray | None:
+        """Action planned for `tick`, or None if the queue has run dry."""
+        with self._lock:
+            self.next_tick = tick + 1
+            offset = tick - self._start_tick
+            self._depths.append(max(0, self._size - offset - 1))
+            if offset < 0 or offset >= self._size:
+                self.empty += 1
+                return None
+            self.popped += 1
+            return self._actions[offset].copy()
+
+    def upcoming(self, tick: int) -> np.ndarray:
+        """Queued actions from `tick` on, (n, action_dim), without popping them."""
+        with self._lock:
+            offset = max(0, tick - self._start_tick)
+            return self._actions[offset : self._size].copy()
+
+    def depth_summary(self) -> dict[str, float]:
+        """Mean and min queue depth after each pop, over the recent window."""
+        with self._lock:
+            depths = np.fromiter(self._depths, dtype=np.int64)
+        if not len(depths):
+            return {"mean": 0.0, "min": 0.0}
+        return {"mean": float(depths.mean()), "min": float(depths.min())}
+
+
+class AsyncPolicyRunner:
+    """Run a policy on its own thread so that model latency never stalls the control loop.
+
+    Each tick, the loop hands over its observation with `post()` (a single-slot mailbox, only the latest
+    one is kept) and takes the action for that tick with `pop()`. Whenever fewer than `refill_depth`
+    actions are queued, the policy thread runs `infer` on the latest observation and pushes the returned
+    (n, action_dim) actions, starting at the observation's tick. `pop()` returns None when the queue is
+    empty, and the loop should fall back to `hold_action()`.
+
+    If `infer` raises, the thread stops and the exception is kept in `error` for the loop to re-raise.
+    """
+
+    def __init__(
+        self,
+        infer: Callable[[dict[str, Any]], np.ndarray],
+        action_dim: int,
+        max_queue_size: int = 100,
+        refill_depth: int = 10,
+        ensemble_coeff: float | None = None,
+    ):
+        self.infer = infer
+        self.refill_depth = refill_depth
+        self.queue = ActionQueue(action_dim, max_queue_size, ensemble_coeff=ensemble_coeff)
+        self.latency = LatencyStats()
+        self.error: Exception | None = None
+
+        self._slot: tuple[dict[str, Any], int] | None = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="policy-runner", daemon=True)
+        self._thread.start()
+
+    def post(self, observation: dict[str, Any], tick: int) -> None:
+        # A single attribute store, atomic under the GIL
+        self._slot = (observation, tick)
+        self._ready.set()
+
+    def pop(self, tick: int) -> np.ndarray | None:
+        return self.queue.pop(tick)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._ready.set()
+        self._thread.join()
+
+    def format_stats(self) -> str:
+        depth = self.queue.depth_summary()
+        return (
+            f"model {self.latency.format()} over {self.latency.count} calls, "
+            f"queue depth mean={depth['mean']:.1f} min={depth['min']:.0f}, "
+            f"{self.queue.empty} hold ticks, {self.queue.stale} stale actions skipped"
+        )
+
+    def _run(self) -> None:
+        while True:
+            self._ready.wait()
+            if self._stop.is_set():
+                return
+            self._ready.clear()
+            if self.queue.depth >= self.refill_depth:
+                continue
+            sample, self._slot = self._slot, None
+            if sample is None:
+                continue
+
+            observation, tick = sample
+            start = time.perf_counter()
+            try:
+                actions = np.asarray(self.infer(observation), dtype=np.float32)
+            except Exception as e:
+                logger.error(f"Policy inference failed: {e}")
+                self.error = e
+                return
+            self.latency.record(time.perf_counter() - start)
+            self.queue.push(actions.reshape(-1, actions.shape[-1]), tick)
+
+
+class ActionSmoothness:
+    """How jerky the executed actions are: mean absolute first and second difference between ticks.
+
+    The first difference is the step size between consecutive commands, the second how abruptly that
+    step changes, which is where switching between chunks shows up. Both are averaged over joints.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._prev: np.ndarray | None = None
+        self._prev_step: np.ndarray | None = None
+        self._step_total = 0.0
+        self._step_max = 0.0
+        self._jerk_total = 0.0
+        self._jerk_count = 0
+
+    def record(self, action: np.ndarray) -> None:
+        action = np.asarray(action, dtype=np.float64)
+        if self._prev is not None:
+            step = action - self._prev
+            step_size = float(np.abs(step).mean())
+            self._step_total += step_size
+            self._step_max = max(self._step_max, step_size)
+            self.count += 1
+            if self._prev_step is not None:
+                self._jerk_total += float(np.abs(step - self._prev_step).mean())
+                self._jerk_count += 1
+            self._prev_step = step
+        self._prev = action
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "mean_step": self._step_total / self.count if self.count else 0.0,
+            "max_step": self._step_max,
+            "mean_jerk": self._jerk_total / self._jerk_count if self._jerk_count else 0.0,
+        }
+
+    def format(self) -> str:
+        s = self.summary()
+        return f"|da| mean={s['mean_step']:.3f} max={s['max_step']:.3f}, |d2a| mean={s['mean_jerk']:.3f}"
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STATE_FEATURE = "observation.state"
+IMAGE_FEATURE_PREFIX = "observation.images."
+
+
+@dataclass
+class FeatureSchema:
+    """Which robot observation keys feed the policy, and which robot action keys its output drives.
+
+    State and action keys follow the order of the robot's `observation_features` and `action_features`,
+    the same order `hw_to_dataset_features` gives the recorded dataset the policy was trained on.
+    """
+
+    state_keys: list[str]
+    camera_names: list[str]
+    action_keys: list[str]
+
+    def unpack_action(self, action: np.ndarray) -> dict[str, float]:
+        """Robot action dict from a policy action vector of length `len(action_keys)`."""
+        return dict(zip(self.action_keys, action.tolist()))
+
+
+def policy_feature_shapes(policy) -> tuple[dict[str, tuple[int, ...]], int]:
+    """Input feature shapes (without the batch dimension) and action dimension of a PyTorch or ONNX policy."""
+    config = policy.config
+    input_features = getattr(config, "input_features", None)
+    if input_features is not None:
+        shapes = {name: tuple(feature.shape) for name, feature in input_features.items()}
+        return shapes, config.action_feature.shape[0]
+    # OnnxPolicyConfig and RemotePolicyConfig keep a batch dimension
+    shapes = {name: tuple(shape[1:]) for name, shape in config.input_shapes.items()}
+    return shapes, config.action_dim
+
+
+def feature_schema(observation_features: dict, action_features: dict, policy) -> FeatureSchema:
+    """Match a robot's features against a policy's, raising on anything the policy can't be fed or can't drive.
+
+    Every mismatch is collected and reported at once, so a wrong robot, camera setup or checkpoint is
+    caught before the robot moves. Cameras the policy doesn't use are left out of the schema.
+    """
+    input_shapes, action_dim = policy_feature_shapes(policy)
+    state_keys = [key for key, feature in observation_features.items() if feature is float]
+    robot_cameras = {key: feature for key, feature in observation_features.items() if isinstance(feature, tuple)}
+    action_keys = list(action_features)
+    errors = []
+
+    state_shape = input_shapes.get(STATE_FEATURE)
+    if state_shape is None:
+        state_keys = []
+    elif state_shape != (len(state_keys),):
+        errors.append(f"policy expects a state of shape {state_shape}, the robot has {len(state_keys)} state values")
+
+    camera_names = []
+    for name, shape in input_shapes.items():
+        if not name.startswith(IMAGE_FEATURE_PREFIX):
+            continue
+        camera = name.removeprefix(IMAGE_FEATURE_PREFIX)
+        if camera not in robot_cameras:
+            errors.append(f"policy expects camera {camera}, the robot has {sorted(robot_cameras) or 'no cameras'}")
+            continue
+        height, width, channels = robot_cameras[camera]
+        if shape != (channels, height, width):
+            errors.append(
+                f"policy expects {camera} frames of shape {shape} (CHW), the robot captures "
+                f"{(channels, height, width)}"
+            )
+        camera_names.append(camera)
+
+    if action_dim != len(action_keys):
+        errors.append(f"policy outputs {action_dim} actions, the robot takes {len(action_keys)}: {action_keys}")
+
+    if errors:
+        raise ValueError("Policy and robot features do not match:\n  " + "\n  ".join(errors))
+
+    unused = sorted(set(robot_cameras) - set(camera_names))
+    if unused:
+        logger.info(f"Cameras not used by the policy: {unused}")
+    return FeatureSchema(state_keys=state_keys, camera_names=camera_names, action_keys=action_keys)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+
+import json
+import logging
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+ONNX_MODEL_NAME = "model.onnx"
+ONNX_CONFIG_NAME = "onnx_config.json"
+ACTION_OUTPUT = "action"
+
+
+def import_onnxruntime():
+    try:
+        import onnxruntime
+    except ImportError as e:
+        raise ImportError("onnxruntime is not installed, install it with: pip install onnxruntime") from e
+    return onnxruntime
+
+
+@dataclass
+class OnnxPolicyConfig:
+    """What the ONNX backend needs to know about an exported policy, saved next to the model."""
+
+    input_names: list[str]
+    input_shapes: dict[str, list[int]]
+    chunk_size: int
+    n_action_steps: int
+    action_dim: int
+
+    def save(self, path: Path) -> None:
+        path.write_text(json.dumps(asdict(self), indent=4))
+
+    @classmethod
+    def load(cls, path: Path) -> "OnnxPolicyConfig":
+        return cls(**json.loads(path.read_text()))
+
+
+class ActionChunkModule(torch.nn.Module):
+    """Exportable wrapper of a policy's `predict_action_chunk`: positional input tensors in, action chunk out.
+
+    `predict_action_chunk` normalizes the inputs and unnormalizes the predicted actions with the
+    checkpoint's dataset statistics, so both end up baked into the exported graph.
+    """
+
+    def __init__(self, policy, input_names: list[str]):
+        super().__init__()
+        self.policy = policy
+        self.input_names = input_names
+
+    def forward(self, *inputs: torch.Tensor) -> torch.Tensor:
+        return self.policy.predict_action_chunk(dict(zip(self.input_names, inputs)))
+
+
+def policy_onnx_config(policy) -> OnnxPolicyConfig:
+    config = policy.config
+    input_names = list(config.input_features)
+    return OnnxPolicyConfig(
+        input_names=input_names,
+        input_shapes={name: [1, *config.input_features[name].shape] for name in input_names},
+        chunk_size=config.chunk_size,
+        n_action_steps=config.n_action_steps,
+        action_dim=config.action_feature.shape[0],
+    )
+
+
+def sample_inputs(onnx_config: OnnxPolicyConfig, seed: int = 0) -> dict[str, torch.Tensor]:
+    """Random observation in the policy's input format: images in [0, 1], state around zero."""
+    generator = torch.Generator().manual_seed(seed)
+    inputs = {}
+    for name in onnx_config.input_names:
+        shape = onnx_config.input_shapes[name]
+        if len(shape) == 4:
+            inputs[name] = torch.rand(shape, generator=generator)
+        else:
+            inputs[name] = torch.randn(shape, generator=generator)
+    return inputs
+
+
+def export_policy(policy, output_path: Path, opset: int = 17) -> OnnxPolicyConfig:
+    """Export a PyTorch policy to ONNX on CPU and write its `OnnxPolicyConfig` next to it."""
+    policy.to("cpu")
+    policy.eval()
+    onnx_config = policy_onnx_config(policy)
+    module = ActionChunkModule(policy, onnx_config.input_names)
+    inputs = sample_inputs(onnx_config)
+
+    torch.onnx.export(
+        module,
+        tuple(inputs[name] for name in onnx_config.input_names),
+        str(output_path),
+        input_names=onnx_config.input_names,
+        output_names=[ACTION_OUTPUT],
+        dynamic_axes={name: {0: "batch"} for name in [*onnx_config.input_names, ACTION_OUTPUT]},
+        opset_version=opset,
+        do_constant_folding=True,
+    )
+    onnx_config.save(output_path.with_name(ONNX_CONFIG_NAME))
+    logger.info(f"Exported {type(policy).__name__} to {output_path}")
+    return onnx_config
+
+
+def check_parity(policy, onnx_policy: "OnnxPolicy", num_samples: int = 8) -> dict[str, float]:
+    """Largest absolute and relative action difference between PyTorch and ONNX Runtime over random inputs."""
+    max_abs = 0.0
+    max_rel = 0.0
+    for seed in range(num_samples):
+        inputs = sample_inputs(onnx_policy.config, seed=seed)
+        expected = policy.predict_action_chunk(dict(inputs)).numpy()
+        actual = onnx_policy.predict_action_chunk(inputs).numpy()
+        diff = np.abs(actual - expected)
+        max_abs = max(max_abs, float(diff.max()))
+        max_rel = max(max_rel, float((diff / (np.abs(expected) + 1e-6)).max()))
+    return {"max_abs": max_abs, "max_rel": max_rel}
+
+
+class OnnxPolicy:
+    """Policy backed by an ONNX export of `predict_action_chunk`, run with ONNX Runtime on CPU.
+
+    Mirrors the parts of LeRobot's ACT policy interface the inference loop uses: `predict_action_chunk()`
+    returns the unnormalized (batch, chunk_size, action_dim) chunk and `select_action()` executes the
+    first `n_action_steps` of each chunk before predicting the next one. Inputs are the policy's batch
+    dict and must already be on the CPU.
+    """
+
+    def __init__(self, model_path: Path, config: OnnxPolicyConfig, num_threads: int = 0):
+        ort = import_onnxruntime()
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self.config = config
+        self._action_queue: deque[torch.Tensor] = deque(maxlen=config.n_action_steps)
+
+    @classmethod
+    def from_pretrained(cls, model_dir: str | Path, num_threads: int = 0) -> "OnnxPolicy":
+        model_dir = Path(model_dir)
+        model_path = model_dir / ONNX_MODEL_NAME
+        if not model_path.exists():
+            raise FileNotFoundError(
+                f"No {ONNX_MODEL_NAME} in {model_dir}, export it first with: drex robot export-onnx {model_dir}"
+            )
+        return cls(model_path, OnnxPolicyConfig.load(model_dir / ONNX_CONFIG_NAME), num_threads=num_threads)
+
+    def to(self, device: str | torch.device) -> "OnnxPolicy":
+        if torch.device(device).type != "cpu":
+            raise ValueError("The ONNX backend only runs on CPU")
+        return self
+
+    def reset(self) -> None:
+        self._action_queue.clear()
+
+    def predict_action_chunk(self, batch: dict) -> torch.Tensor:
+        feeds = {name: np.ascontiguousarray(batch[name].numpy()) for name in self.config.input_names}
+        (actions,) = self.session.run([ACTION_OUTPUT], feeds)
+        return torch.from_numpy(actions)
+
+    def select_action(self, batch: dict) -> torch.Tensor:
+        if not self._action_queue:
+            chunk = self.predict_action_chunk(batch)[:, : self.config.n_action_steps]
+            # (batch, n_action_steps, action_dim) -> n_action_steps x (batch, action_dim)
+            self._action_queue.extend(chunk.transpose(0, 1))
+        return self._action_queue.popleft()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+
+import logging
+import time
+from typing import Any
+
+import numpy as np
+import torch
+
+from assembler0_robot.cameras.mjpeg import as_pixels
+from assembler0_robot.utils.timing import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+class ObservationPacker:
+    """Pack robot observations into the policy's batch without allocating tensors every tick.
+
+    The state vector and each camera get their buffers on first use and reuse them afterwards. Joint
+    values and frames are copied once into a host staging buffer, pinned when the policy runs on CUDA.
+    Frames travel to the device as uint8, a quarter of the float32 size. A single `torch.div` into the
+    preallocated float32 input then converts the dtype, scales to [0, 1] and permutes HWC to CHW.
+
+    `pack_batch()` packs up to `batch_size` observations into the leading rows of the same buffers, for
+    callers that run several frames through the policy at once.
+
+    The returned tensors are overwritten by the next `pack()`. The policy reads them and the action is
+    copied back to the CPU every tick, which also orders the next tick's host writes after this tick's
+    transfers.
+    """
+
+    def __init__(
+        self,
+        state_keys: list[str],
+        camera_names: list[str],
+        device: str,
+        task: str | None = None,
+        batch_size: int = 1,
+    ):
+        self.state_keys = state_keys
+        self.camera_names = camera_names
+        self.device = torch.device(device)
+        self.task = task
+        self.batch_size = batch_size
+        self.pin_memory = self.device.type == "cuda"
+        self.allocations = 0
+        self.pack_time = LatencyStats()
+
+        self._state_host = self._empty((batch_size, len(state_keys)), torch.float32, host=True)
+        self._state_np = self._state_host.numpy()
+        self._state = self._device_copy_of(self._state_host)
+        # Per camera: numpy view of the host buffer, host uint8, device uint8, float32 CHW input
+        self._images: dict[str, tuple[np.ndarray, torch.Tensor, torch.Tensor, torch.Tensor]] = {}
+
+    def pack(self, observation: dict[str, Any]) -> dict[str, Any]:
+        return self.pack_batch([observation])
+
+    def pack_batch(self, observations: list[dict[str, Any]], tasks: list[str] | None = None) -> dict[str, Any]:
+        """Pack observations into the leading rows, with one task per row in `tasks` instead of the packer's."""
+        start = time.perf_counter()
+        n = len(observations)
+        if n > self.batch_size:
+            raise ValueError(f"Cannot pack {n} observations into a batch of {self.batch_size}")
+
+        for row, observation in enumerate(observations):
+            for i, key in enumerate(self.state_keys):
+                self._state_np[row, i] = observation[key]
+        batch = {"observation.state": self._rows(self._state_host, self._state, n)}
+
+        for name in self.camera_names:
+            if name not in observations[0]:
+                continue
+            frames = [as_pixels(observation[name]) for observation in observations]
+            host_np, host, device_u8, image = self._image_buffers(name, frames[0].shape)
+            for row, frame in enumerate(frames):
+                np.copyto(host_np[row], frame)
+            device_u8 = self._rows(host, device_u8, n)
+            image = image if n == self.batch_size else image[:n]
+            torch.div(device_u8.permute(0, 3, 1, 2), 255.0, out=image)
+            batch[f"observation.images.{name}"] = image
+
+        if tasks is not None:
+            batch["task"] = tasks
+        elif self.task is not None:
+            batch["task"] = self.task if self.batch_size == 1 else [self.task] * n
+        self.pack_time.record(time.perf_counter() - start)
+        return batch
+
+    def format_stats(self) -> str:
+        ticks = self.pack_time.count
+        per_tick = self.allocations / ticks if ticks else 0.0
+        return (
+            f"packing {self.pack_time.format()}, {self.allocations} buffer allocations over {ticks} ticks "
+            f"({per_tick:.3f}/tick)"
+        )
+
+    def _rows(self, host: torch.Tensor, device: torch.Tensor, n: int) -> torch.Tensor:
+        """First `n` rows of a device buffer, copied over from its host staging buffer."""
+        on_host = device is host
+        if n < self.batch_size:
+            host, device = host[:n], device[:n]
+        if not on_host:
+            device.copy_(host, non_blocking=True)
+        return device
+
+    def _image_buffers(self, name: str, shape: tuple[int, ...]):
+        buffers = self._images.get(name)
+        if buffers is None or buffers[0].shape[1:] != shape:
+            if buffers is not None:
+                logger.warning(f"Camera {name} frame shape changed to {shape}, reallocating its buffers")
+            host = self._empty((self.batch_size, *shape), torch.uint8, host=True)
+            image = self._empty((self.batch_size, shape[2], shape[0], shape[1]), torch.float32, host=False)
+            buffers = (host.numpy(), host, self._device_copy_of(host), image)
+            self._images[name] = buffers
+        return buffers
+
+    def _device_copy_of(self, host: torch.Tensor) -> torch.Tensor:
+        """Device buffer matching a host buffer, or the host buffer itself when the policy runs on CPU."""
+        if self.device.type == "cpu":
+            return host
+        return self._empty(tuple(host.shape), host.dtype, host=False)
+
+    def _empty(self, shape: tuple[int, ...], dtype: torch.dtype, host: bool) -> torch.Tensor:
+        self.allocations += 1
+        if host:
+            return torch.empty(shape, dtype=dtype, pin_memory=self.pin_memory)
+        return torch.empty(shape, dtype=dtype, device=self.device)
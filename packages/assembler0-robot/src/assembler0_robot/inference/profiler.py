@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from assembler0_robot.utils.timing import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+class StageProfiler:
+    """Per-stage latency of the inference loop: rolling percentiles, a periodic table and a Chrome trace.
+
+    Stages are timed with `stage(name)` or added after the fact with `record()`, e.g. from the spans a
+    robot keeps of its bus and camera reads. Each stage keeps a rolling window of `window` samples. The
+    most recent `max_trace_events` spans, tagged with the thread they ran on, can be written as a JSON
+    trace that chrome://tracing and Perfetto open.
+
+    When disabled, `stage()` returns a shared no-op context manager and `record()` returns immediately,
+    so the loop can be instrumented unconditionally.
+    """
+
+    def __init__(self, enabled: bool = True, window: int = 1024, max_trace_events: int = 200_000):
+        self.enabled = enabled
+        self.window = window
+        self.stats: dict[str, LatencyStats] = {}
+        self._events: deque[tuple[str, float, float, int]] = deque(maxlen=max_trace_events)
+        self._thread_names: dict[int, str] = {}
+        self._start_t = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NO_OP
+        return _Stage(self, name)
+
+    def record(self, name: str, start_t: float, end_t: float) -> None:
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = LatencyStats(window=self.window)
+            stats.record(end_t - start_t)
+            self._events.append((name, start_t, end_t, thread.ident))
+            self._thread_names.setdefault(thread.ident, thread.name)
+
+    def record_spans(self, spans: list[tuple[str, float, float]]) -> None:
+        for name, start_t, end_t in spans:
+            self.record(name, start_t, end_t)
+
+    def format_table(self) -> str:
+        with self._lock:
+            rows = [(name, stats.summary()) for name, stats in self.stats.items()]
+        width = max((len(name) for name, _ in rows), default=5)
+        lines = [f"{'stage':<{width}}  {'count':>7}  {'mean':>7}  {'p50':>7}  {'p95':>7}  {'p99':>7}  {'max':>7}  (ms)"]
+        for name, s in rows:
+            lines.append(
+                f"{name:<{width}}  {s['count']:>7}  {s['mean_ms']:7.2f}  {s['p50_ms']:7.2f}  {s['p95_ms']:7.2f}  "
+                f"{s['p99_ms']:7.2f}  {s['max_ms']:7.2f}"
+            )
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, path: str | Path) -> None:
+        """Write the recorded spans in the Trace Event Format as complete ("X") events, in microseconds."""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+        trace = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in thread_names.items()
+        ]
+        trace += [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start_t - self._start_t) * 1e6,
+                "dur": (end_t - start_t) * 1e6,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, start_t, end_t, tid in events
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        logger.info(f"Wrote {len(events)} trace events to {path}")
+
+
+_NO_OP = contextlib.nullcontext()
+
+
+class _Stage:
+    def __init__(self, profiler: StageProfiler, name: str):
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> "_Stage":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._profiler.record(self._name, self._start, time.perf_counter())
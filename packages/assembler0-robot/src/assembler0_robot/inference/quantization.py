@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+import copy
+import itertools
+import logging
+from collections.abc import Iterable
+
+import numpy as np
+import torch
+from torch.ao.quantization import get_default_qconfig_mapping, quantize_dynamic
+from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+logger = logging.getLogger(__name__)
+
+QUANTIZATION_MODES = ["dynamic", "static"]
+
+
+def select_quantized_engine() -> str:
+    """Pick the int8 kernel library for this CPU: x86/fbgemm on Intel and AMD, qnnpack on ARM."""
+    supported = torch.backends.quantized.supported_engines
+    engine = next((e for e in ("x86", "fbgemm", "qnnpack") if e in supported), None)
+    if engine is None:
+        raise RuntimeError(f"This PyTorch build has no int8 CPU kernels (engines: {supported})")
+    torch.backends.quantized.engine = engine
+    return engine
+
+
+def quantize_policy(policy, mode: str, calibration_batches: Iterable[dict] = ()):
+    """Int8 copy of an ACT policy for CPU inference, the float policy is left untouched.
+
+    "dynamic" quantizes the weights of every linear layer (transformer and projections) and quantizes
+    their activations on the fly. "static" also quantizes the convolutional image backbone, weights and
+    activations, with activation ranges observed while running `calibration_batches` through the policy.
+    """
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization mode {mode}, expected one of {QUANTIZATION_MODES}")
+    engine = select_quantized_engine()
+    quantized = copy.deepcopy(policy).to("cpu").eval()
+
+    backbone = getattr(quantized.model, "backbone", None)
+    if mode == "static" and backbone is None:
+        logger.warning("The policy has no image backbone, only its linear layers are quantized")
+    elif mode == "static":
+        batches = iter(calibration_batches)
+        first = next(batches, None)
+        if first is None:
+            raise ValueError("Static quantization needs calibration batches")
+        image_key = next(iter(quantized.config.image_features))
+        example_inputs = (torch.zeros_like(first[image_key]),)
+        prepared = prepare_fx(backbone, get_default_qconfig_mapping(engine), example_inputs)
+        quantized.model.backbone = prepared
+        num_batches = 0
+        with torch.no_grad():
+            for batch in itertools.chain([first], batches):
+                quantized.predict_action_chunk(batch)
+                num_batches += 1
+        quantized.model.backbone = convert_fx(prepared)
+        logger.info(f"Calibrated the image backbone on {num_batches} frames")
+
+    quantize_dynamic(quantized, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    logger.info(f"Quantized the policy to int8 ({mode}, {engine} kernels)")
+    return quantized
+
+
+def quantization_error(policy, quantized, holdout: Iterable[tuple[dict, np.ndarray]]) -> dict[str, np.ndarray | int]:
+    """Per-joint mean absolute action differences on held-out frames.
+
+    `deviation` is between the quantized and the float policy over the whole predicted chunk, what the
+    guardrail checks. `float_error` and `quantized_error` compare each policy's first action with the
+    recorded one, to show how much of the deviation costs accuracy.
+    """
+    deviation = float_error = quantized_error = 0.0
+    frames = 0
+    with torch.no_grad():
+        for batch, recorded_action in holdout:
+            reference = policy.predict_action_chunk(batch)[0].cpu().numpy()
+            candidate = quantized.predict_action_chunk(batch)[0].numpy()
+            deviation = deviation + np.abs(candidate - reference).mean(axis=0)
+            float_error = float_error + np.abs(reference[0] - recorded_action)
+            quantized_error = quantized_error + np.abs(candidate[0] - recorded_action)
+            frames += 1
+    if not frames:
+        raise ValueError("No held-out frames to check the quantized policy on")
+    return {
+        "frames": frames,
+        "deviation": deviation / frames,
+        "float_error": float_error / frames,
+        "quantized_error": quantized_error / frames,
+    }
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+
+import importlib
+import json
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Policy type, as in the "type" field of a checkpoint's config.json, to the module and class implementing
+# it. Modules are only imported once a checkpoint asks for them: SmolVLA alone pulls in transformers.
+POLICY_CLASSES = {
+    "act": ("lerobot.policies.act.modeling_act", "ACTPolicy"),
+    "diffusion": ("lerobot.policies.diffusion.modeling_diffusion", "DiffusionPolicy"),
+    "smolvla": ("lerobot.policies.smolvla.modeling_smolvla", "SmolVLAPolicy"),
+}
+
+# Policies whose `predict_action_chunk` only stacks the observation history that `select_action` has queued
+# up, so they run one `select_action` call per tick and cannot hand out whole chunks.
+SELECT_ACTION_ONLY = {"diffusion"}
+
+
+def checkpoint_policy_type(model_path: str) -> str:
+    """Policy type of a pretrained_model directory or hub repo, read from its config.json."""
+    config_path = Path(model_path) / "config.json"
+    if not config_path.exists():
+        from huggingface_hub import hf_hub_download
+
+        config_path = Path(hf_hub_download(repo_id=model_path, filename="config.json"))
+    policy_type = json.loads(config_path.read_text()).get("type")
+    if policy_type is None:
+        raise ValueError(f"{config_path} has no policy type")
+    return policy_type
+
+
+def predicts_chunks(policy) -> bool:
+    """Whether `predict_action_chunk` can be called on its own, without `select_action` running first."""
+    # Policies behind a policy server report it in their config
+    served = getattr(policy.config, "predicts_chunks", None)
+    if served is not None:
+        return served
+    return getattr(policy, "name", None) not in SELECT_ACTION_ONLY
+
+
+def policy_class(policy_type: str):
+    """Import and return the policy class for `policy_type`."""
+    if policy_type not in POLICY_CLASSES:
+        raise ValueError(f"Unsupported policy type {policy_type}, expected one of {list(POLICY_CLASSES)}")
+    module_name, class_name = POLICY_CLASSES[policy_type]
+    return getattr(importlib.import_module(module_name), class_name)
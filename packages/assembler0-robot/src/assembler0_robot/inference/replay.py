@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+import logging
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+import torch
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+
+logger = logging.getLogger(__name__)
+
+IMAGES_PREFIX = "observation.images."
+
+
+def load_episodes(repo_id: str, root: str | None, episodes: list[int]) -> LeRobotDataset:
+    """Load a subset of episodes of a recorded dataset, from `root` if given (no hub access needed)."""
+    return LeRobotDataset(repo_id, root=root, episodes=episodes)
+
+
+def episode_frames(dataset: LeRobotDataset, frame_stride: int = 1) -> Iterator[tuple[int, dict[str, Any], np.ndarray]]:
+    """Yield (episode index, robot observation, recorded action) for every `frame_stride`-th frame.
+
+    Observations are rebuilt in the format `robot.get_observation()` returns: one float per state name
+    and HWC uint8 frames keyed by camera name, so they go through the same preprocessing as live ones.
+    """
+    state_names = dataset.features["observation.state"]["names"]
+    for index in range(0, dataset.num_frames, frame_stride):
+        yield dataset_frame(dataset, index, state_names)
+
+
+def interleaved_frames(
+    dataset: LeRobotDataset, batch_size: int, frame_stride: int = 1
+) -> Iterator[list[tuple[int, dict[str, Any], np.ndarray]]]:
+    """Yield batches of frames taken from up to `batch_size` episodes in lockstep.
+
+    Episodes are read side by side, one frame from each per batch, and a finished episode's slot is
+    taken over by the next one, so batches stay full until the last episodes run out.
+    """
+    state_names = dataset.features["observation.state"]["names"]
+    ranges = [
+        iter(range(int(start), int(end), frame_stride))
+        for start, end in zip(dataset.episode_data_index["from"], dataset.episode_data_index["to"])
+    ]
+    pending = iter(ranges)
+    active = [episode for _, episode in zip(range(batch_size), pending)]
+    while active:
+        batch = []
+        for slot in range(len(active)):
+            index = next(active[slot], None)
+            while index is None:
+                active[slot] = next(pending, None)
+                if active[slot] is None:
+                    break
+                index = next(active[slot], None)
+            if index is not None:
+                batch.append(dataset_frame(dataset, index, state_names))
+        active = [episode for episode in active if episode is not None]
+        if batch:
+            yield batch
+
+
+def dataset_frame(
+    dataset: LeRobotDataset, index: int, state_names: list[str]
+) -> tuple[int, dict[str, Any], np.ndarray]:
+    """Frame `index` of the dataset as (episode index, robot observation, recorded action)."""
+    item = dataset[index]
+    observation = dict(zip(state_names, item["observation.state"].tolist()))
+    for key in dataset.meta.camera_keys:
+        image = item[key].permute(1, 2, 0).mul(255).round().to(torch.uint8)
+        observation[key.removeprefix(IMAGES_PREFIX)] = image.numpy()
+    return int(item["episode_index"]), observation, item["action"].numpy()
@@ -0,0 +1,391 @@
+#!/usr/bin/env python
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import torch
+
+from assembler0_robot.cameras.mjpeg import as_pixels
+from assembler0_robot.inference.batching import RequestBatcher
+from assembler0_robot.inference.features import IMAGE_FEATURE_PREFIX, STATE_FEATURE, policy_feature_shapes
+from assembler0_robot.inference.packing import ObservationPacker
+from assembler0_robot.inference.registry import predicts_chunks
+from assembler0_robot.utils.timing import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = "/tmp/assembler0_policy.sock"
+_HEADER_LENGTH = struct.Struct("!I")
+
+
+def model_key(model_path: str) -> str:
+    """Name a checkpoint is served under: its absolute path for a local directory, else the hub repo id."""
+    path = Path(model_path)
+    return str(path.resolve()) if path.exists() else model_path
+
+
+def send_message(sock: socket.socket, header: dict, payload: bytes = b"") -> None:
+    """Send a JSON header, length prefixed, followed by `payload` raw bytes."""
+    header_bytes = json.dumps({**header, "payload_bytes": len(payload)}).encode()
+    sock.sendall(_HEADER_LENGTH.pack(len(header_bytes)) + header_bytes + payload)
+
+
+def recv_message(sock: socket.socket) -> tuple[dict | None, bytearray]:
+    """Next (header, payload), or (None, empty) once the peer has closed the connection."""
+    prefix = _recv_exactly(sock, _HEADER_LENGTH.size)
+    if prefix is None:
+        return None, bytearray()
+    header = json.loads(_recv_exactly(sock, _HEADER_LENGTH.unpack(prefix)[0]))
+    return header, _recv_exactly(sock, header["payload_bytes"]) or bytearray()
+
+
+def _recv_exactly(sock: socket.socket, n: int) -> bytearray | None:
+    buffer = bytearray(n)
+    view = memoryview(buffer)
+    received = 0
+    while received < n:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            if received == 0:
+                return None
+            raise ConnectionError("Connection closed in the middle of a message")
+        received += count
+    return buffer
+
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to a segment owned by another process.
+
+    Attaching registers the segment with this process's resource tracker, which would unlink it when
+    this process exits, from under its owner.
+    """
+    segment = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+@dataclass
+class RemotePolicyConfig:
+    """What a client needs to know about a served policy, laid out like `OnnxPolicyConfig`."""
+
+    input_shapes: dict[str, list[int]]
+    action_dim: int
+    chunk_size: int
+    n_action_steps: int
+    predicts_chunks: bool = True
+
+    @classmethod
+    def from_policy(cls, policy) -> "RemotePolicyConfig":
+        shapes, action_dim = policy_feature_shapes(policy)
+        return cls(
+            input_shapes={name: [1, *shape] for name, shape in shapes.items()},
+            action_dim=action_dim,
+            chunk_size=getattr(policy.config, "chunk_size", 1),
+            n_action_steps=getattr(policy.config, "n_action_steps", 1),
+            predicts_chunks=predicts_chunks(policy),
+        )
+
+
+def sample_observation(config: RemotePolicyConfig, seed: int = 0) -> tuple[dict, list[str], list[str]]:
+    """Random robot observation matching a policy's inputs, with its state keys and camera names.
+
+    For benchmarks: state values around zero and HWC uint8 frames.
+    """
+    rng = np.random.default_rng(seed)
+    observation = {}
+    state_keys, camera_names = [], []
+    for name, shape in config.input_shapes.items():
+        if name == STATE_FEATURE:
+            state_keys = [f"state_{i}" for i in range(shape[1])]
+            observation.update(zip(state_keys, rng.normal(size=shape[1]).tolist()))
+        elif name.startswith(IMAGE_FEATURE_PREFIX):
+            _, channels, height, width = shape
+            camera = name.removeprefix(IMAGE_FEATURE_PREFIX)
+            observation[camera] = rng.integers(0, 256, size=(height, width, channels), dtype=np.uint8)
+            camera_names.append(camera)
+    return observation, state_keys, camera_names
+
+
+class PolicyServer:
+    """Serve loaded policies to inference loops in other processes over a Unix domain socket.
+
+    A connection opens a session on one model, naming the state keys, camera names and task of the
+    observations it will send. Joint values travel in the message header. Camera frames are written by
+    the client into shared memory segments it owns, and only the segment names cross the socket, so
+    each frame is copied once, straight into the server's packing buffers. Actions come back as raw
+    float32.
+
+    Sessions run on their own threads and calls into a model are serialized by a lock per model.
+    `select_action` keeps its action queue inside the policy, so a session using it should have the
+    model to itself; loops sharing a model use `predict`, which is stateless.
+
+    With `batch_window_s` set, requests from all sessions of a model are gathered by a `RequestBatcher`
+    and run as one batch. Each session then keeps its own `select_action` queue, refilled with
+    `n_action_steps` actions of its own chunk, so every client behaves as if it had the model alone.
+    """
+
+    def __init__(
+        self,
+        policies: dict[str, Any],
+        device: str,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        batch_window_s: float | None = None,
+        max_batch_size: int = 8,
+    ):
+        self.policies = policies
+        self.device = device
+        self.socket_path = socket_path
+        self.configs = {key: RemotePolicyConfig.from_policy(policy) for key, policy in policies.items()}
+        self.locks = {key: threading.Lock() for key in policies}
+        self.batchers: dict[str, RequestBatcher] = {}
+        if batch_window_s is not None:
+            self.batchers = {
+                key: RequestBatcher(policy, self.locks[key], device, batch_window_s, max_batch_size)
+                for key, policy in policies.items()
+            }
+        self._server: socketserver.ThreadingUnixStreamServer | None = None
+
+    def serve_forever(self) -> None:
+        if os.path.exists(self.socket_path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                if probe.connect_ex(self.socket_path) == 0:
+                    raise RuntimeError(f"A policy server is already listening on {self.socket_path}")
+            # Left behind by a server that did not shut down cleanly
+            os.unlink(self.socket_path)
+
+        policy_server = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                policy_server._serve_session(self.request)
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        self._server.daemon_threads = True
+        logger.info(f"Serving {list(self.policies)} on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            os.unlink(self.socket_path)
+            for key, batcher in self.batchers.items():
+                batcher.stop()
+                logger.info(f"{key}: {batcher.format_stats()}")
+
+    def shutdown(self) -> None:
+        """Stop `serve_forever()` from another thread."""
+        if self._server is not None:
+            self._server.shutdown()
+
+    def _serve_session(self, sock: socket.socket) -> None:
+        session = _Session(self)
+        try:
+            while True:
+                header, _ = recv_message(sock)
+                if header is None:
+                    break
+                try:
+                    reply, payload = session.handle(header)
+                except Exception as e:
+                    logger.exception(f"Failed to handle {header.get('op')}")
+                    reply, payload = {"error": f"{type(e).__name__}: {e}"}, b""
+                send_message(sock, reply, payload)
+        except ConnectionError as e:
+            logger.warning(f"Client connection lost: {e}")
+        finally:
+            session.close()
+
+
+class _Session:
+    """State of one client connection: its model, packing buffers and attached frame segments."""
+
+    def __init__(self, server: PolicyServer):
+        self.server = server
+        self.key: str | None = None
+        self.state_keys: list[str] = []
+        self.task: str | None = None
+        self.packer: ObservationPacker | None = None
+        # With batching, the rest of this session's last chunk, handed out by select_action
+        self.planned: deque[np.ndarray] = deque()
+        # Camera name -> (segment name, attached segment)
+        self._segments: dict[str, tuple[str, shared_memory.SharedMemory]] = {}
+
+    def handle(self, header: dict) -> tuple[dict, bytes]:
+        op = header["op"]
+        if op == "ping":
+            return {}, b""
+        if op == "info":
+            return {"config": asdict(self.server.configs[self._served(header["model"])])}, b""
+        if op == "open":
+            self.key = self._served(header["model"])
+            self.state_keys = header["state_keys"]
+            self.task = header.get("task")
+            batcher = self.server.batchers.get(self.key)
+            if batcher is not None:
+                batcher.configure(header["state_keys"], header["camera_names"], task=header.get("task"))
+            else:
+                self.packer = ObservationPacker(
+                    header["state_keys"], header["camera_names"], self.server.device, task=header.get("task")
+                )
+            self._reset()
+            return {}, b""
+        if self.key is None:
+            raise RuntimeError(f"{op} before open")
+        if op == "reset":
+            self._reset()
+            return {}, b""
+        if op not in ("select_action", "predict"):
+            raise ValueError(f"Unknown op {op}")
+
+        observation = self._observation(header)
+        config = self.server.configs[self.key]
+        batcher = self.server.batchers.get(self.key)
+        if batcher is not None:
+            if op == "predict":
+                actions = batcher.submit(observation, header.get("horizon") or config.n_action_steps, self.task)
+            else:
+                if not self.planned:
+                    self.planned.extend(batcher.submit(observation, config.n_action_steps, self.task))
+                actions = self.planned.popleft()
+            return {"shape": list(actions.shape)}, actions.tobytes()
+
+        batch = self.packer.pack(observation)
+        policy = self.server.policies[self.key]
+        with self.server.locks[self.key], torch.inference_mode():
+            predict_action_chunk = getattr(policy, "predict_action_chunk", None)
+            if op == "select_action":
+                actions = policy.select_action(batch)[0]
+            elif predict_action_chunk is None:
+                actions = policy.select_action(batch)
+            elif not config.predicts_chunks:
+                raise ValueError(f"{self.key} only predicts actions through select_action")
+            else:
+                horizon = header.get("horizon") or config.n_action_steps
+                actions = predict_action_chunk(batch)[0, :horizon]
+            actions = actions.to("cpu").numpy().astype(np.float32, copy=False)
+        return {"shape": list(actions.shape)}, actions.tobytes()
+
+    def close(self) -> None:
+        for _, segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+
+    def _served(self, key: str) -> str:
+        if key not in self.server.policies:
+            raise ValueError(f"{key} is not served, expected one of {list(self.server.policies)}")
+        return key
+
+    def _reset(self) -> None:
+        self.planned.clear()
+        if self.key in self.server.batchers:
+            # The model is shared, its own state is unused
+            return
+        with self.server.locks[self.key]:
+            self.server.policies[self.key].reset()
+
+    def _observation(self, header: dict) -> dict[str, Any]:
+        observation = dict(zip(self.state_keys, header["state"]))
+        for camera, (segment_name, shape) in header["frames"].items():
+            attached = self._segments.get(camera)
+            if attached is None or attached[0] != segment_name:
+                if attached is not None:
+                    attached[1].close()
+                attached = (segment_name, attach_shared_memory(segment_name))
+                self._segments[camera] = attached
+            # A fresh view each call, so no view outlives the segment when it is closed
+            observation[camera] = np.ndarray(shape, dtype=np.uint8, buffer=attached[1].buf)
+        return observation
+
+
+class PolicyClient:
+    """Client of a `PolicyServer`, standing in for a locally loaded policy in the inference loop.
+
+    Takes observations as `robot.get_observation()` returns them; packing happens in the server.
+    `round_trip` times every request, including the server's model call.
+    """
+
+    def __init__(self, socket_path: str, model_path: str):
+        self.model = model_key(model_path)
+        self.round_trip = LatencyStats()
+        self._state_keys: list[str] = []
+        self._camera_names: list[str] = []
+        # Camera name -> shared memory segment and the frame shape it holds
+        self._segments: dict[str, tuple[shared_memory.SharedMemory, tuple[int, ...]]] = {}
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(socket_path)
+        reply, _ = self._call({"op": "info", "model": self.model})
+        self.config = RemotePolicyConfig(**reply["config"])
+
+    def open(self, state_keys: list[str], camera_names: list[str], task: str | None = None) -> None:
+        """Start a session: observations will carry these state keys and cameras, and reset the policy."""
+        self._state_keys = state_keys
+        self._camera_names = camera_names
+        self._call(
+            {"op": "open", "model": self.model, "state_keys": state_keys, "camera_names": camera_names, "task": task}
+        )
+
+    def reset(self) -> None:
+        self._call({"op": "reset"})
+
+    def ping(self) -> None:
+        """Empty round trip, the transport's share of a request."""
+        self._call({"op": "ping"})
+
+    def select_action(self, observation: dict[str, Any]) -> np.ndarray:
+        """The policy's next action, (action_dim,)."""
+        return self._actions({"op": "select_action", **self._observation(observation)})
+
+    def predict_actions(self, observation: dict[str, Any], horizon: int | None = None) -> np.ndarray:
+        """First `horizon` (default `n_action_steps`) actions of a fresh chunk, (n, action_dim)."""
+        return self._actions({"op": "predict", "horizon": horizon, **self._observation(observation)})
+
+    def format_stats(self) -> str:
+        return f"policy server round trip {self.round_trip.format()}"
+
+    def close(self) -> None:
+        self._sock.close()
+        for segment, _ in self._segments.values():
+            segment.close()
+            segment.unlink()
+        self._segments.clear()
+
+    def _observation(self, observation: dict[str, Any]) -> dict:
+        frames = {}
+        for name in self._camera_names:
+            if name not in observation:
+                continue
+            frame = as_pixels(observation[name])
+            segment, shape = self._segments.get(name, (None, None))
+            if shape != frame.shape:
+                if segment is not None:
+                    segment.close()
+                    segment.unlink()
+                segment = shared_memory.SharedMemory(create=True, size=frame.nbytes)
+                self._segments[name] = (segment, frame.shape)
+            np.copyto(np.ndarray(frame.shape, dtype=np.uint8, buffer=segment.buf), frame)
+            frames[name] = [segment.name, list(frame.shape)]
+        return {"state": [float(observation[key]) for key in self._state_keys], "frames": frames}
+
+    def _actions(self, request: dict) -> np.ndarray:
+        reply, payload = self._call(request)
+        return np.frombuffer(payload, dtype=np.float32).reshape(reply["shape"])
+
+    def _call(self, request: dict) -> tuple[dict, bytearray]:
+        with self.round_trip.time():
+            send_message(self._sock, request)
+            reply, payload = recv_message(self._sock)
+        if reply is None:
+            raise ConnectionError("Policy server closed the connection")
+        if "error" in reply:
+            raise RuntimeError(f"Policy server: {reply['error']}")
+        return reply, payload
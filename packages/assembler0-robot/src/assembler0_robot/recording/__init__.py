@@ -0,0 +1 @@
+# Recording helpers shared by scripts/record.py and scripts/bi_record.py.
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.utils import build_dataset_frame
+
+from assembler0_robot.recording.episode_journal import EpisodeJournal
+from assembler0_robot.recording.memory_budget import DropMarks, MemoryBudget, frame_image_bytes
+from assembler0_robot.utils.timing import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFrameWriter:
+    """Move `build_dataset_frame` and `dataset.add_frame` off the control thread.
+
+    The control loop calls `push()` with the raw observation and the sent action. That only appends a
+    tuple to a bounded `deque` (atomic under the GIL, no lock taken) and never blocks: if the writer has
+    fallen `max_queue_size` samples or `max_queue_bytes` of camera frames behind, the sample is dropped
+    instead. Its position is recorded in `drop_marks`, since LeRobot timestamps frames by their index and
+    the frames after it end up one tick early. A dedicated writer thread drains the queue, builds the
+    dataset frame and adds it to the episode buffer, which is also where image writes get enqueued.
+
+    Call `flush()` before `dataset.save_episode()` or `dataset.clear_episode_buffer()` so every pushed
+    sample is in the episode buffer.
+
+    With a `MemoryBudget`, queued samples count against it too: `push()` drops and marks a sample that
+    would exceed the budget, whatever its policy. With the "drop" policy, samples whose images would
+    exceed the budget are also left out of the episode by the writer thread and marked.
+    """
+
+    def __init__(
+        self,
+        dataset: LeRobotDataset,
+        max_queue_size: int = 256,
+        journal: EpisodeJournal | None = None,
+        memory_budget: MemoryBudget | None = None,
+        max_queue_bytes: int | None = None,
+    ):
+        self.dataset = dataset
+        self.journal = journal
+        self.memory_budget = memory_budget
+        self.max_queue_size = max_queue_size
+        self.max_queue_bytes = max_queue_bytes
+        # Shared with the memory budget, so both kinds of drops end up in the same file
+        self.drop_marks = memory_budget.drop_marks if memory_budget is not None else DropMarks()
+
+        self.enqueue_latency = LatencyStats()
+        self.write_latency = LatencyStats()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.max_depth = 0
+        # Each counter has a single writing thread, their difference is the image bytes held by queued samples
+        self._bytes_enqueued = 0
+        self._bytes_dequeued = 0
+        self.error: Exception | None = None
+        # Samples dropped by push() since the last queued one, only touched by the control thread
+        self._unmarked_drops = 0
+
+        # (observation, sent action, task, extra columns, image bytes, samples dropped right before it)
+        self._queue: deque[tuple[dict[str, Any], dict[str, Any], str | None, dict[str, Any] | None, int, int]] = deque()
+        self._wakeup = threading.Event()
+        # Only the writer thread and flush() take this lock, never push()
+        self._processed = 0
+        self._processed_cond = threading.Condition()
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="dataset-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    @property
+    def bytes_queued(self) -> int:
+        return self._bytes_enqueued - self._bytes_dequeued
+
+    def push(
+        self,
+        observation: dict[str, Any],
+        sent_action: dict[str, Any],
+        task: str | None,
+        extra: dict[str, Any] | None = None,
+    ) -> bool:
+        """Queue one sample for writing. Returns False if it was dropped because the queue or budget is full.
+
+        A dropped sample is marked where it would have been, by the writer thread once it reaches the next
+        queued sample, or by `flush()`.
+
+        `extra` holds ready-made frame columns (e.g. per-tick timing) added to the frame as they are.
+        """
+        start = time.perf_counter()
+        depth = len(self._queue)
+        image_bytes = frame_image_bytes(observation)
+        over_bytes = self.max_queue_bytes and depth and self.bytes_queued + image_bytes > self.max_queue_bytes
+        if depth >= self.max_queue_size or over_bytes:
+            reason = f"the dataset writer is {depth} samples ({self.bytes_queued / 1e6:.0f}MB) behind"
+        elif self.memory_budget is not None and not self.memory_budget.try_queue(image_bytes):
+            reason = f"the recording memory budget of {self.memory_budget.max_bytes / 1e6:.0f}MB is full"
+        else:
+            reason = None
+        if reason is not None:
+            self.dropped += 1
+            self._unmarked_drops += 1
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                logger.warning(
+                    f"Dropped {self.dropped} samples so far, {reason}. The episode will have missing frames."
+                )
+            return False
+
+        self.enqueued += 1
+        self._bytes_enqueued += image_bytes
+        self._queue.append((observation, sent_action, task, extra, image_bytes, self._unmarked_drops))
+        self._unmarked_drops = 0
+        self._wakeup.set()
+        self.max_depth = max(self.max_depth, depth + 1)
+        self.enqueue_latency.record(time.perf_counter() - start)
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every queued sample has been added to the dataset, and mark trailing drops."""
+        enqueued = self.enqueued
+        with self._processed_cond:
+            done = self._processed_cond.wait_for(lambda: self._processed >= enqueued, timeout)
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise RuntimeError("Dataset writer failed") from error
+        if done and self._unmarked_drops:
+            # Dropped after the last queued sample, at the end of the episode
+            self.drop_marks.mark(self.dataset, self._unmarked_drops)
+            self._unmarked_drops = 0
+        return done
+
+    def stop(self) -> None:
+        self.flush()
+        self._stop = True
+        self._wakeup.set()
+        self._thread.join()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "bytes_queued": self.bytes_queued,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "enqueue_latency": self.enqueue_latency.summary(),
+            "write_latency": self.write_latency.summary(),
+        }
+
+    def format_stats(self) -> str:
+        return (
+            f"writer: written={self.written} dropped={self.dropped} depth={self.depth} "
+            f"max_depth={self.max_depth}/{self.max_queue_size} queued={self.bytes_queued / 1e6:.1f}MB | "
+            f"enqueue {self.enqueue_latency.format()} | write {self.write_latency.format()}"
+        )
+
+    def _run(self) -> None:
+        while True:
+            try:
+                observation, sent_action, task, extra, image_bytes, dropped_before = self._queue.popleft()
+            except IndexError:
+                if self._stop:
+                    return
+                self._wakeup.wait(0.1)
+                self._wakeup.clear()
+                continue
+
+            start = time.perf_counter()
+            if self.memory_budget is not None:
+                # Hand the sample's bytes back before its images are acquired from the budget again
+                self.memory_budget.unqueue(image_bytes)
+            try:
+                if dropped_before:
+                    self.drop_marks.mark(self.dataset, dropped_before)
+                if self.memory_budget is not None and not self.memory_budget.admit(image_bytes):
+                    self.memory_budget.mark_dropped(self.dataset)
+                    continue
+                observation_frame = build_dataset_frame(self.dataset.features, observation, prefix="observation")
+                action_frame = build_dataset_frame(self.dataset.features, sent_action, prefix="action")
+                frame = {**observation_frame, **action_frame, **(extra or {})}
+                self.dataset.add_frame(frame, task=task)
+                if self.journal is not None:
+                    self.journal.append(frame, task)
+                self.written += 1
+            except Exception as e:
+                logger.error(f"Dataset writer failed to add frame: {e}")
+                self.error = e
+            finally:
+                self._bytes_dequeued += image_bytes
+                self.write_latency.record(time.perf_counter() - start)
+                with self._processed_cond:
+                    self._processed += 1
+                    self._processed_cond.notify_all()
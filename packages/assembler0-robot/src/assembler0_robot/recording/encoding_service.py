@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+
+import logging
+import multiprocessing as mp
+import os
+import shutil
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.utils import write_info
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_worker(jobs: mp.Queue, results: mp.Queue, fps: int, niceness: int) -> None:
+    """Worker process: encode the image directories of one episode at a time."""
+    # Imported here so the spawned worker only pays for what it uses
+    from lerobot.datasets.video_utils import encode_video_frames
+
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        episode_index, videos = job
+        start = time.perf_counter()
+        try:
+            for img_dir, staging_path in videos:
+                encode_video_frames(img_dir, staging_path, fps, overwrite=True)
+            results.put((episode_index, None, time.perf_counter() - start))
+        except Exception as e:
+            results.put((episode_index, repr(e), time.perf_counter() - start))
+
+
+class BackgroundEncoder:
+    """Encode saved episodes in worker processes while recording continues.
+
+    `save_episode()` replaces `dataset.save_episode()`. It saves the parquet data and metadata right
+    away, then queues the episode's video encoding for a pool of low-priority worker processes. Videos
+    are encoded into a staging directory next to the dataset and moved to their final path under a
+    lock that `save_episode()` also holds, so LeRobot's per-episode consistency check always sees a
+    matching number of MP4s.
+
+    Backpressure: at most `max_pending` episodes may be queued or encoding. A further `save_episode()`
+    blocks between episodes until one finishes, so the backlog never grows without bound and the
+    control loop itself is never blocked. With `pause()`/`resume()` the workers can additionally be
+    suspended while an episode records and only run during the reset phase. `save_episode()` resumes
+    them, since it may have to wait for them to free a slot.
+    """
+
+    def __init__(
+        self,
+        dataset: LeRobotDataset,
+        num_workers: int = 1,
+        max_pending: int = 2,
+        niceness: int = 10,
+    ):
+        self.dataset = dataset
+        # LeRobot must never encode on its own: every saved episode is left for this service
+        self.dataset.batch_encoding_size = sys.maxsize
+        self.staging_root = dataset.root.with_name(f".{dataset.root.name}_encoding")
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending: dict[int, list[tuple[Path, Path, Path]]] = {}
+        self._all_done = threading.Condition(self._lock)
+        self._paused = False
+
+        self.encoded_episodes = 0
+        self.failed_episodes: list[int] = []
+        self.encode_s = 0.0
+        self.backpressure_wait_s = 0.0
+        self.last_finished_t: float | None = None
+
+        ctx = mp.get_context("spawn")
+        self._jobs = ctx.Queue()
+        self._results = ctx.Queue()
+        self._workers = [
+            ctx.Process(target=_encode_worker, args=(self._jobs, self._results, dataset.fps, niceness), daemon=True)
+            for _ in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        self._collector = threading.Thread(target=self._collect, name="encoding-results", daemon=True)
+        self._collector.start()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def save_episode(self) -> None:
+        if self._paused:
+            # Paused workers never free a slot, so waiting for one would block forever
+            self.resume()
+        start = time.perf_counter()
+        self._slots.acquire()
+        self.backpressure_wait_s += time.perf_counter() - start
+
+        with self._lock:
+            episode_index = self.dataset.meta.total_episodes
+            self.dataset.save_episode()
+
+            videos = []
+            for key in self.dataset.meta.video_keys:
+                img_dir = self.dataset._get_image_file_path(
+                    episode_index=episode_index, image_key=key, frame_index=0
+                ).parent
+                video_path = self.dataset.root / self.dataset.meta.get_video_file_path(episode_index, key)
+                staging_path = self.staging_root / video_path.relative_to(self.dataset.root)
+                videos.append((img_dir, staging_path, video_path))
+
+            if not videos:
+                self._slots.release()
+                return
+            self._pending[episode_index] = videos
+
+        self._jobs.put((episode_index, [(img_dir, staging) for img_dir, staging, _ in videos]))
+        logger.info(f"Queued episode {episode_index} for background encoding ({self.pending} pending)")
+
+    def pause(self) -> None:
+        """Suspend the encoder processes (e.g. while an episode records)."""
+        self._signal_workers(getattr(signal, "SIGSTOP", None))
+        self._paused = True
+
+    def resume(self) -> None:
+        self._signal_workers(getattr(signal, "SIGCONT", None))
+        self._paused = False
+
+    def wait(self) -> None:
+        """Block until every queued episode is encoded, then log when the last encode finished."""
+        if self._paused:
+            self.resume()
+        start = time.perf_counter()
+        with self._all_done:
+            self._all_done.wait_for(lambda: not self._pending)
+        waited_s = time.perf_counter() - start
+
+        # Anything the workers failed on is retried synchronously so no episode is left unencoded
+        for episode_index in self.failed_episodes:
+            logger.warning(f"Re-encoding episode {episode_index} in the foreground")
+            self.dataset.encode_episode_videos(episode_index)
+            self.dataset.episodes_since_last_encoding -= 1
+        self.failed_episodes.clear()
+
+        logger.info(
+            f"Background encoding: {self.encoded_episodes} episodes encoded in {self.encode_s:.1f}s of worker "
+            f"time. End-of-session wait {waited_s:.1f}s, operator blocked by backpressure "
+            f"{self.backpressure_wait_s:.1f}s"
+        )
+        if self.last_finished_t is not None:
+            logger.info(f"Last encode finished at {time.strftime('%H:%M:%S', time.localtime(self.last_finished_t))}")
+
+    def close(self) -> None:
+        if self._paused:
+            self.resume()
+        for _ in self._workers:
+            self._jobs.put(None)
+        for worker in self._workers:
+            worker.join(timeout=5.0)
+            if worker.is_alive():
+                worker.terminate()
+        self._results.put(None)
+        self._collector.join()
+        shutil.rmtree(self.staging_root, ignore_errors=True)
+
+    def _signal_workers(self, sig: int | None) -> None:
+        if sig is None:
+            logger.debug("Pausing encoder processes is not supported on this platform")
+            return
+        for worker in self._workers:
+            if worker.pid is not None and worker.is_alive():
+                os.kill(worker.pid, sig)
+
+    def _collect(self) -> None:
+        while True:
+            result = self._results.get()
+            if result is None:
+                return
+            episode_index, error, elapsed_s = result
+
+            with self._lock:
+                videos = self._pending.pop(episode_index)
+                self.encode_s += elapsed_s
+                if error is not None:
+                    logger.error(f"Background encoding of episode {episode_index} failed: {error}")
+                    self.failed_episodes.append(episode_index)
+                else:
+                    for img_dir, staging_path, video_path in videos:
+                        video_path.parent.mkdir(parents=True, exist_ok=True)
+                        shutil.move(staging_path, video_path)
+                        shutil.rmtree(img_dir, ignore_errors=True)
+                    self.dataset.episodes_since_last_encoding -= 1
+                    self.encoded_episodes += 1
+                    if episode_index == 0:
+                        self.dataset.meta.update_video_info()
+                        write_info(self.dataset.meta.info, self.dataset.meta.root)
+                    logger.info(f"Episode {episode_index} encoded in background ({elapsed_s:.1f}s)")
+                self.last_finished_t = time.time()
+                self._all_done.notify_all()
+            self._slots.release()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+
+import json
+import logging
+import mmap
+import os
+import shutil
+import time
+from typing import Any
+
+import numpy as np
+import PIL.Image
+
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.utils import DEFAULT_FEATURES
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"A0JRNL01"
+_HEADER_DTYPE = np.dtype([("magic", "S8"), ("count", "<i8")])
+_HEADER_SIZE = 64
+
+
+class EpisodeJournal:
+    """Append-only, memory-mapped journal of the episode being recorded.
+
+    Each tick appends one fixed-size record with the frame's joint data (every non-image dataset
+    feature, e.g. `observation.state` and `action`). Camera frames are referenced implicitly by frame
+    index: LeRobot's image writer already puts them at a deterministic path under `images/`.
+
+    The record is written first and the record count in the header last, so a crash mid-append never
+    exposes a torn record. Writes go to a shared memory mapping and are never fsync'd: the page cache
+    outlives a crashed (or stalled and killed) recording process, which is the failure this protects
+    against, at the cost of a memcpy per tick. The journal's metadata is a small JSON sidecar written
+    once per episode.
+
+    The journal lives next to the dataset (not inside it) so it is never pushed to the hub.
+    """
+
+    def __init__(self, dataset: LeRobotDataset, initial_capacity: int = 4096):
+        self.dataset = dataset
+        self.dir = dataset.root.with_name(f".{dataset.root.name}_journal")
+        self.data_path = self.dir / "episode.journal"
+        self.meta_path = self.dir / "episode.json"
+
+        self.columns = [
+            key
+            for key, ft in dataset.features.items()
+            if key not in DEFAULT_FEATURES and ft["dtype"] not in ["image", "video"]
+        ]
+        self.record_dtype = np.dtype(
+            [("frame_index", "<i8"), ("wall_time", "<f8")]
+            + [(key, "<f4", tuple(dataset.features[key]["shape"])) for key in self.columns]
+        )
+        self.initial_capacity = initial_capacity
+
+        self._file = None
+        self._mmap: mmap.mmap | None = None
+        self._header: np.ndarray | None = None
+        self._records: np.ndarray | None = None
+        self.count = 0
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, frame: dict[str, Any], task: str) -> None:
+        """Journal *frame* right after it has been passed to `dataset.add_frame()`."""
+        if self._mmap is None:
+            self._begin(task)
+        if self.count >= len(self._records):
+            self._map(2 * len(self._records))
+
+        record = self._records[self.count]
+        record["frame_index"] = self.count
+        record["wall_time"] = time.time()
+        for key in self.columns:
+            record[key] = frame[key]
+        self.count += 1
+        self._header["count"] = self.count
+
+    def clear(self) -> None:
+        """Forget the journaled episode, e.g. once it has been saved or discarded."""
+        self._unmap()
+        self.count = 0
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def close(self) -> None:
+        self._unmap()
+
+    def _begin(self, task: str) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "episode_index": self.dataset.episode_buffer["episode_index"],
+            "task": task,
+            "fps": self.dataset.fps,
+            "columns": self.columns,
+            "record_dtype": self.record_dtype.descr,
+        }
+        tmp_path = self.meta_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(self.meta_path)
+
+        self._file = open(self.data_path, "w+b")
+        self._map(self.initial_capacity)
+        self._header["magic"] = _MAGIC
+        self._header["count"] = 0
+        self.count = 0
+
+    def _map(self, capacity: int) -> None:
+        if self._mmap is not None:
+            self._release_views()
+            self._mmap.close()
+        self._file.truncate(_HEADER_SIZE + capacity * self.record_dtype.itemsize)
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        self._header = np.ndarray((), dtype=_HEADER_DTYPE, buffer=self._mmap)
+        self._records = np.ndarray((capacity,), dtype=self.record_dtype, buffer=self._mmap, offset=_HEADER_SIZE)
+
+    def _release_views(self) -> None:
+        # numpy views keep the mmap exported, it can only be closed once they are gone
+        self._header = None
+        self._records = None
+
+    def _unmap(self) -> None:
+        if self._mmap is not None:
+            self._release_views()
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+
+    def load(self) -> tuple[dict, np.ndarray] | None:
+        """Return the journaled episode's metadata and records, or None if there is nothing to recover."""
+        if not self.meta_path.is_file() or not self.data_path.is_file():
+            return None
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+        record_dtype = np.dtype([tuple(field) if len(field) == 2 else (field[0], field[1], tuple(field[2]))
+                                 for field in meta["record_dtype"]])
+        data = np.fromfile(self.data_path, dtype=np.uint8)
+        header = np.frombuffer(data[: _HEADER_DTYPE.itemsize].tobytes(), dtype=_HEADER_DTYPE)[0]
+        if header["magic"] != _MAGIC:
+            logger.warning(f"Ignoring {self.data_path}: not an episode journal")
+            return None
+        count = int(header["count"])
+        records = np.frombuffer(
+            data[_HEADER_SIZE : _HEADER_SIZE + count * record_dtype.itemsize].tobytes(), dtype=record_dtype
+        )
+        return meta, records
+
+    def recover(self, mode: str = "replay") -> int:
+        """Replay or discard an episode left behind by a crashed recording session.
+
+        With `mode="replay"` the journaled frames are put back into the dataset's episode buffer (camera
+        frames by path, without re-writing them) and saved as a regular episode, truncated to the last
+        frame whose images all made it to disk. With `mode="discard"` the partial episode's images and
+        the journal are deleted. Returns the number of frames recovered.
+        """
+        loaded = self.load()
+        if loaded is None:
+            return 0
+        meta, records = loaded
+        episode_index = meta["episode_index"]
+
+        if episode_index != self.dataset.meta.total_episodes:
+            # The crash happened after the episode was saved, the journal is just stale
+            logger.info(f"Journal for episode {episode_index} was already saved, removing it")
+            self.clear()
+            return 0
+        if meta["columns"] != self.columns:
+            raise ValueError(f"Journal columns {meta['columns']} don't match dataset features {self.columns}")
+
+        num_frames = self._last_complete_frame(episode_index, len(records))
+        if mode == "discard" or num_frames == 0:
+            logger.info(f"Discarding partial episode {episode_index} ({len(records)} journaled frames)")
+            self._remove_images(episode_index, from_frame=0)
+            self.dataset.episode_buffer = self.dataset.create_episode_buffer()
+            self.clear()
+            return 0
+
+        logger.info(
+            f"Replaying partial episode {episode_index}: {num_frames} of {len(records)} journaled frames "
+            "have all their images"
+        )
+        # Images past the last complete frame would otherwise be picked up by the video encoder
+        self._remove_images(episode_index, from_frame=num_frames)
+
+        buffer = self.dataset.create_episode_buffer(episode_index)
+        for i in range(num_frames):
+            buffer["frame_index"].append(i)
+            buffer["timestamp"].append(i / self.dataset.fps)
+            buffer["task"].append(meta["task"])
+            for key in self.columns:
+                buffer[key].append(records[key][i].copy())
+            for key in self.dataset.meta.camera_keys:
+                buffer[key].append(str(self.dataset._get_image_file_path(episode_index, key, i)))
+        buffer["size"] = num_frames
+        self.dataset.episode_buffer = buffer
+        self.dataset.save_episode()
+        self.clear()
+        return num_frames
+
+    def _last_complete_frame(self, episode_index: int, num_records: int) -> int:
+        """Number of leading frames whose camera images exist and decode."""
+        num_frames = num_records
+        for key in self.dataset.meta.camera_keys:
+            while num_frames > 0:
+                fpath = self.dataset._get_image_file_path(episode_index, key, num_frames - 1)
+                try:
+                    with PIL.Image.open(fpath) as img:
+                        img.load()
+                    break
+                except (OSError, SyntaxError):
+                    num_frames -= 1
+        # Frames are written out of order by the writer threads, make sure there are no holes either
+        for key in self.dataset.meta.camera_keys:
+            for i in range(num_frames):
+                if not self.dataset._get_image_file_path(episode_index, key, i).is_file():
+                    num_frames = i
+                    break
+        return num_frames
+
+    def _remove_images(self, episode_index: int, from_frame: int) -> None:
+        for key in self.dataset.meta.camera_keys:
+            img_dir = self.dataset._get_image_file_path(episode_index, key, 0).parent
+            if not img_dir.is_dir():
+                continue
+            if from_frame == 0:
+                shutil.rmtree(img_dir)
+                continue
+            for fpath in img_dir.glob("frame_*.png"):
+                if int(fpath.stem.split("_")[-1]) >= from_frame:
+                    fpath.unlink()
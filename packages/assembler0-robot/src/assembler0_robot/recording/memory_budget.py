@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+
+import json
+import logging
+import queue
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+from lerobot.datasets.image_writer import write_image
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+
+from assembler0_robot.cameras.mjpeg import MJPEGFrame
+
+logger = logging.getLogger(__name__)
+
+BUDGET_POLICIES = ("block", "drop", "spill")
+DROPPED_FRAMES_PATH = "meta/dropped_frames.jsonl"
+
+
+def frame_image_bytes(frame: dict[str, Any]) -> int:
+    """Bytes held by the image arrays of an observation or dataset frame."""
+    return sum(
+        value.nbytes
+        for value in frame.values()
+        if isinstance(value, MJPEGFrame) or (isinstance(value, np.ndarray) and value.ndim == 3)
+    )
+
+
+class DropMarks:
+    """Where frames were left out of the episode being recorded, saved to meta/dropped_frames.jsonl.
+
+    LeRobot derives timestamps from `frame_index / fps`, so every frame after a dropped one sits one tick
+    early. A mark is the frame index the dropped frame would have preceded, which tells readers where
+    the episode skips real time.
+    """
+
+    def __init__(self):
+        self.count = 0
+        # (episode_index, frame_index the dropped frame would have preceded) for the episode being recorded
+        self._marks: list[tuple[int, int]] = []
+
+    def mark(self, dataset: LeRobotDataset, count: int = 1) -> None:
+        """Mark `count` frames dropped right after the frames added to the episode buffer so far."""
+        position = (dataset.episode_buffer["episode_index"], dataset.episode_buffer["size"])
+        self._marks.extend([position] * count)
+        self.count += count
+
+    def save(self, dataset: LeRobotDataset, episode_index: int) -> int:
+        """Append the marks of a saved episode to meta/dropped_frames.jsonl and forget them."""
+        before = [frame_index for ep, frame_index in self._marks if ep == episode_index]
+        self._marks = [mark for mark in self._marks if mark[0] != episode_index]
+        if before:
+            path = Path(dataset.root) / DROPPED_FRAMES_PATH
+            with open(path, "a") as f:
+                f.write(json.dumps({"episode_index": episode_index, "dropped_before_frame_index": before}) + "\n")
+        return len(before)
+
+    def discard(self) -> None:
+        self._marks.clear()
+
+
+class MemoryBudget:
+    """Byte budget for camera frames that are in flight between capture and disk.
+
+    Two kinds of frames count against it: images queued on the image writers (`bytes_in_flight`) and
+    samples waiting in the async dataset writer's queue (`queued_bytes`). A queued sample is counted with
+    `try_queue()` when it is pushed, and `unqueue()` hands its bytes back once the writer thread has taken it
+    off the queue, before its images are acquired here. Pushing never blocks, so a sample that would not fit
+    is dropped there whatever the policy.
+
+    What happens when a frame does not fit depends on `policy`:
+    - "block": the caller waits until the image writers have freed enough memory. With the async dataset
+      writer that stalls the writer thread, never the control loop.
+    - "drop": the whole frame is left out of the episode and its position is marked, see `DropMarks`.
+    - "spill": the image is kept zlib-compressed in RAM until a writer thread gets to it. If even the
+      compressed image does not fit, the caller blocks.
+    """
+
+    def __init__(self, max_bytes: int, policy: str = "block", spill_level: int = 1):
+        if policy not in BUDGET_POLICIES:
+            raise ValueError(f"Unknown memory budget policy {policy!r}, expected one of {BUDGET_POLICIES}")
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.spill_level = spill_level
+
+        self.bytes_in_flight = 0
+        self.queued_bytes = 0
+        self.peak_bytes = 0
+        self.blocked_s = 0.0
+        self.blocked_count = 0
+        self.dropped_frames = 0
+        self.spilled_images = 0
+        self.spilled_raw_bytes = 0
+        self.spilled_bytes = 0
+        self.drop_marks = DropMarks()
+        self._cond = threading.Condition()
+
+    def try_acquire(self, nbytes: int) -> bool:
+        with self._cond:
+            # A single frame larger than the whole budget is let through alone rather than never
+            if self.bytes_in_flight + nbytes > self.max_bytes and self.bytes_in_flight > 0:
+                return False
+            self._add(nbytes)
+            return True
+
+    def acquire(self, nbytes: int) -> None:
+        """Reserve `nbytes`, waiting for releases if the budget is exhausted."""
+        with self._cond:
+            if self.bytes_in_flight + nbytes > self.max_bytes and self.bytes_in_flight > 0:
+                start = time.perf_counter()
+                self._cond.wait_for(
+                    lambda: self.bytes_in_flight + nbytes <= self.max_bytes or self.bytes_in_flight == 0
+                )
+                self.blocked_s += time.perf_counter() - start
+                self.blocked_count += 1
+            self._add(nbytes)
+
+    def release(self, nbytes: int) -> None:
+        with self._cond:
+            self.bytes_in_flight -= nbytes
+            self._cond.notify_all()
+
+    def try_queue(self, nbytes: int) -> bool:
+        """Count a sample entering the dataset writer's queue, unless the budget is full. Never blocks."""
+        with self._cond:
+            total = self.bytes_in_flight + self.queued_bytes
+            if total + nbytes > self.max_bytes and total > 0:
+                return False
+            self.queued_bytes += nbytes
+            self._update_peak()
+            return True
+
+    def unqueue(self, nbytes: int) -> None:
+        with self._cond:
+            self.queued_bytes -= nbytes
+            self._cond.notify_all()
+
+    def admit(self, nbytes: int) -> bool:
+        """Whether a frame of `nbytes` should be recorded. Only the "drop" policy ever says no."""
+        if self.policy != "drop":
+            return True
+        with self._cond:
+            return self.bytes_in_flight == 0 or self.bytes_in_flight + nbytes <= self.max_bytes
+
+    def mark_dropped(self, dataset: LeRobotDataset) -> None:
+        self.dropped_frames += 1
+        self.drop_marks.mark(dataset)
+        if self.dropped_frames == 1 or self.dropped_frames % 100 == 0:
+            logger.warning(
+                f"Recording memory budget of {self.max_bytes / 1e6:.0f} MB exceeded, dropped "
+                f"{self.dropped_frames} frames so far"
+            )
+
+    def spill(self, image: np.ndarray) -> tuple[bytes, tuple, np.dtype]:
+        compressed = zlib.compress(np.ascontiguousarray(image), self.spill_level)
+        self.spilled_images += 1
+        self.spilled_raw_bytes += image.nbytes
+        self.spilled_bytes += len(compressed)
+        return compressed, image.shape, image.dtype
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "max_bytes": self.max_bytes,
+            "bytes_in_flight": self.bytes_in_flight,
+            "queued_bytes": self.queued_bytes,
+            "peak_bytes": self.peak_bytes,
+            "blocked_s": self.blocked_s,
+            "blocked_count": self.blocked_count,
+            "dropped_frames": self.dropped_frames,
+            "spilled_images": self.spilled_images,
+            "spill_ratio": self.spilled_bytes / self.spilled_raw_bytes if self.spilled_raw_bytes else 0.0,
+        }
+
+    def format_metrics(self) -> str:
+        total = self.bytes_in_flight + self.queued_bytes
+        line = (
+            f"memory: {total / 1e6:.1f}/{self.max_bytes / 1e6:.0f} MB in flight "
+            f"({self.queued_bytes / 1e6:.1f} MB queued for the dataset writer, peak {self.peak_bytes / 1e6:.1f} MB, "
+            f"policy {self.policy})"
+        )
+        if self.blocked_count:
+            line += f" | blocked {self.blocked_count}x for {self.blocked_s:.2f}s"
+        if self.dropped_frames:
+            line += f" | dropped {self.dropped_frames} frames"
+        if self.spilled_images:
+            line += (
+                f" | spilled {self.spilled_images} images at "
+                f"{100 * self.spilled_bytes / self.spilled_raw_bytes:.0f}% size"
+            )
+        return line
+
+    def _add(self, nbytes: int) -> None:
+        self.bytes_in_flight += nbytes
+        self._update_peak()
+
+    def _update_peak(self) -> None:
+        self.peak_bytes = max(self.peak_bytes, self.bytes_in_flight + self.queued_bytes)
+
+
+class BudgetedImageWriter:
+    """Thread-pool image writer, interchangeable with LeRobot's `AsyncImageWriter`, under a `MemoryBudget`.
+
+    Every queued image holds its bytes against the budget until its PNG is written, so the queue can no
+    longer grow without limit when the disk falls behind.
+    """
+
+    def __init__(self, budget: MemoryBudget, num_threads: int = 4):
+        if num_threads <= 0:
+            raise ValueError("Number of threads must be greater than zero.")
+        self.budget = budget
+        self.num_threads = num_threads
+        self.queue: queue.Queue = queue.Queue()
+        self._stopped = False
+        self.threads = [
+            threading.Thread(target=self._worker, name=f"image-writer-{i}", daemon=True) for i in range(num_threads)
+        ]
+        for t in self.threads:
+            t.start()
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def save_image(self, image, fpath: Path) -> None:
+        if not isinstance(image, np.ndarray):
+            # Tensors and PIL images come from other callers than the recording loop, keep them as is
+            image = image.cpu().numpy() if hasattr(image, "cpu") else image
+        if not isinstance(image, np.ndarray):
+            self.queue.put((image, fpath, 0, None))
+            return
+
+        nbytes = image.nbytes
+        if self.budget.policy == "spill" and not self.budget.try_acquire(nbytes):
+            spilled = self.budget.spill(image)
+            nbytes = len(spilled[0])
+            self.budget.acquire(nbytes)
+            self.queue.put((None, fpath, nbytes, spilled))
+            return
+        if self.budget.policy != "spill":
+            self.budget.acquire(nbytes)
+        self.queue.put((image, fpath, nbytes, None))
+
+    def wait_until_done(self) -> None:
+        self.queue.join()
+
+    def stop(self) -> None:
+        if self._stopped:
+            return
+        for _ in self.threads:
+            self.queue.put(None)
+        for t in self.threads:
+            t.join()
+        self._stopped = True
+
+    def _worker(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+            image, fpath, nbytes, spilled = item
+            try:
+                if spilled is not None:
+                    data, shape, dtype = spilled
+                    image = np.frombuffer(zlib.decompress(data), dtype=dtype).reshape(shape)
+                write_image(image, fpath)
+            except Exception as e:
+                logger.error(f"Error writing image {fpath}: {e}")
+            finally:
+                if nbytes:
+                    self.budget.release(nbytes)
+                self.queue.task_done()
+
+
+def install_memory_budget(dataset: LeRobotDataset, budget: MemoryBudget, num_threads: int) -> BudgetedImageWriter:
+    """Replace the dataset's image writer with a `BudgetedImageWriter`."""
+    dataset.stop_image_writer()
+    dataset.image_writer = BudgetedImageWriter(budget, num_threads=num_threads)
+    return dataset.image_writer
+
+
+class MetricsReporter:
+    """Log live metrics lines every `interval_s` seconds from a background thread."""
+
+    def __init__(self, sources: list[Callable[[], str]], interval_s: float):
+        self.sources = sources
+        self.interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-reporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            for source in self.sources:
+                try:
+                    logger.info(source())
+                except Exception as e:
+                    logger.debug(f"Metrics source failed: {e}")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+
+import logging
+from pathlib import Path
+
+import numpy as np
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+
+from assembler0_robot.cameras.mjpeg import MJPEGFrame
+
+logger = logging.getLogger(__name__)
+
+
+class MJPEGPassthroughDataset(LeRobotDataset):
+    """LeRobotDataset that stores `MJPEGFrame`s of video features without decoding them.
+
+    The JPEG bytes are written as the episode's temporary frame files, which the video encoder reads
+    back (PIL detects the format from the content, not the `.png` name) and deletes once the episode
+    is encoded. Writing a few tens of KB needs no image writer thread, and the frames are decoded once,
+    by the encoder, instead of decoded at capture, PNG-encoded, and decoded again.
+
+    Image (non-video) features still get decoded frames, since their files end up in the dataset.
+    """
+
+    def add_frame(self, frame: dict, task: str, timestamp: float | None = None) -> None:
+        self._pending_mjpeg = {key: value for key, value in frame.items() if isinstance(value, MJPEGFrame)}
+        if not self._pending_mjpeg:
+            return super().add_frame(frame, task, timestamp)
+
+        # LeRobot only validates arrays, hand it zero-copy stand-ins of the right shape. `_save_image`
+        # swaps the real frames back in.
+        stand_ins = {key: np.broadcast_to(np.uint8(0), value.shape) for key, value in self._pending_mjpeg.items()}
+        try:
+            super().add_frame({**frame, **stand_ins}, task, timestamp)
+        finally:
+            self._pending_mjpeg = {}
+
+    def _save_image(self, image, fpath: Path) -> None:
+        # fpath is images/{image_key}/episode_{episode_index}/frame_{frame_index}.png
+        key = fpath.parent.parent.name
+        mjpeg = getattr(self, "_pending_mjpeg", {}).get(key)
+        if mjpeg is None:
+            return super()._save_image(image, fpath)
+        if key in self.meta.video_keys:
+            fpath.write_bytes(mjpeg.data)
+        else:
+            super()._save_image(mjpeg.decode(), fpath)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+
+import logging
+import time
+
+from lerobot.utils.robot_utils import busy_wait
+
+from assembler0_robot.utils.cameras import camera_threads_cpu_seconds, pause_cameras, resume_cameras
+
+logger = logging.getLogger(__name__)
+
+
+class ObservationCost:
+    """Measure what full observations cost while recording.
+
+    Tracks the control-thread CPU time spent in `robot.get_observation()` and the CPU time of the camera
+    read threads over an episode. A lightweight reset skips both, so they give an estimate of the CPU
+    time a reset would have spent on observations it throws away.
+    """
+
+    def __init__(self, robot):
+        self.robot = robot
+        self.read_cpu_s = 0.0
+        self.reads = 0
+        self.camera_cpu_s = 0.0
+        self.wall_s = 0.0
+        self._camera_cpu_start = 0.0
+        self._wall_start = None
+
+    def start(self) -> None:
+        self._camera_cpu_start = camera_threads_cpu_seconds(self.robot.cameras)
+        self._wall_start = time.perf_counter()
+
+    def record_read(self, cpu_s: float) -> None:
+        self.read_cpu_s += cpu_s
+        self.reads += 1
+
+    def stop(self) -> None:
+        if self._wall_start is None:
+            return
+        self.wall_s += time.perf_counter() - self._wall_start
+        # A camera thread restarted mid-episode resets its counter, never count that as negative time
+        self.camera_cpu_s += max(camera_threads_cpu_seconds(self.robot.cameras) - self._camera_cpu_start, 0.0)
+        self._wall_start = None
+
+    def estimate(self, ticks: int, duration_s: float) -> float:
+        """CPU seconds that `ticks` observation reads over `duration_s` would have cost."""
+        per_read_s = self.read_cpu_s / self.reads if self.reads else 0.0
+        camera_rate = self.camera_cpu_s / self.wall_s if self.wall_s > 0 else 0.0
+        return per_read_s * ticks + camera_rate * duration_s
+
+
+def reset_loop(
+    robot,
+    teleop,
+    events,
+    fps: int,
+    control_time_s: float,
+    idle_cameras: bool = True,
+    observation_cost: ObservationCost | None = None,
+) -> dict[str, float]:
+    """Teleoperate through the reset phase without reading observations.
+
+    Only forwards leader actions to the follower (which applies the screwdriver clutch in `send_action`)
+    and relays haptic feedback. With `idle_cameras` the camera read threads are stopped for the duration
+    of the reset, so frames are captured by the driver but never decoded, and restarted with fresh frames
+    before returning.
+    """
+    if idle_cameras:
+        pause_cameras(robot.cameras)
+
+    ticks = 0
+    cpu_start_s = time.process_time()
+    start_t = time.perf_counter()
+    try:
+        while time.perf_counter() - start_t < control_time_s:
+            start_loop_t = time.perf_counter()
+
+            if events["exit_early"]:
+                events["exit_early"] = False
+                break
+
+            action = teleop.get_action()
+            robot.send_action(action)
+
+            try:
+                feedback = robot.get_feedback()
+                if feedback:
+                    teleop.send_feedback(feedback)
+            except Exception as e:
+                logger.debug(f"Feedback warning: {e}")
+
+            ticks += 1
+            dt_s = time.perf_counter() - start_loop_t
+            busy_wait(1 / fps - dt_s)
+    finally:
+        duration_s = time.perf_counter() - start_t
+        cpu_s = time.process_time() - cpu_start_s
+        if idle_cameras:
+            resume_cameras(robot.cameras)
+
+    report = {"ticks": ticks, "duration_s": duration_s, "cpu_s": cpu_s}
+    if observation_cost is not None:
+        report["cpu_saved_s"] = observation_cost.estimate(ticks, duration_s)
+    return report
+
+
+def format_reset_report(report: dict[str, float]) -> str:
+    line = (
+        f"Reset: {report['ticks']} ticks in {report['duration_s']:.1f}s, "
+        f"process CPU {report['cpu_s']:.2f}s"
+    )
+    if "cpu_saved_s" in report:
+        line += f", ~{report['cpu_saved_s']:.2f}s CPU saved by skipping observations"
+    return line
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import datasets
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datasets import concatenate_datasets
+from datasets.table import InMemoryTable
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.utils import hf_transform_to_torch
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingParquetWriter:
+    """Write the joint data of the episode being recorded to Parquet one row group at a time.
+
+    A background thread watches `dataset.episode_buffer` and, every time `row_group_size` new frames
+    have been added, converts them to Arrow and appends a row group to ``<episode parquet>.part``. The
+    dataset's `_save_episode_table` is replaced so that `save_episode()` only writes the last partial row
+    group and renames the file, instead of converting the whole episode at once.
+
+    Only datasets without `image` features are supported (camera frames stored as videos or not at all),
+    since embedded images would have to be read back from disk anyway. Other datasets keep LeRobot's
+    behaviour.
+
+    `save_episode()` is wrapped too, so that the thread stops touching the buffer before LeRobot starts
+    converting its columns in place.
+
+    A buffer that gets replaced without being saved (`clear_episode_buffer()` on re-record) has its part
+    file deleted.
+    """
+
+    def __init__(self, dataset: LeRobotDataset, row_group_size: int = 300, poll_interval_s: float = 0.5):
+        self.dataset = dataset
+        self.row_group_size = row_group_size
+        self.poll_interval_s = poll_interval_s
+        self.enabled = not any(ft["dtype"] == "image" for ft in dataset.features.values())
+        if not self.enabled:
+            logger.warning("Streaming Parquet writes are disabled, the dataset stores frames as images")
+
+        self.row_groups_written = 0
+        self.flush_s = 0.0
+        self.finalize_s: list[float] = []
+        self.error: Exception | None = None
+
+        self._buffer: dict | None = None
+        self._flushed = 0
+        self._tables: list[pa.Table] = []
+        self._writer: pq.ParquetWriter | None = None
+        self._part_path: Path | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._saving = False
+
+        self._original_save_episode = dataset.save_episode
+        self._original_save_episode_table = dataset._save_episode_table
+        self._thread = None
+        if self.enabled:
+            # Hook the one step of `save_episode()` that converts and writes the episode table
+            dataset.save_episode = self._save_episode
+            dataset._save_episode_table = self._save_episode_table
+            self._thread = threading.Thread(target=self._run, name="parquet-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flush thread and drop the part file of an unsaved episode."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            self._discard()
+        self.dataset.save_episode = self._original_save_episode
+        self.dataset._save_episode_table = self._original_save_episode_table
+
+    def format_stats(self) -> str:
+        finalize_ms = 1e3 * self.finalize_s[-1] if self.finalize_s else 0.0
+        return (
+            f"parquet: {self.row_groups_written} row groups flushed in {self.flush_s:.2f}s, "
+            f"last episode finalized in {finalize_ms:.1f}ms"
+        )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_interval_s):
+            with self._lock:
+                try:
+                    self._flush_ready()
+                except Exception as e:
+                    # The episode is still written in full by `save_episode()`
+                    logger.warning(f"Streaming Parquet flush failed: {e}")
+                    self.error = e
+                    # Still tracking the buffer keeps the error until a new episode starts, so the failing
+                    # flush is not retried from frame 0 on every poll
+                    self._drop_part()
+
+    def _save_episode(self, *args, **kwargs) -> None:
+        with self._lock:
+            # Any flush in progress has finished, the thread skips the buffer until the save is done
+            self._saving = True
+        try:
+            self._original_save_episode(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._saving = False
+
+    def _flush_ready(self) -> None:
+        buffer = self.dataset.episode_buffer
+        if buffer is None or self._saving:
+            return
+        if buffer is not self._buffer:
+            self._start(buffer, buffer["episode_index"])
+        # Popped by a `save_episode()` that failed half way, the buffer is not being filled any more
+        size = buffer.get("size")
+        if size is None or self.error is not None:
+            return
+        while size - self._flushed >= self.row_group_size:
+            start = time.perf_counter()
+            self._write_rows(self._rows_from_lists(buffer, self._flushed, self._flushed + self.row_group_size))
+            self.flush_s += time.perf_counter() - start
+
+    def _start(self, buffer: dict, episode_index: int) -> None:
+        self._discard()
+        self._buffer = buffer
+        self._flushed = 0
+        self.error = None
+        ep_path = self.dataset.root / self.dataset.meta.get_data_file_path(ep_index=episode_index)
+        self._part_path = ep_path.with_name(ep_path.name + ".part")
+
+    def _discard(self) -> None:
+        self._drop_part()
+        self._buffer = None
+
+    def _drop_part(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._part_path is not None:
+            self._part_path.unlink(missing_ok=True)
+            self._part_path = None
+        self._flushed = 0
+        self._tables = []
+
+    def _rows_from_lists(self, buffer: dict, start: int, end: int) -> dict[str, Any]:
+        """Rows [start, end) of an episode buffer that is still being filled by `add_frame()`."""
+        meta = self.dataset.meta
+        rows = {}
+        for key in self.dataset.hf_features:
+            if key == "index":
+                rows[key] = np.arange(meta.total_frames + start, meta.total_frames + end)
+            elif key == "episode_index":
+                rows[key] = np.full((end - start,), buffer["episode_index"])
+            elif key == "task_index":
+                task_indices = []
+                for task in buffer["task"][start:end]:
+                    if meta.get_task_index(task) is None:
+                        # Registered now rather than in `save_episode()` so the index is known up front
+                        meta.add_task(task)
+                    task_indices.append(meta.get_task_index(task))
+                rows[key] = np.array(task_indices)
+            else:
+                rows[key] = np.stack(buffer[key][start:end])
+        return rows
+
+    def _write_rows(self, rows: dict[str, Any]) -> None:
+        table = datasets.Dataset.from_dict(rows, features=self.dataset.hf_features, split="train").data.table
+        if self._writer is None:
+            self._part_path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(self._part_path, table.schema)
+        self._writer.write_table(table, row_group_size=len(table))
+        self._tables.append(table)
+        self._flushed += len(table)
+        self.row_groups_written += 1
+
+    def _save_episode_table(self, episode_buffer: dict, episode_index: int) -> None:
+        start = time.perf_counter()
+        with self._lock:
+            try:
+                if self.error is not None or episode_buffer is not self._buffer:
+                    # Nothing usable was streamed for this buffer, write it all now
+                    self._start(episode_buffer, episode_index)
+                # `save_episode()` has turned every column into an array by now
+                length = len(episode_buffer["index"])
+                if length > self._flushed:
+                    self._write_rows(
+                        {key: episode_buffer[key][self._flushed :] for key in self.dataset.hf_features}
+                    )
+                self._writer.close()
+                self._writer = None
+                ep_data_path = self.dataset.root / self.dataset.meta.get_data_file_path(ep_index=episode_index)
+                self._part_path.replace(ep_data_path)
+                self._part_path = None
+                ep_table = pa.concat_tables(self._tables)
+            except Exception as e:
+                logger.warning(f"Falling back to writing episode {episode_index} in one go: {e}")
+                self._discard()
+                self._original_save_episode_table(episode_buffer, episode_index)
+                return
+            finally:
+                self._tables = []
+
+        ep_dataset = datasets.Dataset(InMemoryTable(ep_table), split=datasets.Split.TRAIN)
+        self.dataset.hf_dataset = concatenate_datasets([self.dataset.hf_dataset, ep_dataset])
+        self.dataset.hf_dataset.set_transform(hf_transform_to_torch)
+        self.finalize_s.append(time.perf_counter() - start)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+
+import logging
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import PIL.Image
+import torch
+
+from lerobot.datasets.compute_stats import auto_downsample_height_width
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.utils import write_info
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingVideoEncoder:
+    """Pipe raw RGB frames into an ffmpeg subprocess that writes an MP4 as the episode records.
+
+    Frames are handed over with `write()`, which only puts them on a bounded queue. A feeder thread
+    writes them into ffmpeg's stdin, so the (blocking) pipe writes never run on the caller's thread
+    unless the encoder is more than `max_queue_size` frames behind. The video is written to
+    ``<video_path>.part`` and renamed into place by `close()`, so an interrupted episode never leaves a
+    truncated MP4 in the dataset.
+
+    Codec defaults match LeRobot's `encode_video_frames` so streamed and batch-encoded episodes decode
+    the same way.
+    """
+
+    def __init__(
+        self,
+        video_path: Path,
+        width: int,
+        height: int,
+        fps: int,
+        vcodec: str = "libsvtav1",
+        pix_fmt: str = "yuv420p",
+        g: int | None = 2,
+        crf: int | None = 30,
+        preset: str | None = None,
+        max_queue_size: int = 64,
+    ):
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError("Streaming video encoding requires the `ffmpeg` binary on PATH")
+
+        self.video_path = Path(video_path)
+        self.part_path = self.video_path.with_name(self.video_path.name + ".part")
+        self.video_path.parent.mkdir(parents=True, exist_ok=True)
+        self.width = width
+        self.height = height
+
+        cmd = [
+            ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "pipe:0",
+            "-c:v", vcodec, "-pix_fmt", pix_fmt,
+        ]  # fmt: skip
+        if g is not None:
+            cmd += ["-g", str(g)]
+        if crf is not None:
+            cmd += ["-crf", str(crf)]
+        if preset is not None:
+            cmd += ["-preset", str(preset)]
+        cmd += ["-f", "mp4", str(self.part_path)]
+
+        self._process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+        self._queue: queue.Queue[np.ndarray | None] = queue.Queue(maxsize=max_queue_size)
+        self._error: Exception | None = None
+        self._thread = threading.Thread(target=self._feed, name=f"encoder-{self.video_path.stem}", daemon=True)
+        self._thread.start()
+
+        self.frames = 0
+        self.raw_bytes = 0
+        self.blocked_s = 0.0
+
+    def write(self, image: np.ndarray) -> None:
+        if self._error is not None:
+            self._process.wait()
+            stderr = self._process.stderr.read().decode(errors="replace").strip()
+            raise RuntimeError(f"ffmpeg failed to encode {self.video_path}: {stderr}") from self._error
+        if image.shape != (self.height, self.width, 3):
+            raise ValueError(f"Expected a {(self.height, self.width, 3)} frame, got {image.shape}")
+
+        frame = np.ascontiguousarray(image, dtype=np.uint8)
+        try:
+            self._queue.put_nowait(frame)
+        except queue.Full:
+            start = time.perf_counter()
+            self._queue.put(frame)
+            self.blocked_s += time.perf_counter() - start
+        self.frames += 1
+        self.raw_bytes += frame.nbytes
+
+    def close(self) -> int:
+        """Flush the remaining frames, finalize the MP4 and return its size in bytes."""
+        self._queue.put(None)
+        self._thread.join()
+        # stdin was closed by the feeder thread; ffmpeg only logs errors so stderr stays small
+        stderr = self._process.stderr.read()
+        self._process.wait()
+        if self._error is not None or self._process.returncode != 0:
+            self.part_path.unlink(missing_ok=True)
+            raise RuntimeError(
+                f"ffmpeg failed to encode {self.video_path} (exit code {self._process.returncode}): "
+                f"{stderr.decode(errors='replace').strip()}"
+            ) from self._error
+        self.part_path.replace(self.video_path)
+        return self.video_path.stat().st_size
+
+    def abort(self) -> None:
+        """Stop encoding and delete the partial video."""
+        self._process.kill()
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._queue.put(None)
+        self._thread.join()
+        self._process.wait()
+        self.part_path.unlink(missing_ok=True)
+
+    def _feed(self) -> None:
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            if self._error is not None:
+                continue
+            try:
+                self._process.stdin.write(memoryview(frame).cast("B"))
+            except (BrokenPipeError, OSError) as e:
+                self._error = e
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+
+
+class FrameSample:
+    """Evenly strided sample of an episode's frames, kept in memory for the image statistics.
+
+    Every `stride`-th frame is kept, downsampled the way LeRobot's `sample_images` does. When `2 * size`
+    frames have piled up, every other one is dropped and the stride doubles, so an episode of any length
+    ends up with between `size` and `2 * size` frames spread over all of it.
+    """
+
+    def __init__(self, size: int = 100):
+        self.size = size
+        self.stride = 1
+        self.frames: list[tuple[int, np.ndarray]] = []
+
+    def add(self, frame_index: int, image: np.ndarray) -> None:
+        if frame_index % self.stride:
+            return
+        # HWC in, same strides as `auto_downsample_height_width` on the CHW image
+        small = auto_downsample_height_width(image.transpose(2, 0, 1)).transpose(1, 2, 0)
+        self.frames.append((frame_index, np.ascontiguousarray(small)))
+        if len(self.frames) >= 2 * self.size:
+            self.stride *= 2
+            self.frames = [(i, frame) for i, frame in self.frames if i % self.stride == 0]
+
+
+class StreamingVideoDataset(LeRobotDataset):
+    """`LeRobotDataset` that streams video features straight into per-camera encoders.
+
+    Instead of writing a PNG per frame and encoding the episode after it is saved, every video frame
+    passed to `add_frame()` goes to a `StreamingVideoEncoder` for that camera and episode. When
+    `save_episode()` asks for the episode videos, the encoders only have to flush their tail, and the
+    MP4s land directly at the paths the dataset layout expects.
+
+    LeRobot computes the episode's image statistics from the frame files. Only a strided `FrameSample`
+    of each camera is written for that, downsampled, right before `save_episode()` computes them.
+    """
+
+    @classmethod
+    def create(cls, *args, streaming_options: dict | None = None, **kwargs) -> "StreamingVideoDataset":
+        obj = super().create(*args, **kwargs)
+        obj._init_streaming(streaming_options)
+        return obj
+
+    def __init__(self, *args, streaming_options: dict | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._init_streaming(streaming_options)
+
+    def _init_streaming(self, streaming_options: dict | None) -> None:
+        self.streaming_options = streaming_options or {}
+        self._encoders: dict[tuple[str, int], StreamingVideoEncoder] = {}
+        self._stats_samples: dict[tuple[str, int], FrameSample] = {}
+        self.streamed_frames = 0
+        self.streamed_raw_bytes = 0
+        self.video_bytes_written = 0
+        self.finalize_wait_s = 0.0
+        self.max_finalize_wait_s = 0.0
+        self.encoder_blocked_s = 0.0
+
+    def _save_image(self, image: torch.Tensor | np.ndarray | PIL.Image.Image, fpath: Path) -> None:
+        # `add_frame` builds fpath as images/{image_key}/episode_{episode_index}/frame_{frame_index}.png
+        image_key = fpath.parent.parent.name
+        if image_key not in self.meta.video_keys:
+            super()._save_image(image, fpath)
+            return
+
+        if isinstance(image, torch.Tensor):
+            image = image.cpu().numpy()
+        elif isinstance(image, PIL.Image.Image):
+            image = np.asarray(image.convert("RGB"))
+        if image.ndim == 3 and image.shape[0] == 3 and image.shape[-1] != 3:
+            image = image.transpose(1, 2, 0)
+        if image.dtype != np.uint8:
+            image = (image * 255).astype(np.uint8)
+
+        episode_index = self.episode_buffer["episode_index"]
+        encoder = self._encoders.get((image_key, episode_index))
+        if encoder is None:
+            height, width = image.shape[:2]
+            encoder = StreamingVideoEncoder(
+                self.root / self.meta.get_video_file_path(episode_index, image_key),
+                width=width,
+                height=height,
+                fps=self.fps,
+                **self.streaming_options,
+            )
+            self._encoders[(image_key, episode_index)] = encoder
+            self._stats_samples[(image_key, episode_index)] = FrameSample()
+        encoder.write(image)
+        # fpath.stem is frame_{frame_index}
+        self._stats_samples[(image_key, episode_index)].add(int(fpath.stem.split("_")[-1]), image)
+
+    def save_episode(self, episode_data: dict | None = None) -> None:
+        if not episode_data:
+            self._write_stats_samples()
+        super().save_episode(episode_data)
+
+    def _write_stats_samples(self) -> None:
+        """Write the sampled frames where `compute_episode_stats` looks for them, in place of every frame."""
+        episode_index = self.episode_buffer["episode_index"]
+        for key in self.meta.video_keys:
+            sample = self._stats_samples.pop((key, episode_index), None)
+            if sample is None:
+                continue
+            paths = []
+            for frame_index, image in sample.frames:
+                fpath = self._get_image_file_path(episode_index=episode_index, image_key=key, frame_index=frame_index)
+                fpath.parent.mkdir(parents=True, exist_ok=True)
+                PIL.Image.fromarray(image).save(fpath, compress_level=1)
+                paths.append(str(fpath))
+            self.episode_buffer[key] = paths
+
+    def encode_episode_videos(self, episode_index: int) -> None:
+        encoders = {key: self._encoders.pop((key, episode_index), None) for key in self.meta.video_keys}
+        if not any(encoders.values()):
+            # Frames were written as images (e.g. recorded before resuming in streaming mode)
+            super().encode_episode_videos(episode_index)
+            return
+
+        start = time.perf_counter()
+        for key, encoder in encoders.items():
+            if encoder is None:
+                raise RuntimeError(f"No frames were streamed for '{key}' in episode {episode_index}")
+            self.video_bytes_written += encoder.close()
+            self.streamed_frames += encoder.frames
+            self.streamed_raw_bytes += encoder.raw_bytes
+            self.encoder_blocked_s += encoder.blocked_s
+
+            # Holds the frames sampled for the image statistics, which have been computed by now
+            img_dir = self._get_image_file_path(episode_index=episode_index, image_key=key, frame_index=0).parent
+            shutil.rmtree(img_dir, ignore_errors=True)
+
+        wait_s = time.perf_counter() - start
+        self.finalize_wait_s += wait_s
+        self.max_finalize_wait_s = max(self.max_finalize_wait_s, wait_s)
+
+        if episode_index == 0:
+            self.meta.update_video_info()
+            write_info(self.meta.info, self.meta.root)
+
+    def clear_episode_buffer(self) -> None:
+        episode_index = self.episode_buffer["episode_index"]
+        for key in self.meta.video_keys:
+            encoder = self._encoders.pop((key, episode_index), None)
+            if encoder is not None:
+                encoder.abort()
+            self._stats_samples.pop((key, episode_index), None)
+        super().clear_episode_buffer()
+
+    def abort_streaming(self) -> None:
+        """Abort every open encoder, e.g. when recording stops mid-episode."""
+        for encoder in self._encoders.values():
+            encoder.abort()
+        self._encoders.clear()
+        self._stats_samples.clear()
+
+    def format_streaming_stats(self) -> str:
+        return (
+            f"Streaming video: {self.streamed_frames} frames, {self.streamed_raw_bytes / 1e6:.0f}MB raw piped to "
+            f"encoders, {self.video_bytes_written / 1e6:.1f}MB of MP4 written, only sampled frames saved as images. "
+            f"End-of-episode wait {self.finalize_wait_s:.2f}s total ({self.max_finalize_wait_s:.2f}s max), "
+            f"writer blocked on encoders {self.encoder_blocked_s:.2f}s"
+        )
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+import logging
+from typing import Any
+
+import numpy as np
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.utils import EPISODES_PATH, write_jsonlines
+
+from assembler0_robot.utils.timing import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+TIMING_KEY = "timing"
+# Not prefixed with "observation" or "action", so policies never see it as an input or a target
+TIMING_FEATURES = {
+    TIMING_KEY: {
+        "dtype": "float32",
+        "shape": (4,),
+        "names": ["loop_start_s", "observation_s", "action_s", "late"],
+    }
+}
+# A tick is only late once it starts this far past its period, which keeps sleep jitter out of the count
+LATE_TOLERANCE = 0.05
+
+
+class TickTimer:
+    """Per-tick timing of the recording loop for one episode.
+
+    `row()` builds the `timing` column of a frame: the tick's start relative to the episode start, how
+    long the observation read and the action (teleop read + send) took, and a late flag. The frame is
+    added to the dataset before its own tick has finished, so the flag marks a tick that started late
+    because the previous tick overran its period, not whether this tick overran. `end_tick()` records the
+    full loop time of every tick for the end-of-episode summary, overruns included.
+    """
+
+    def __init__(self, fps: int, max_ticks: int = 1 << 16):
+        self.period_s = 1 / fps
+        self.loop_time = LatencyStats(window=max_ticks)
+        self.overruns = 0
+        self.late_ticks = 0
+        self._episode_start_t: float | None = None
+        self._prev_start_t: float | None = None
+
+    def reset(self) -> None:
+        self.loop_time.reset()
+        self.overruns = 0
+        self.late_ticks = 0
+        self._episode_start_t = None
+        self._prev_start_t = None
+
+    def row(self, start_loop_t: float, observation_s: float, action_s: float) -> np.ndarray:
+        if self._episode_start_t is None:
+            self._episode_start_t = start_loop_t
+        late = (
+            self._prev_start_t is not None
+            and start_loop_t - self._prev_start_t > self.period_s * (1 + LATE_TOLERANCE)
+        )
+        self._prev_start_t = start_loop_t
+        self.late_ticks += late
+        return np.array(
+            [start_loop_t - self._episode_start_t, observation_s, action_s, float(late)], dtype=np.float32
+        )
+
+    def end_tick(self, dt_s: float) -> None:
+        self.loop_time.record(dt_s)
+        if dt_s > self.period_s:
+            self.overruns += 1
+
+    def summary(self) -> dict[str, Any]:
+        loop = self.loop_time.summary()
+        return {
+            "ticks": loop["count"],
+            "loop_p50_ms": round(loop["p50_ms"], 3),
+            "loop_p95_ms": round(loop["p95_ms"], 3),
+            "loop_p99_ms": round(loop["p99_ms"], 3),
+            "loop_max_ms": round(loop["max_ms"], 3),
+            "overruns": self.overruns,
+            "late_ticks": self.late_ticks,
+        }
+
+    def format_summary(self) -> str:
+        s = self.summary()
+        return (
+            f"Loop timing over {s['ticks']} ticks: p50={s['loop_p50_ms']:.1f}ms p95={s['loop_p95_ms']:.1f}ms "
+            f"p99={s['loop_p99_ms']:.1f}ms max={s['loop_max_ms']:.1f}ms, "
+            f"{s['overruns']} overruns of the {1e3 * self.period_s:.1f}ms period"
+        )
+
+
+def write_episode_timing(dataset: LeRobotDataset, episode_index: int, summary: dict[str, Any]) -> None:
+    """Store a timing summary under the "timing" key of the episode's entry in meta/episodes.jsonl."""
+    episode = dataset.meta.episodes.get(episode_index)
+    if episode is None:
+        logger.warning(f"Episode {episode_index} is not in the dataset metadata, its timing is not stored")
+        return
+    episode[TIMING_KEY] = summary
+    # LeRobot only ever appends to episodes.jsonl, rewrite it next to the original and swap it in
+    path = dataset.root / EPISODES_PATH
+    tmp_path = path.with_name(path.name + ".tmp")
+    write_jsonlines([dataset.meta.episodes[index] for index in sorted(dataset.meta.episodes)], tmp_path)
+    tmp_path.replace(path)
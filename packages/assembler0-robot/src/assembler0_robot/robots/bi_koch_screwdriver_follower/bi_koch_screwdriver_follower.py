@@ -2,12 +2,13 @@
 
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
 from typing import Any
 
-from lerobot.cameras.utils import make_cameras_from_configs
 from lerobot.robots.robot import Robot
 
+from ...cameras import camera_feature_shape, make_cameras
 from ..koch_screwdriver_follower import KochScrewdriverFollower, KochScrewdriverFollowerConfig
 from ..koch_follower import KochFollower, KochFollowerConfig
 from .config_bi_koch_screwdriver_follower import BiKochScrewdriverFollowerConfig
@@ -58,7 +59,12 @@ class BiKochScrewdriverFollower(Robot):
 
         self.left_arm = KochScrewdriverFollower(left_arm_config)
         self.right_arm = KochFollower(right_arm_config)
-        self.cameras = make_cameras_from_configs(config.cameras)
+        self.cameras = make_cameras(config.cameras, config.camera_transforms)
+        # (stage, start, end) perf_counter spans of the last observation's bus and camera reads
+        self.read_spans: list[tuple[str, float, float]] = []
+        # The arms sit on separate buses: the right arm is read and commanded on this thread while the
+        # calling thread handles the left arm
+        self._right_arm_executor: ThreadPoolExecutor | None = None
 
     @property
     def _motors_ft(self) -> dict[str, type]:
@@ -72,7 +78,8 @@ class BiKochScrewdriverFollower(Robot):
     @property
     def _cameras_ft(self) -> dict[str, tuple]:
         return {
-            cam: (self.config.cameras[cam].height, self.config.cameras[cam].width, 3) for cam in self.cameras
+            cam: camera_feature_shape(self.config.cameras[cam], self.config.camera_transforms.get(cam))
+            for cam in self.cameras
         }
 
     @cached_property
@@ -98,6 +105,7 @@ class BiKochScrewdriverFollower(Robot):
         
         self.left_arm.connect(connect_calibrate)
         self.right_arm.connect(connect_calibrate)
+        self._right_arm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="right-arm")
 
         for cam in self.cameras.values():
             cam.connect()
@@ -121,21 +129,30 @@ class BiKochScrewdriverFollower(Robot):
     def get_observation(self) -> dict[str, Any]:
         obs_dict = {}
 
+        # Read both arms at once
+        right_obs_future = self._right_arm_executor.submit(self.right_arm.get_observation)
+
         # Add "left_" prefix to left arm observations
         left_obs = self.left_arm.get_observation()
         obs_dict.update({f"left_{key}": value for key, value in left_obs.items()})
 
         # Add "right_" prefix to right arm observations
-        right_obs = self.right_arm.get_observation()
+        right_obs = right_obs_future.result()
         obs_dict.update({f"right_{key}": value for key, value in right_obs.items()})
 
+        read_spans = [(f"left {stage}", start, end) for stage, start, end in self.left_arm.read_spans]
+        read_spans += [(f"right {stage}", start, end) for stage, start, end in self.right_arm.read_spans]
+
         # Add camera observations
         for cam_key, cam in self.cameras.items():
             start = time.perf_counter()
             obs_dict[cam_key] = cam.async_read()
-            dt_ms = (time.perf_counter() - start) * 1e3
+            end = time.perf_counter()
+            read_spans.append((f"camera read {cam_key}", start, end))
+            dt_ms = (end - start) * 1e3
             logger.debug(f"{self} read {cam_key}: {dt_ms:.1f}ms")
 
+        self.read_spans = read_spans
         return obs_dict
 
     def send_action(self, action: dict[str, Any]) -> dict[str, Any]:
@@ -148,8 +165,10 @@ class BiKochScrewdriverFollower(Robot):
             key.removeprefix("right_"): value for key, value in action.items() if key.startswith("right_")
         }
 
+        # Command both arms at once
+        send_action_right_future = self._right_arm_executor.submit(self.right_arm.send_action, right_action)
         send_action_left = self.left_arm.send_action(left_action)
-        send_action_right = self.right_arm.send_action(right_action)
+        send_action_right = send_action_right_future.result()
 
         # Add prefixes back to returned actions
         prefixed_send_action_left = {f"left_{key}": value for key, value in send_action_left.items()}
@@ -164,6 +183,9 @@ class BiKochScrewdriverFollower(Robot):
         return {f"left_{key}": value for key, value in left_feedback.items()}
 
     def disconnect(self):
+        if self._right_arm_executor is not None:
+            self._right_arm_executor.shutdown()
+            self._right_arm_executor = None
         self.left_arm.disconnect()
         self.right_arm.disconnect()
 
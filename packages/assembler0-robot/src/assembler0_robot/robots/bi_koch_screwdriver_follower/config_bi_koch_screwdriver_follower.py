@@ -5,6 +5,8 @@ from dataclasses import dataclass, field
 from lerobot.cameras import CameraConfig
 from lerobot.robots.config import RobotConfig
 
+from assembler0_robot.cameras import CaptureTransform
+
 
 @RobotConfig.register_subclass("bi_koch_screwdriver_follower")
 @dataclass
@@ -31,4 +33,7 @@ class BiKochScrewdriverFollowerConfig(RobotConfig):
     right_arm_use_degrees: bool = False
 
     # Shared cameras
-    cameras: dict[str, CameraConfig] = field(default_factory=dict) 
\ No newline at end of file
+    cameras: dict[str, CameraConfig] = field(default_factory=dict)
+
+    # Optional per-camera crop/resize/grayscale applied once at capture, keyed by camera name
+    camera_transforms: dict[str, CaptureTransform] = field(default_factory=dict)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import logging
+import threading
 import time
 from functools import cached_property
 from typing import Any
@@ -58,6 +59,10 @@ class KochFollower(Robot):
             calibration=self.calibration,
         )
         self.cameras = make_cameras_from_configs(config.cameras)
+        # (stage, start, end) perf_counter spans of the last observation's bus and camera reads
+        self.read_spans: list[tuple[str, float, float]] = []
+        # Serializes bus transactions, so a control thread can send actions while another thread observes
+        self.bus_lock = threading.Lock()
 
     @property
     def _motors_ft(self) -> dict[str, type]:
@@ -173,18 +178,24 @@ class KochFollower(Robot):
 
         # Read arm position
         start = time.perf_counter()
-        obs_dict = self.bus.sync_read("Present_Position")
+        with self.bus_lock:
+            obs_dict = self.bus.sync_read("Present_Position")
         obs_dict = {f"{motor}.pos": val for motor, val in obs_dict.items()}
-        dt_ms = (time.perf_counter() - start) * 1e3
+        end = time.perf_counter()
+        read_spans = [("bus read", start, end)]
+        dt_ms = (end - start) * 1e3
         logger.debug(f"{self} read state: {dt_ms:.1f}ms")
 
         # Capture images from cameras
         for cam_key, cam in self.cameras.items():
             start = time.perf_counter()
             obs_dict[cam_key] = cam.async_read()
-            dt_ms = (time.perf_counter() - start) * 1e3
+            end = time.perf_counter()
+            read_spans.append((f"camera read {cam_key}", start, end))
+            dt_ms = (end - start) * 1e3
             logger.debug(f"{self} read {cam_key}: {dt_ms:.1f}ms")
 
+        self.read_spans = read_spans
         return obs_dict
 
     def send_action(self, action: dict[str, float]) -> dict[str, float]:
@@ -205,15 +216,16 @@ class KochFollower(Robot):
 
         goal_pos = {key.removesuffix(".pos"): val for key, val in action.items() if key.endswith(".pos")}
 
-        # Cap goal position when too far away from present position.
-        # /!\ Slower fps expected due to reading from the follower.
-        if self.config.max_relative_target is not None:
-            present_pos = self.bus.sync_read("Present_Position")
-            goal_present_pos = {key: (g_pos, present_pos[key]) for key, g_pos in goal_pos.items()}
-            goal_pos = ensure_safe_goal_position(goal_present_pos, self.config.max_relative_target)
+        with self.bus_lock:
+            # Cap goal position when too far away from present position.
+            # /!\ Slower fps expected due to reading from the follower.
+            if self.config.max_relative_target is not None:
+                present_pos = self.bus.sync_read("Present_Position")
+                goal_present_pos = {key: (g_pos, present_pos[key]) for key, g_pos in goal_pos.items()}
+                goal_pos = ensure_safe_goal_position(goal_present_pos, self.config.max_relative_target)
 
-        # Send goal position to the arm
-        self.bus.sync_write("Goal_Position", goal_pos)
+            # Send goal position to the arm
+            self.bus.sync_write("Goal_Position", goal_pos)
         return {f"{motor}.pos": val for motor, val in goal_pos.items()}
 
     def disconnect(self):
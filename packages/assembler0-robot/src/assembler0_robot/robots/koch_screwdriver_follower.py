@@ -1,13 +1,13 @@
 #!/usr/bin/env python
 
 import logging
+import threading
 import time
 from dataclasses import dataclass, field
 from functools import cached_property
 from typing import Any
 
 from lerobot.cameras import CameraConfig
-from lerobot.cameras.utils import make_cameras_from_configs
 from lerobot.errors import DeviceAlreadyConnectedError, DeviceNotConnectedError
 from lerobot.motors import Motor, MotorCalibration, MotorNormMode
 from lerobot.motors.dynamixel import (
@@ -18,6 +18,8 @@ from lerobot.robots.config import RobotConfig
 from lerobot.robots.robot import Robot
 from lerobot.robots.utils import ensure_safe_goal_position
 
+from assembler0_robot.cameras import CaptureTransform, camera_feature_shape, make_cameras
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +44,11 @@ class KochScrewdriverFollowerConfig(RobotConfig):
     # --robot.cameras="{ screwdriver: {type: opencv, index_or_path: /dev/video0, width: 800, height: 600, fps: 30}, side: {type: opencv, index_or_path: /dev/video2, width: 800, height: 600, fps: 30}}"
     cameras: dict[str, CameraConfig] = field(default_factory=dict)
 
+    # Optional per-camera crop/resize/grayscale applied once at capture, keyed by camera name, e.g.
+    # --robot.camera_transforms="{ screwdriver: {crop: [200, 150, 400, 300], resize: [224, 224]}}"
+    # The dataset features follow the transformed shape.
+    camera_transforms: dict[str, CaptureTransform] = field(default_factory=dict)
+
     # Set to `True` for backward compatibility with previous policies/dataset
     # See the [Hardware API Redesign PR](https://github.com/huggingface/lerobot/pull/777) for more details
     use_degrees: bool = False
@@ -90,7 +97,11 @@ class KochScrewdriverFollower(Robot):
             },
             calibration=self.calibration,
         )
-        self.cameras = make_cameras_from_configs(config.cameras)
+        self.cameras = make_cameras(config.cameras, config.camera_transforms)
+        # (stage, start, end) perf_counter spans of the last observation's bus and camera reads
+        self.read_spans: list[tuple[str, float, float]] = []
+        # Serializes bus transactions, so a control thread can send actions while another thread observes
+        self.bus_lock = threading.Lock()
 
     # called by observation_features method
     @property
@@ -103,7 +114,8 @@ class KochScrewdriverFollower(Robot):
     @property
     def _cameras_ft(self) -> dict[str, tuple]:
         return {
-            cam: (self.config.cameras[cam].height, self.config.cameras[cam].width, 3) for cam in self.cameras
+            cam: camera_feature_shape(self.config.cameras[cam], self.config.camera_transforms.get(cam))
+            for cam in self.cameras
         }
 
     @cached_property
@@ -229,29 +241,35 @@ class KochScrewdriverFollower(Robot):
         # Set num_retry=3 to help prevent:
         # ConnectionError: Failed to sync read 'Present_Velocity' on ids=[n] after 1 tries. [TxRxResult] There is no status packet!
         # FATAL: exception not rethrown
-        pos_dict = self.bus.sync_read("Present_Position", pos_motors, num_retry=3)
-        obs_dict = {}
-        for motor, val in pos_dict.items():
-            obs_dict[f"{motor}.pos"] = val
-
-        # Set num_retry=3 to help prevent:
-        # ConnectionError: Failed to sync read 'Present_Velocity' on ids=[n] after 1 tries. [TxRxResult] There is no status packet!
-        # FATAL: exception not rethrown
-        screwdriver_vel_raw = self.bus.sync_read("Present_Velocity", ["screwdriver"], num_retry=3)[
-            "screwdriver"
-        ]
-        obs_dict["screwdriver.vel"] = screwdriver_vel_raw
-
-        dt_ms = (time.perf_counter() - start) * 1e3
+        with self.bus_lock:
+            pos_dict = self.bus.sync_read("Present_Position", pos_motors, num_retry=3)
+            obs_dict = {}
+            for motor, val in pos_dict.items():
+                obs_dict[f"{motor}.pos"] = val
+
+            # Set num_retry=3 to help prevent:
+            # ConnectionError: Failed to sync read 'Present_Velocity' on ids=[n] after 1 tries. [TxRxResult] There is no status packet!
+            # FATAL: exception not rethrown
+            screwdriver_vel_raw = self.bus.sync_read("Present_Velocity", ["screwdriver"], num_retry=3)[
+                "screwdriver"
+            ]
+            obs_dict["screwdriver.vel"] = screwdriver_vel_raw
+
+        end = time.perf_counter()
+        read_spans = [("bus read", start, end)]
+        dt_ms = (end - start) * 1e3
         logger.debug(f"{self} read state: {dt_ms:.1f}ms")
 
         # Capture images from cameras
         for cam_key, cam in self.cameras.items():
             start = time.perf_counter()
             obs_dict[cam_key] = cam.async_read()
-            dt_ms = (time.perf_counter() - start) * 1e3
+            end = time.perf_counter()
+            read_spans.append((f"camera read {cam_key}", start, end))
+            dt_ms = (end - start) * 1e3
             logger.debug(f"{self} read {cam_key}: {dt_ms:.1f}ms")
 
+        self.read_spans = read_spans
         return obs_dict
 
     def send_action(self, action: dict[str, float]) -> dict[str, float]:
@@ -274,24 +292,25 @@ class KochScrewdriverFollower(Robot):
         goal_pos = {key.removesuffix(".pos"): val for key, val in action.items() if key.endswith(".pos")}
         goal_vel = {key.removesuffix(".vel"): int(val) for key, val in action.items() if key.endswith(".vel")}
 
-        # Cap goal position when too far away from present position.
-        # /!\ Slower fps expected due to reading from the follower.
-        if self.config.max_relative_target is not None and goal_pos:
-            present_pos = self.bus.sync_read(
-                "Present_Position", [m for m in self.bus.motors if m != "screwdriver"]
-            )
-            goal_present_pos = {key: (g_pos, present_pos[key]) for key, g_pos in goal_pos.items()}
-            goal_pos = ensure_safe_goal_position(goal_present_pos, self.config.max_relative_target)
-
-        # Send commands to the arm
-        if goal_pos:
-            self.bus.sync_write("Goal_Position", goal_pos)
-        if goal_vel:
-            # Apply software clutch for the screwdriver motor
-            if "screwdriver" in goal_vel:
-                goal_vel["screwdriver"] = self._apply_clutch(goal_vel["screwdriver"])
-
-            self.bus.sync_write("Goal_Velocity", goal_vel)
+        with self.bus_lock:
+            # Cap goal position when too far away from present position.
+            # /!\ Slower fps expected due to reading from the follower.
+            if self.config.max_relative_target is not None and goal_pos:
+                present_pos = self.bus.sync_read(
+                    "Present_Position", [m for m in self.bus.motors if m != "screwdriver"]
+                )
+                goal_present_pos = {key: (g_pos, present_pos[key]) for key, g_pos in goal_pos.items()}
+                goal_pos = ensure_safe_goal_position(goal_present_pos, self.config.max_relative_target)
+
+            # Send commands to the arm
+            if goal_pos:
+                self.bus.sync_write("Goal_Position", goal_pos)
+            if goal_vel:
+                # Apply software clutch for the screwdriver motor
+                if "screwdriver" in goal_vel:
+                    goal_vel["screwdriver"] = self._apply_clutch(goal_vel["screwdriver"])
+
+                self.bus.sync_write("Goal_Velocity", goal_vel)
 
         # Merge and return the actually sent commands
         sent_action = {f"{motor}.pos": val for motor, val in goal_pos.items()}
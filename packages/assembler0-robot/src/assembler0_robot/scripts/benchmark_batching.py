@@ -0,0 +1,147 @@
+# Throughput and latency of one policy server batching requests from N robot clients, for a range of client
+# counts and batching windows. Clients run in separate processes and send synthetic observations.
+
+"""
+Example usage:
+python -m assembler0_robot.scripts.benchmark_batching \
+    --model_path=wandb_downloads/<run>/6000/pretrained_model \
+    --device=cuda \
+    --clients=1,2,4,8 \
+    --batch_windows_ms=off,0,2,5
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import socket
+import threading
+import time
+
+from assembler0_robot.inference.registry import checkpoint_policy_type, policy_class
+from assembler0_robot.inference.server import PolicyClient, PolicyServer, model_key, sample_observation
+from assembler0_robot.utils.timing import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+SOCKET_PATH = "/tmp/assembler0_policy_benchmark.sock"
+
+
+def wait_for_server(timeout_s: float = 10.0) -> None:
+    deadline = time.perf_counter() + timeout_s
+    while time.perf_counter() < deadline:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            if probe.connect_ex(SOCKET_PATH) == 0:
+                return
+        time.sleep(0.01)
+    raise TimeoutError(f"Policy server did not start listening on {SOCKET_PATH}")
+
+
+def run_client(model_path: str, iterations: int, request_rate_hz: float, seed: int, results) -> None:
+    """One robot: `iterations` chunk requests, back to back or paced at `request_rate_hz`."""
+    client = PolicyClient(SOCKET_PATH, model_path)
+    observation, state_keys, camera_names = sample_observation(client.config, seed=seed)
+    client.open(state_keys, camera_names)
+    latencies = []
+    try:
+        next_t = time.perf_counter()
+        for _ in range(iterations):
+            start = time.perf_counter()
+            client.predict_actions(observation)
+            latencies.append(time.perf_counter() - start)
+            if request_rate_hz:
+                next_t += 1 / request_rate_hz
+                time.sleep(max(0.0, next_t - time.perf_counter()))
+    finally:
+        client.close()
+    results.put(latencies)
+
+
+def run_trial(model_path: str, num_clients: int, args) -> dict[str, float]:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    clients = [
+        context.Process(target=run_client, args=(model_path, args.iterations, args.request_rate_hz, seed, results))
+        for seed in range(num_clients)
+    ]
+    start = time.perf_counter()
+    for client in clients:
+        client.start()
+    latency = LatencyStats(window=num_clients * args.iterations)
+    for _ in clients:
+        for dt_s in results.get():
+            latency.record(dt_s)
+    elapsed_s = time.perf_counter() - start
+    for client in clients:
+        client.join()
+    summary = latency.summary()
+    return {
+        "requests_per_s": latency.count / elapsed_s,
+        "latency_p50_ms": summary["p50_ms"],
+        "latency_p95_ms": summary["p95_ms"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched inference for several robot clients")
+    parser.add_argument("--model_path", type=str, required=True,
+                       help="Path to the pretrained_model directory")
+    parser.add_argument("--device", type=str, default="cuda",
+                       help="Device to run the policy on (cuda, mps, cpu)")
+    parser.add_argument("--clients", type=str, default="1,2,4,8",
+                       help="Comma-separated numbers of concurrent robot clients")
+    parser.add_argument("--batch_windows_ms", type=str, default="off,0,2,5",
+                       help="Comma-separated batching windows in ms, 'off' serves every request on its own")
+    parser.add_argument("--max_batch_size", type=int, default=8,
+                       help="Largest batch run through the model at once")
+    parser.add_argument("--iterations", type=int, default=100,
+                       help="Chunk requests per client and trial, including process start up")
+    parser.add_argument("--request_rate_hz", type=float, default=0,
+                       help="Requests per second per client, 0 sends them back to back (saturation)")
+    parser.add_argument("--output_json", type=str, default=None,
+                       help="Also write the results to this JSON file")
+    parser.add_argument("--log_level", type=str, default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                       help="Logging level")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level))
+
+    policy = policy_class(checkpoint_policy_type(args.model_path)).from_pretrained(args.model_path)
+    policy.to(args.device)
+    policy.eval()
+    policies = {model_key(args.model_path): policy}
+
+    rows = []
+    for window in args.batch_windows_ms.split(","):
+        batch_window_s = None if window == "off" else float(window) / 1000
+        for num_clients in [int(n) for n in args.clients.split(",")]:
+            server = PolicyServer(
+                policies, args.device, SOCKET_PATH, batch_window_s=batch_window_s, max_batch_size=args.max_batch_size
+            )
+            serving = threading.Thread(target=server.serve_forever, name="policy-server")
+            serving.start()
+            try:
+                wait_for_server()
+                row = {"batch_window_ms": window, "clients": num_clients}
+                row.update(run_trial(args.model_path, num_clients, args))
+            finally:
+                server.shutdown()
+                serving.join()
+            batcher = server.batchers.get(model_key(args.model_path))
+            row["mean_batch_size"] = batcher.summary()["mean_batch_size"] if batcher is not None else 1.0
+            rows.append(row)
+            logger.info(
+                f"window={window:>4}ms clients={num_clients:>2}: {row['requests_per_s']:7.1f} requests/s, "
+                f"latency p50={row['latency_p50_ms']:.1f}ms p95={row['latency_p95_ms']:.1f}ms, "
+                f"mean batch {row['mean_batch_size']:.1f}"
+            )
+
+    if args.output_json:
+        with open(args.output_json, "w") as f:
+            json.dump(rows, f, indent=4)
+        logger.info(f"Results written to {args.output_json}")
+
+
+if __name__ == "__main__":
+    main()
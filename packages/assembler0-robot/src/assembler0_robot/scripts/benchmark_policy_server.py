@@ -0,0 +1,90 @@
+# Measures what serving a policy from scripts/policy_server.py costs per step, against calling it in-process.
+# Run the server first, on the same machine and device as --device here.
+
+"""
+Example usage:
+python -m assembler0_robot.scripts.benchmark_policy_server \
+    --model_path=wandb_downloads/<run>/6000/pretrained_model \
+    --device=cuda
+"""
+
+import argparse
+import logging
+import time
+
+import numpy as np
+import torch
+
+from assembler0_robot.inference.packing import ObservationPacker
+from assembler0_robot.inference.registry import checkpoint_policy_type, policy_class
+from assembler0_robot.inference.server import DEFAULT_SOCKET_PATH, PolicyClient, sample_observation
+from assembler0_robot.utils.timing import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+def benchmark(step, iterations: int, warmup: int) -> LatencyStats:
+    stats = LatencyStats(window=iterations)
+    for _ in range(warmup):
+        step()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        step()
+        stats.record(time.perf_counter() - start)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare policy server round trips with in-process calls")
+    parser.add_argument("--model_path", type=str, required=True,
+                       help="Path to the pretrained_model directory, as served by the policy server")
+    parser.add_argument("--socket_path", type=str, default=DEFAULT_SOCKET_PATH,
+                       help="Unix domain socket the policy server listens on")
+    parser.add_argument("--device", type=str, default="cuda",
+                       help="Device for the in-process policy, the server's device for a fair comparison")
+    parser.add_argument("--iterations", type=int, default=200,
+                       help="Number of timed steps per mode")
+    parser.add_argument("--warmup", type=int, default=10,
+                       help="Untimed steps before each mode")
+    parser.add_argument("--log_level", type=str, default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                       help="Logging level")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level))
+
+    client = PolicyClient(args.socket_path, args.model_path)
+    observation, state_keys, camera_names = sample_observation(client.config)
+    client.open(state_keys, camera_names)
+
+    policy = policy_class(checkpoint_policy_type(args.model_path)).from_pretrained(args.model_path)
+    policy.to(args.device)
+    policy.eval()
+    packer = ObservationPacker(state_keys, camera_names, args.device)
+
+    def in_process_step():
+        with torch.inference_mode():
+            chunk = policy.predict_action_chunk(packer.pack(observation))
+            return chunk[0, : client.config.n_action_steps].to("cpu").numpy()
+
+    try:
+        results = {
+            "in-process": benchmark(in_process_step, args.iterations, args.warmup),
+            "policy server": benchmark(lambda: client.predict_actions(observation), args.iterations, args.warmup),
+            "empty round trip": benchmark(client.ping, args.iterations, args.warmup),
+        }
+    finally:
+        client.close()
+
+    for mode, stats in results.items():
+        logger.info(f"{mode:<17} {stats.format()}")
+    overhead_ms = results["policy server"].summary()["p50_ms"] - results["in-process"].summary()["p50_ms"]
+    frame_bytes = sum(value.nbytes for value in observation.values() if isinstance(value, np.ndarray))
+    logger.info(
+        f"Serving adds {overhead_ms:.2f}ms per step at p50 ({frame_bytes / 1e6:.1f} MB of frames through shared "
+        f"memory), of which {results['empty round trip'].summary()['p50_ms']:.2f}ms is the socket round trip"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -27,10 +27,16 @@ from lerobot.utils.utils import (
 )
 from lerobot.utils.visualization_utils import _init_rerun, log_rerun_data
 
+from assembler0_robot.cameras import MJPEGCamera, MJPEGCameraConfig, parse_camera_transforms
 from assembler0_robot.robots.bi_koch_screwdriver_follower import BiKochScrewdriverFollower
 from assembler0_robot.robots.bi_koch_screwdriver_follower import BiKochScrewdriverFollowerConfig
+from assembler0_robot.recording.async_writer import AsyncFrameWriter
+from assembler0_robot.recording.mjpeg_dataset import MJPEGPassthroughDataset
+from assembler0_robot.recording.streaming_parquet import StreamingParquetWriter
+from assembler0_robot.recording.streaming_video import StreamingVideoDataset
 from assembler0_robot.teleoperators.bi_koch_screwdriver_leader import BiKochScrewdriverLeader
 from assembler0_robot.teleoperators.bi_koch_screwdriver_leader import BiKochScrewdriverLeaderConfig
+from assembler0_robot.utils.visualization import RerunVisualizer
 
 
 @safe_stop_image_writer
@@ -43,6 +49,8 @@ def record_loop(
     control_time_s=None,
     single_task=None,
     display_data: bool = False,
+    frame_writer: AsyncFrameWriter | None = None,
+    visualizer: RerunVisualizer | None = None,
 ):
     logger = logging.getLogger(__name__)
     if dataset is not None and dataset.fps != fps:
@@ -70,7 +78,7 @@ def record_loop(
                 events["exit_early"] = True
                 continue
 
-        if dataset is not None:
+        if dataset is not None and frame_writer is None:
             observation_frame = build_dataset_frame(dataset.features, observation, prefix="observation")
 
         # Get action from teleoperator
@@ -81,11 +89,17 @@ def record_loop(
         sent_action = robot.send_action(action)
 
         if dataset is not None:
-            action_frame = build_dataset_frame(dataset.features, sent_action, prefix="action")
-            frame = {**observation_frame, **action_frame}
-            dataset.add_frame(frame, task=single_task)
-
-        if display_data:
+            if frame_writer is not None:
+                # Frame building and image enqueueing happen on the writer thread
+                frame_writer.push(observation, sent_action, single_task)
+            else:
+                action_frame = build_dataset_frame(dataset.features, sent_action, prefix="action")
+                frame = {**observation_frame, **action_frame}
+                dataset.add_frame(frame, task=single_task)
+
+        if visualizer is not None:
+            visualizer.post(observation, action)
+        elif display_data:
             log_rerun_data(observation, action)
 
         dt_s = time.perf_counter() - start_loop_t
@@ -150,6 +164,13 @@ def main():
                        help="Camera height") 
     parser.add_argument("--camera_fps", type=int, default=30,
                        help="Camera FPS")
+    parser.add_argument("--camera_backend", type=str, default="opencv", choices=["opencv", "mjpeg"],
+                       help="'mjpeg' keeps the cameras' MJPEG frames compressed and only decodes them when pixels "
+                            "are needed (video encoding, display)")
+    parser.add_argument("--camera_transforms", type=str, default=None,
+                       help="JSON capture transforms per camera, e.g. "
+                            "'{\"screwdriver\": {\"crop\": [200, 150, 400, 300], \"resize\": [224, 224]}}'. "
+                            "Keys: crop [x, y, width, height], resize [height, width], grayscale")
     
     # Dataset configuration
     parser.add_argument("--dataset_repo_id", type=str, required=True,
@@ -174,12 +195,36 @@ def main():
                        help="Number of image writer processes")
     parser.add_argument("--num_image_writer_threads_per_camera", type=int, default=4,
                        help="Number of image writer threads per camera")
+    parser.add_argument("--streaming_video_encoding", type=lambda x: x.lower() in ['true', '1', 'yes'], default=False,
+                       help="Pipe camera frames straight into per-camera ffmpeg encoders instead of writing images "
+                            "and encoding after each episode")
+    parser.add_argument("--streaming_vcodec", type=str, default="libsvtav1",
+                       help="ffmpeg video codec used by --streaming_video_encoding (e.g. libsvtav1, libx264)")
+    parser.add_argument("--streaming_preset", type=str, default=None,
+                       help="Optional ffmpeg encoder preset used by --streaming_video_encoding")
+    parser.add_argument("--async_dataset_writer", type=lambda x: x.lower() in ['true', '1', 'yes'], default=False,
+                       help="Build and add dataset frames on a writer thread instead of inside the control tick")
+    parser.add_argument("--stream_parquet", type=lambda x: x.lower() in ['true', '1', 'yes'], default=False,
+                       help="Flush joint data to Parquet in row groups while recording so saving an episode only "
+                            "finalizes it (requires --encode_videos_after=true)")
+    parser.add_argument("--parquet_row_group_size", type=int, default=300,
+                       help="Frames per Parquet row group flushed by --stream_parquet")
+    parser.add_argument("--writer_queue_size", type=int, default=256,
+                       help="Maximum samples queued for the dataset writer before samples are dropped and marked "
+                            "in meta/dropped_frames.jsonl")
+    parser.add_argument("--writer_queue_mb", type=int, default=512,
+                       help="Maximum MB of camera frames queued for the dataset writer before samples are dropped "
+                            "(0 = only --writer_queue_size applies)")
     
     # Control parameters
     parser.add_argument("--fps", type=int, default=30,
                        help="Control loop frequency")
     parser.add_argument("--display_data", type=lambda x: x.lower() in ['true', '1', 'yes'], default=False,
                        help="Display camera feeds during recording")
+    parser.add_argument("--display_fps", type=float, default=10.0,
+                       help="Maximum rate at which --display_data updates the viewer, independent of --fps")
+    parser.add_argument("--display_max_width", type=int, default=320,
+                       help="Camera images are downsampled to at most this width for display (0 = full resolution)")
     parser.add_argument("--play_sounds", type=lambda x: x.lower() in ['true', '1', 'yes'], default=True,
                        help="Play audio notifications")
     parser.add_argument("--resume", type=lambda x: x.lower() in ['true', '1', 'yes'], default=False,
@@ -198,41 +243,45 @@ def main():
     )
     logger = logging.getLogger(__name__)
 
+    visualizer = None
     if args.display_data:
         _init_rerun(session_name="recording")
+        # Displayed from its own thread so the control loop keeps the same timing as without display
+        visualizer = RerunVisualizer(display_fps=args.display_fps, max_image_width=args.display_max_width)
 
     # Create camera configurations
+    camera_config_cls = MJPEGCameraConfig if args.camera_backend == "mjpeg" else OpenCVCameraConfig
     cameras = {}
     if args.screwdriver_camera:
-        cameras["screwdriver"] = OpenCVCameraConfig(
+        cameras["screwdriver"] = camera_config_cls(
             index_or_path=args.screwdriver_camera, 
             width=args.camera_width, 
             height=args.camera_height, 
             fps=args.camera_fps
         )
     if args.side_camera:
-        cameras["side"] = OpenCVCameraConfig(
+        cameras["side"] = camera_config_cls(
             index_or_path=args.side_camera, 
             width=args.camera_width, 
             height=args.camera_height, 
             fps=args.camera_fps
         )
     if args.top_camera:
-        cameras["top"] = OpenCVCameraConfig(
+        cameras["top"] = camera_config_cls(
             index_or_path=args.top_camera, 
             width=args.camera_width, 
             height=args.camera_height, 
             fps=args.camera_fps
         )
     if args.left_camera:
-        cameras["left"] = OpenCVCameraConfig(
+        cameras["left"] = camera_config_cls(
             index_or_path=args.left_camera, 
             width=args.camera_width, 
             height=args.camera_height, 
             fps=args.camera_fps
         )
     if args.right_camera:
-        cameras["right"] = OpenCVCameraConfig(
+        cameras["right"] = camera_config_cls(
             index_or_path=args.right_camera, 
             width=args.camera_width, 
             height=args.camera_height, 
@@ -247,6 +296,7 @@ def main():
         left_arm_id=args.left_robot_id,
         right_arm_id=args.right_robot_id,
         cameras=cameras,
+        camera_transforms=parse_camera_transforms(args.camera_transforms),
         left_arm_screwdriver_current_limit=args.left_screwdriver_current_limit,
         left_arm_clutch_ratio=args.left_clutch_ratio,
         left_arm_clutch_cooldown_s=args.left_clutch_cooldown_s,
@@ -271,22 +321,41 @@ def main():
     obs_features = hw_to_dataset_features(robot.observation_features, "observation", args.encode_videos_after)
     dataset_features = {**action_features, **obs_features}
 
+    dataset_cls = LeRobotDataset
+    dataset_kwargs = {}
+    image_writer_threads = args.num_image_writer_threads_per_camera * len(robot.cameras)
+    if args.streaming_video_encoding:
+        if not args.encode_videos_after:
+            parser.error("--streaming_video_encoding requires --encode_videos_after=true")
+        # Frames go to the encoders instead of image files, so no image writer is needed
+        dataset_cls = StreamingVideoDataset
+        dataset_kwargs["streaming_options"] = {"vcodec": args.streaming_vcodec, "preset": args.streaming_preset}
+        image_writer_threads = 0
+    if args.camera_backend == "mjpeg":
+        if args.streaming_video_encoding:
+            parser.error("--camera_backend=mjpeg cannot be combined with --streaming_video_encoding")
+        dataset_cls = MJPEGPassthroughDataset
+        if args.encode_videos_after:
+            # Compressed frames are written as they arrive, there is nothing for image writer threads to do
+            image_writer_threads = 0
+
     if args.resume:
-        dataset = LeRobotDataset(
+        dataset = dataset_cls(
             args.dataset_repo_id,
             root=args.dataset_root,
+            **dataset_kwargs,
         )
 
-        if hasattr(robot, "cameras") and len(robot.cameras) > 0:
+        if hasattr(robot, "cameras") and len(robot.cameras) > 0 and image_writer_threads > 0:
             dataset.start_image_writer(
                 num_processes=args.num_image_writer_processes,
-                num_threads=args.num_image_writer_threads_per_camera * len(robot.cameras),
+                num_threads=image_writer_threads,
             )
         sanity_check_dataset_robot_compatibility(dataset, robot, args.fps, dataset_features)
     else:
         # Create empty dataset or load existing saved episodes
         sanity_check_dataset_name(args.dataset_repo_id, None)
-        dataset = LeRobotDataset.create(
+        dataset = dataset_cls.create(
             args.dataset_repo_id,
             args.fps,
             root=args.dataset_root,
@@ -294,7 +363,18 @@ def main():
             features=dataset_features,
             use_videos=args.encode_videos_after,
             image_writer_processes=args.num_image_writer_processes,
-            image_writer_threads=args.num_image_writer_threads_per_camera * len(robot.cameras),
+            image_writer_threads=image_writer_threads,
+            **dataset_kwargs,
+        )
+
+    parquet_writer = None
+    if args.stream_parquet:
+        parquet_writer = StreamingParquetWriter(dataset, row_group_size=args.parquet_row_group_size)
+
+    frame_writer = None
+    if args.async_dataset_writer:
+        frame_writer = AsyncFrameWriter(
+            dataset, max_queue_size=args.writer_queue_size, max_queue_bytes=args.writer_queue_mb * 1_000_000
         )
 
     try:
@@ -328,7 +408,12 @@ def main():
                 control_time_s=args.episode_time_s,
                 single_task=args.single_task,
                 display_data=args.display_data,
+                frame_writer=frame_writer,
+                visualizer=visualizer,
             )
+            if frame_writer is not None:
+                frame_writer.flush()
+                logger.info(frame_writer.format_stats())
 
             # Execute a few seconds without recording to give time to manually reset the environment
             # Skip reset for the last episode to be recorded
@@ -344,6 +429,7 @@ def main():
                     control_time_s=args.reset_time_s,
                     single_task=args.single_task,
                     display_data=args.display_data,
+                    visualizer=visualizer,
                 )
 
             if events["rerecord_episode"]:
@@ -351,13 +437,32 @@ def main():
                 events["rerecord_episode"] = False
                 events["exit_early"] = False
                 dataset.clear_episode_buffer()
+                if frame_writer is not None:
+                    frame_writer.drop_marks.discard()
                 continue
 
+            episode_index = dataset.episode_buffer["episode_index"]
+            save_start_t = time.perf_counter()
             dataset.save_episode()
+            logger.info(f"Saved episode in {time.perf_counter() - save_start_t:.2f}s")
+            if frame_writer is not None:
+                dropped = frame_writer.drop_marks.save(dataset, episode_index)
+                if dropped:
+                    logger.warning(
+                        f"Episode {episode_index} is missing {dropped} dropped frames, see meta/dropped_frames.jsonl"
+                    )
+            if parquet_writer is not None:
+                logger.info(parquet_writer.format_stats())
             recorded_episodes += 1
 
         log_say("Stop recording", args.play_sounds, blocking=True)
 
+        if isinstance(dataset, StreamingVideoDataset):
+            logger.info(dataset.format_streaming_stats())
+        for cam in robot.cameras.values():
+            if isinstance(cam, MJPEGCamera):
+                logger.info(cam.format_stats())
+
         if args.push_to_hub:
             dataset.push_to_hub(private=args.private)
 
@@ -369,6 +474,18 @@ def main():
         logger.error(f"Error during recording: {e}")
         raise
     finally:
+        if visualizer is not None:
+            visualizer.stop()
+        if parquet_writer is not None:
+            parquet_writer.stop()
+        if frame_writer is not None:
+            try:
+                frame_writer.stop()
+            except Exception as e:
+                logger.error(f"Error stopping dataset writer: {e}")
+        if isinstance(dataset, StreamingVideoDataset):
+            # Drop the partial videos of an interrupted episode
+            dataset.abort_streaming()
         logger.info("Disconnecting devices...")
         try:
             robot.disconnect()
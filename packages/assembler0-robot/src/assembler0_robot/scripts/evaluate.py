@@ -0,0 +1,166 @@
+# Offline evaluation of a trained policy on recorded episodes, no robot needed.
+# Observations go through the same packing as scripts/inference.py.
+
+"""
+Example usage:
+python -m assembler0_robot.scripts.evaluate \
+    --model_path=wandb_downloads/<run>/6000/pretrained_model \
+    --dataset_repo_id=jackvial/screwdriver-391 \
+    --dataset_root=data/screwdriver-391 \
+    --episodes=380,381,382,383 \
+    --device=cpu
+"""
+
+import argparse
+import json
+import logging
+import time
+
+import numpy as np
+import torch
+
+from assembler0_robot.inference.onnx_backend import OnnxPolicy
+from assembler0_robot.inference.packing import ObservationPacker
+from assembler0_robot.inference.registry import checkpoint_policy_type, policy_class, predicts_chunks
+from assembler0_robot.inference.replay import IMAGES_PREFIX, interleaved_frames, load_episodes
+from assembler0_robot.utils.timing import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+class ActionErrorStats:
+    """Accumulates per-joint errors of predicted against recorded actions.
+
+    Velocity joints (".vel") also get sign agreement: both values are mapped to -1, 0 or +1, with
+    anything within `velocity_deadband` of zero counted as 0 (stopped), and compared.
+    """
+
+    def __init__(self, action_names: list[str], velocity_deadband: float):
+        self.action_names = action_names
+        self.velocity_deadband = velocity_deadband
+        self.velocity_joints = [i for i, name in enumerate(action_names) if name.endswith(".vel")]
+        self.frames = 0
+        self._abs_total = np.zeros(len(action_names))
+        self._sq_total = np.zeros(len(action_names))
+        self._abs_max = np.zeros(len(action_names))
+        self._sign_agree = np.zeros(len(action_names))
+
+    def record(self, predicted: np.ndarray, recorded: np.ndarray) -> None:
+        """Add a batch of (batch, action_dim) predicted and recorded actions."""
+        error = np.abs(predicted - recorded)
+        self.frames += len(error)
+        self._abs_total += error.sum(axis=0)
+        self._sq_total += (error**2).sum(axis=0)
+        self._abs_max = np.maximum(self._abs_max, error.max(axis=0))
+        for i in self.velocity_joints:
+            self._sign_agree[i] += (self._sign(predicted[:, i]) == self._sign(recorded[:, i])).sum()
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        frames = max(self.frames, 1)
+        summary = {}
+        for i, name in enumerate(self.action_names):
+            summary[name] = {
+                "mae": float(self._abs_total[i] / frames),
+                "rmse": float(np.sqrt(self._sq_total[i] / frames)),
+                "max": float(self._abs_max[i]),
+            }
+            if i in self.velocity_joints:
+                summary[name]["sign_agreement"] = float(self._sign_agree[i] / frames)
+        return summary
+
+    def _sign(self, values: np.ndarray) -> np.ndarray:
+        return np.where(np.abs(values) <= self.velocity_deadband, 0, np.sign(values))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate a policy offline against recorded episodes")
+    parser.add_argument("--model_path", type=str, required=True,
+                       help="Path to the trained pretrained_model directory (or its ONNX export with --backend=onnx)")
+    parser.add_argument("--dataset_repo_id", type=str, required=True,
+                       help="Dataset repository ID")
+    parser.add_argument("--dataset_root", type=str, default=None,
+                       help="Local dataset directory, read without hub access")
+    parser.add_argument("--episodes", type=str, default=None,
+                       help="Comma-separated episodes to evaluate on, e.g. 380,381,382 (default: all)")
+    parser.add_argument("--batch_size", type=int, default=8,
+                       help="Number of episodes run through the policy side by side, one frame each per batch")
+    parser.add_argument("--frame_stride", type=int, default=1,
+                       help="Evaluate every Nth frame of each episode")
+    parser.add_argument("--device", type=str, default="cpu",
+                       help="Device to run the policy on (cpu, cuda, mps)")
+    parser.add_argument("--backend", type=str, default="torch", choices=["torch", "onnx"],
+                       help="Run the PyTorch checkpoint, or its ONNX export with ONNX Runtime on CPU")
+    parser.add_argument("--velocity_deadband", type=float, default=5.0,
+                       help="Velocity commands within this of zero count as stopped for sign agreement (raw units)")
+    parser.add_argument("--output_json", type=str, default=None,
+                       help="Also write the metrics to this JSON file")
+    parser.add_argument("--log_level", type=str, default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                       help="Logging level")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level))
+
+    if args.backend == "onnx":
+        args.device = "cpu"
+        policy = OnnxPolicy.from_pretrained(args.model_path)
+    else:
+        policy = policy_class(checkpoint_policy_type(args.model_path)).from_pretrained(args.model_path)
+        policy.to(args.device)
+        policy.eval()
+    # Frames of several episodes are interleaved in one batch, each must be predicted from itself alone
+    if not predicts_chunks(policy) or getattr(policy.config, "n_obs_steps", 1) > 1:
+        raise ValueError(
+            f"The evaluator predicts batches of unrelated frames, {type(policy).__name__} needs select_action and "
+            "a history of observations from the same episode"
+        )
+
+    episodes = [int(episode) for episode in args.episodes.split(",")] if args.episodes else None
+    dataset = load_episodes(args.dataset_repo_id, args.dataset_root, episodes)
+    state_names = dataset.features["observation.state"]["names"]
+    action_names = dataset.features["action"]["names"]
+    camera_names = [key.removeprefix(IMAGES_PREFIX) for key in dataset.meta.camera_keys]
+    task = next(iter(dataset.meta.tasks.values()), None)
+    logger.info(f"Evaluating on {dataset.num_episodes} episodes, {dataset.num_frames} frames")
+
+    packer = ObservationPacker(state_names, camera_names, args.device, task=task, batch_size=args.batch_size)
+    errors = ActionErrorStats(action_names, args.velocity_deadband)
+    model_latency = LatencyStats(window=1 << 16)
+    start = time.perf_counter()
+
+    with torch.inference_mode():
+        for frames in interleaved_frames(dataset, args.batch_size, args.frame_stride):
+            batch = packer.pack_batch([observation for _, observation, _ in frames])
+            with model_latency.time():
+                predicted = policy.predict_action_chunk(batch)[:, 0].cpu().numpy()
+            errors.record(predicted, np.stack([action for _, _, action in frames]))
+            if model_latency.count % 50 == 0:
+                logger.info(f"{errors.frames} frames evaluated")
+
+    elapsed_s = time.perf_counter() - start
+    summary = errors.summary()
+    throughput = {
+        "frames": errors.frames,
+        "model_frames_per_s": errors.frames / model_latency.total_s if model_latency.total_s else 0.0,
+        "end_to_end_frames_per_s": errors.frames / elapsed_s,
+        "batch_latency_p50_ms": model_latency.summary()["p50_ms"],
+    }
+
+    logger.info(f"Action error against recorded actions over {errors.frames} frames:")
+    for name, stats in summary.items():
+        sign = f"  sign agreement={100 * stats['sign_agreement']:.1f}%" if "sign_agreement" in stats else ""
+        logger.info(f"  {name:<20} mae={stats['mae']:8.3f}  rmse={stats['rmse']:8.3f}  max={stats['max']:8.3f}{sign}")
+    logger.info(
+        f"Throughput: {throughput['model_frames_per_s']:.1f} frames/s through the model "
+        f"(batch of {args.batch_size}, p50 {throughput['batch_latency_p50_ms']:.1f}ms per batch), "
+        f"{throughput['end_to_end_frames_per_s']:.1f} frames/s including decoding and packing"
+    )
+
+    if args.output_json:
+        with open(args.output_json, "w") as f:
+            json.dump({"actions": summary, "throughput": throughput}, f, indent=4)
+        logger.info(f"Metrics written to {args.output_json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# Exports an ACT pretrained_model directory to ONNX for scripts/inference.py --backend=onnx.
+# The export is checked against PyTorch and both are timed on this machine's CPU.
+
+"""
+Example usage (or: drex robot export-onnx <pretrained_model>):
+python -m assembler0_robot.scripts.export_onnx \
+    --model_path=wandb_downloads/<run>/6000/pretrained_model
+"""
+
+import argparse
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import torch
+from lerobot.policies.act.modeling_act import ACTPolicy
+
+from assembler0_robot.inference.onnx_backend import (
+    ONNX_CONFIG_NAME,
+    ONNX_MODEL_NAME,
+    OnnxPolicy,
+    check_parity,
+    export_policy,
+    sample_inputs,
+)
+from assembler0_robot.utils.timing import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+def benchmark(predict, inputs: dict, iterations: int, warmup: int = 3) -> LatencyStats:
+    stats = LatencyStats(window=iterations)
+    for _ in range(warmup):
+        predict(inputs)
+    for _ in range(iterations):
+        start = time.perf_counter()
+        predict(inputs)
+        stats.record(time.perf_counter() - start)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export an ACT checkpoint to ONNX for CPU inference")
+    parser.add_argument("--model_path", type=str, required=True,
+                       help="Path to the trained pretrained_model directory")
+    parser.add_argument("--output", type=str, default=None,
+                       help=f"Output ONNX file (default: <model_path>/{ONNX_MODEL_NAME})")
+    parser.add_argument("--opset", type=int, default=17,
+                       help="ONNX opset version")
+    parser.add_argument("--num_samples", type=int, default=8,
+                       help="Number of sample observations used for the parity check")
+    parser.add_argument("--atol", type=float, default=1e-3,
+                       help="Largest absolute action difference allowed between PyTorch and ONNX Runtime")
+    parser.add_argument("--benchmark_iterations", type=int, default=50,
+                       help="Number of timed steps per backend for the latency comparison, 0 to skip it")
+    parser.add_argument("--num_threads", type=int, default=0,
+                       help="CPU threads for both backends, 0 keeps each library's default")
+    parser.add_argument("--log_level", type=str, default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                       help="Logging level")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level))
+
+    model_dir = Path(args.model_path)
+    output_path = Path(args.output) if args.output else model_dir / ONNX_MODEL_NAME
+    if args.num_threads:
+        torch.set_num_threads(args.num_threads)
+
+    logger.info(f"Loading policy from {model_dir}")
+    policy = ACTPolicy.from_pretrained(model_dir)
+
+    # Export next to the destination and only move the model and its config into place once they pass the
+    # parity check, so `--backend=onnx` never picks up a failed export
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    staging_dir = Path(tempfile.mkdtemp(prefix=".onnx_export_", dir=output_path.parent))
+    try:
+        staged_path = staging_dir / output_path.name
+        onnx_config = export_policy(policy, staged_path, opset=args.opset)
+        onnx_policy = OnnxPolicy(staged_path, onnx_config, num_threads=args.num_threads)
+
+        parity = check_parity(policy, onnx_policy, num_samples=args.num_samples)
+        logger.info(
+            f"Parity over {args.num_samples} sample observations: max abs diff={parity['max_abs']:.2e}, "
+            f"max rel diff={parity['max_rel']:.2e}"
+        )
+        if parity["max_abs"] > args.atol:
+            logger.error(f"ONNX output differs from PyTorch by more than {args.atol}, the export was discarded")
+            sys.exit(1)
+
+        staged_path.replace(output_path)
+        (staging_dir / ONNX_CONFIG_NAME).replace(output_path.with_name(ONNX_CONFIG_NAME))
+        logger.info(f"Wrote {output_path}")
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    if args.benchmark_iterations > 0:
+        inputs = sample_inputs(onnx_config)
+        torch_stats = benchmark(policy.predict_action_chunk, inputs, args.benchmark_iterations)
+        onnx_stats = benchmark(onnx_policy.predict_action_chunk, inputs, args.benchmark_iterations)
+        speedup = torch_stats.summary()["p50_ms"] / max(onnx_stats.summary()["p50_ms"], 1e-9)
+        logger.info(f"PyTorch (eager, CPU) per step: {torch_stats.format()}")
+        logger.info(f"ONNX Runtime (CPU) per step:   {onnx_stats.format()}")
+        logger.info(f"ONNX Runtime p50 speedup: {speedup:.2f}x")
+
+    logger.info(
+        f"Run it with: python -m assembler0_robot.scripts.inference --model_path={output_path.parent} --backend=onnx"
+    )
+
+
+if __name__ == "__main__":
+    main()
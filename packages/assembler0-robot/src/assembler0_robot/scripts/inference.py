@@ -8,27 +8,200 @@ See scripts/inference.py for example usage
 import time
 import logging
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 
-import torch
+# Start of the startup time breakdown, before the heavy imports
+STARTUP_T = time.perf_counter()
+
+import numpy as np
 
 from lerobot.cameras.opencv.configuration_opencv import OpenCVCameraConfig
-from lerobot.policies.act.modeling_act import ACTPolicy
-from lerobot.policies.diffusion.modeling_diffusion import DiffusionPolicy
-from lerobot.policies.smolvla.modeling_smolvla import SmolVLAPolicy
 from lerobot.utils.robot_utils import busy_wait
 
+from assembler0_robot.cameras import parse_camera_transforms
+from assembler0_robot.inference.control import VELOCITY_MODES, InterpolatingController
+from assembler0_robot.inference.engine import ActionQueue, ActionSmoothness, AsyncPolicyRunner, hold_action
+from assembler0_robot.inference.features import FeatureSchema, feature_schema
+from assembler0_robot.inference.onnx_backend import OnnxPolicy
+from assembler0_robot.inference.packing import ObservationPacker
+from assembler0_robot.inference.profiler import StageProfiler
+from assembler0_robot.inference.quantization import QUANTIZATION_MODES
+from assembler0_robot.inference.registry import checkpoint_policy_type, policy_class, predicts_chunks
+from assembler0_robot.inference.server import PolicyClient
+from assembler0_robot.robots.bi_koch_screwdriver_follower import BiKochScrewdriverFollower
+from assembler0_robot.robots.bi_koch_screwdriver_follower import BiKochScrewdriverFollowerConfig
 from assembler0_robot.robots.koch_screwdriver_follower import KochScrewdriverFollower
 from assembler0_robot.robots.koch_screwdriver_follower import KochScrewdriverFollowerConfig
+from assembler0_robot.utils.timing import LatencyStats, StageTimes
+
+TASK = "Move towards the orange panel positioned on the left side of the black rectangular base. Align with the silver screw in the center hole of the orange panel. Place the screwdriver bit on the screw, and turn clockwise until the screw has been fully tightened into the pinewood block below. Once the screw has been tightened, report to the start position."
+
+ROBOT_TYPES = ["koch_screwdriver_follower", "bi_koch_screwdriver_follower"]
+
+
+def predict_actions(
+    policy, batch: dict, horizon: int | None = None, profiler: StageProfiler | None = None
+) -> np.ndarray:
+    """Actions for the upcoming ticks, (n, action_dim), starting at the tick of the observation.
+
+    Chunking policies (ACT) return the first `horizon` (default `n_action_steps`) actions of a freshly
+    predicted chunk, others a single action. Policies that only predict through `select_action`
+    (Diffusion, see `predicts_chunks`) cannot be run this way.
+    """
+    profiler = profiler or StageProfiler(enabled=False)
+    predict_action_chunk = getattr(policy, "predict_action_chunk", None)
+    if predict_action_chunk is None:
+        with profiler.stage("select_action"):
+            action = policy.select_action(batch)
+    else:
+        with profiler.stage("predict_action_chunk"):
+            action = predict_action_chunk(batch)[0, : horizon or policy.config.n_action_steps]
+    with profiler.stage("device transfer"):
+        return action.to("cpu").numpy()
+
+
+def parse_episodes(value: str | None) -> list[int]:
+    return [int(episode) for episode in value.split(",")] if value else []
+
+
+def quantize_with_guardrail(policy, schema: FeatureSchema, args, logger):
+    """Quantize the policy, then refuse to deploy it if its actions stray too far from the float policy's.
+
+    Calibration (static mode) and the check both run recorded frames through the same packing as live
+    observations.
+    """
+    if not predicts_chunks(policy):
+        raise ValueError("--quantize checks predicted action chunks, this policy only predicts through select_action")
+    # Only needed here, and the dataset stack is slow to import
+    from assembler0_robot.inference.quantization import quantization_error, quantize_policy
+    from assembler0_robot.inference.replay import episode_frames, load_episodes
+
+    calibration_episodes = parse_episodes(args.calibration_episodes)
+    holdout_episodes = parse_episodes(args.holdout_episodes)
+    if not args.calibration_repo_id or not holdout_episodes:
+        raise ValueError("--quantize needs --calibration_repo_id and --holdout_episodes to check the quantized policy")
+    if args.quantize == "static" and not calibration_episodes:
+        raise ValueError("--quantize=static needs --calibration_episodes")
+
+    packer = ObservationPacker(schema.state_keys, schema.camera_names, "cpu", task=args.task)
+    calibration_batches = ()
+    if args.quantize == "static":
+        dataset = load_episodes(args.calibration_repo_id, args.calibration_root, calibration_episodes)
+        frames = episode_frames(dataset, args.calibration_frame_stride)
+        calibration_batches = (packer.pack(observation) for _, observation, _ in frames)
+    quantized = quantize_policy(policy, args.quantize, calibration_batches)
+
+    dataset = load_episodes(args.calibration_repo_id, args.calibration_root, holdout_episodes)
+    frames = episode_frames(dataset, args.calibration_frame_stride)
+    report = quantization_error(policy, quantized, ((packer.pack(obs), action) for _, obs, action in frames))
+    logger.info(f"Int8 vs float policy on {report['frames']} held-out frames (mean absolute action difference):")
+    for i, key in enumerate(schema.action_keys):
+        logger.info(
+            f"  {key:<18} int8 vs float={report['deviation'][i]:.3f}  "
+            f"error vs recorded: float={report['float_error'][i]:.3f} int8={report['quantized_error'][i]:.3f}"
+        )
+
+    worst = float(report["deviation"].max())
+    if worst > args.max_quantization_error:
+        raise RuntimeError(
+            f"Refusing to deploy the int8 policy: its actions differ from the float policy by up to {worst:.3f} "
+            f"(--max_quantization_error={args.max_quantization_error})"
+        )
+    return quantized
+
+
+def load_policy(args, logger, startup: StageTimes, observation_features: dict, action_features: dict):
+    """Load the checkpoint's policy, importing only the implementation its config asks for.
+
+    Returns the policy and its `FeatureSchema` against the robot's features, checked before any
+    quantization or device transfer.
+    """
+    logger.info(f"Loading policy from {args.model_path}")
+    if args.backend == "onnx":
+        if args.device != "cpu":
+            logger.warning(f"The ONNX backend runs on CPU, ignoring --device={args.device}")
+            args.device = "cpu"
+        with startup.stage("load weights"):
+            policy = OnnxPolicy.from_pretrained(args.model_path, num_threads=args.onnx_threads)
+        return policy, feature_schema(observation_features, action_features, policy)
+
+    with startup.stage("read config"):
+        policy_type = checkpoint_policy_type(args.model_path)
+    with startup.stage(f"import {policy_type}"):
+        policy_cls = policy_class(policy_type)
+    with startup.stage("load weights"):
+        policy = policy_cls.from_pretrained(args.model_path)
+    schema = feature_schema(observation_features, action_features, policy)
+    if args.quantize:
+        if args.device != "cpu":
+            logger.warning(f"The int8 policy runs on CPU, ignoring --device={args.device}")
+            args.device = "cpu"
+        with startup.stage("quantize"):
+            policy = quantize_with_guardrail(policy.to("cpu"), schema, args, logger)
+    with startup.stage("move to device"):
+        policy.to(args.device)
+    return policy, schema
+
+
+def make_robot(args):
+    """Single screwdriver arm, or the bimanual robot with the screwdriver arm on the left."""
+    cameras = {}
+    for name in ["screwdriver", "side", "top", "left", "right"]:
+        index_or_path = getattr(args, f"{name}_camera")
+        if index_or_path:
+            cameras[name] = OpenCVCameraConfig(
+                index_or_path=index_or_path,
+                width=args.camera_width,
+                height=args.camera_height,
+                fps=args.camera_fps
+            )
+    camera_transforms = parse_camera_transforms(args.camera_transforms)
+
+    if args.robot_type == "bi_koch_screwdriver_follower":
+        robot_config = BiKochScrewdriverFollowerConfig(
+            left_arm_port=args.left_robot_port,
+            right_arm_port=args.right_robot_port,
+            id=args.robot_id,
+            left_arm_id=args.left_robot_id,
+            right_arm_id=args.right_robot_id,
+            cameras=cameras,
+            camera_transforms=camera_transforms,
+            left_arm_screwdriver_current_limit=args.screwdriver_current_limit,
+            left_arm_clutch_ratio=args.clutch_ratio,
+            left_arm_clutch_cooldown_s=args.clutch_cooldown_s,
+        )
+        return BiKochScrewdriverFollower(robot_config)
+
+    robot_config = KochScrewdriverFollowerConfig(
+        port=args.robot_port,
+        id=args.robot_id,
+        cameras=cameras,
+        camera_transforms=camera_transforms,
+        screwdriver_current_limit=args.screwdriver_current_limit,
+        clutch_ratio=args.clutch_ratio,
+        clutch_cooldown_s=args.clutch_cooldown_s,
+    )
+    return KochScrewdriverFollower(robot_config)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Run inference with screwdriver robot")
     
     # Robot configuration
+    parser.add_argument("--robot_type", type=str, default="koch_screwdriver_follower", choices=ROBOT_TYPES,
+                       help="Robot to drive. Observations and actions are matched to the policy by feature name")
     parser.add_argument("--robot_port", type=str, default="/dev/servo_5837053138",
                        help="Serial port for the follower robot")
     parser.add_argument("--robot_id", type=str, default="koch_screwdriver_follower_testing",
                        help="ID for the follower robot")
+    parser.add_argument("--left_robot_port", type=str, default="/dev/servo_5837053138",
+                       help="Serial port for the left arm (screwdriver) of the bimanual robot")
+    parser.add_argument("--right_robot_port", type=str, default="/dev/servo_5837053139",
+                       help="Serial port for the right arm (gripper) of the bimanual robot")
+    parser.add_argument("--left_robot_id", type=str, default=None,
+                       help="ID for left arm robot (uses existing calibration if provided)")
+    parser.add_argument("--right_robot_id", type=str, default=None,
+                       help="ID for right arm robot (uses existing calibration if provided)")
     parser.add_argument("--screwdriver_current_limit", type=int, default=300,
                        help="Current limit for screwdriver motor")
     parser.add_argument("--clutch_ratio", type=float, default=0.5,
@@ -43,22 +216,84 @@ def main():
                        help="Path or index for side camera")  
     parser.add_argument("--top_camera", type=str, default="/dev/video6",
                        help="Path or index for top camera")
+    parser.add_argument("--left_camera", type=str, default=None,
+                       help="Path or index for left camera")
+    parser.add_argument("--right_camera", type=str, default=None,
+                       help="Path or index for right camera")
     parser.add_argument("--camera_width", type=int, default=800,
                        help="Camera width")
     parser.add_argument("--camera_height", type=int, default=600,
                        help="Camera height") 
     parser.add_argument("--camera_fps", type=int, default=30,
                        help="Camera FPS")
+    parser.add_argument("--camera_transforms", type=str, default=None,
+                       help="JSON capture transforms per camera, e.g. "
+                            "'{\"screwdriver\": {\"crop\": [200, 150, 400, 300], \"resize\": [224, 224]}}'. "
+                            "Keys: crop [x, y, width, height], resize [height, width], grayscale")
     
     # Inference parameters
     parser.add_argument("--model_path", type=str, required=True,
                        help="Path to the trained model checkpoint")
+    parser.add_argument("--policy_server", type=str, default=None,
+                       help="Unix socket of a running policy server (scripts/policy_server.py) serving --model_path. "
+                            "The policy is not loaded in this process, --device, --backend and --quantize apply on "
+                            "the server")
+    parser.add_argument("--task", type=str, default=TASK,
+                       help="Task description passed to language-conditioned policies")
     parser.add_argument("--duration", type=int, default=20,
                        help="Inference duration in seconds")
     parser.add_argument("--fps", type=int, default=30,
                        help="Control loop frequency")
     parser.add_argument("--device", type=str, default="cuda",
                        help="Device to run inference on (cuda, mps, cpu)")
+    parser.add_argument("--backend", type=str, default="torch", choices=["torch", "onnx"],
+                       help="Run the PyTorch checkpoint, or its ONNX export (drex robot export-onnx) with ONNX Runtime "
+                            "on CPU")
+    parser.add_argument("--onnx_threads", type=int, default=0,
+                       help="ONNX Runtime intra-op threads, 0 uses all cores")
+    parser.add_argument("--quantize", type=str, default=None, choices=QUANTIZATION_MODES,
+                       help="Run the PyTorch policy on CPU with int8 linear layers (dynamic), or int8 linear and "
+                            "convolution layers calibrated on recorded episodes (static)")
+    parser.add_argument("--calibration_repo_id", type=str, default=None,
+                       help="With --quantize, recorded dataset used for calibration and the held-out check")
+    parser.add_argument("--calibration_root", type=str, default=None,
+                       help="Local directory of the calibration dataset")
+    parser.add_argument("--calibration_episodes", type=str, default=None,
+                       help="Comma-separated episodes to calibrate static quantization on, e.g. 0,1,2")
+    parser.add_argument("--holdout_episodes", type=str, default=None,
+                       help="Comma-separated episodes the quantized policy is checked on against the float policy")
+    parser.add_argument("--calibration_frame_stride", type=int, default=10,
+                       help="Use every Nth frame of the calibration and held-out episodes")
+    parser.add_argument("--max_quantization_error", type=float, default=1.0,
+                       help="Refuse to run if any joint's mean absolute action difference between the int8 and "
+                            "float policy exceeds this")
+    parser.add_argument("--async_inference", type=lambda x: x.lower() in ['true', '1', 'yes'], default=False,
+                       help="Run the policy on its own thread, filling an action queue the control loop drains at "
+                            "--fps. The robot holds its position whenever the queue runs dry")
+    parser.add_argument("--refill_depth", type=int, default=10,
+                       help="With --async_inference, run the policy again once fewer than this many actions are queued")
+    parser.add_argument("--chunk_stride", type=int, default=0,
+                       help="Run the policy every K ticks and execute its predicted action chunk in between (ACT). "
+                            "0 calls select_action every tick")
+    parser.add_argument("--temporal_ensemble_coeff", type=float, default=None,
+                       help="Blend overlapping chunks with exponential temporal ensembling, weighting the k-th oldest "
+                            "prediction of a tick by exp(-coeff * k) (ACT uses 0.01). Applies to --chunk_stride and "
+                            "--async_inference")
+    parser.add_argument("--control_rate_hz", type=float, default=0,
+                       help="Stream goals interpolated through the predicted action chunk to the robot at this rate "
+                            "(100-200) on a dedicated thread, instead of stepping to a new action every tick. Without "
+                            "--chunk_stride or --async_inference, replans every n_action_steps ticks. 0 disables")
+    parser.add_argument("--velocity_mode", type=str, default="hold", choices=VELOCITY_MODES,
+                       help="With --control_rate_hz, hold each screwdriver velocity command for its tick, or ramp "
+                            "linearly between commands")
+    parser.add_argument("--profile", type=lambda x: x.lower() in ['true', '1', 'yes'], default=False,
+                       help="Time every stage of the loop (bus read, camera reads, packing, model, device transfer, "
+                            "send_action) and log a latency table every --profile_interval_s")
+    parser.add_argument("--profile_interval_s", type=float, default=5.0,
+                       help="Seconds between --profile latency tables")
+    parser.add_argument("--trace_path", type=str, default=None,
+                       help="Write the profiled stages as a Chrome trace (chrome://tracing, Perfetto) JSON file at "
+                            "exit, implies --profile")
     
     args = parser.parse_args()
 
@@ -66,125 +301,217 @@ def main():
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
 
+    startup = StageTimes(start_t=STARTUP_T)
+    startup.record("imports", time.perf_counter() - STARTUP_T)
+    if args.quantize and args.backend != "torch":
+        raise ValueError("--quantize applies to the PyTorch backend")
+
+    runner = None
+    client = None
+    controller = None
+    connect_future = None
+    profiler = StageProfiler(enabled=args.profile or args.trace_path is not None)
+    connect_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="robot-connect")
     try:
-        # Load the policy
-        logger.info(f"Loading policy from {args.model_path}")
-        policy = ACTPolicy.from_pretrained(args.model_path)
-        # policy = DiffusionPolicy.from_pretrained(args.model_path)
-        # policy = SmolVLAPolicy.from_pretrained(args.model_path)
-        policy.to(args.device)
+        robot = make_robot(args)
+        # Read before connecting, on this thread, as connect() runs in parallel with loading the policy
+        observation_features = robot.observation_features
+        action_features = robot.action_features
         
-        # Create robot config and instance
-        cameras = {}
-        if args.screwdriver_camera:
-            cameras["screwdriver"] = OpenCVCameraConfig(
-                index_or_path=args.screwdriver_camera, 
-                width=args.camera_width, 
-                height=args.camera_height, 
-                fps=args.camera_fps
-            )
-        if args.side_camera:
-            cameras["side"] = OpenCVCameraConfig(
-                index_or_path=args.side_camera, 
-                width=args.camera_width, 
-                height=args.camera_height, 
-                fps=args.camera_fps
-            )
-        if args.top_camera:
-            cameras["top"] = OpenCVCameraConfig(
-                index_or_path=args.top_camera, 
-                width=args.camera_width, 
-                height=args.camera_height, 
-                fps=args.camera_fps
-            )
-        
-        robot_config = KochScrewdriverFollowerConfig(
-            port=args.robot_port,
-            id=args.robot_id,
-            cameras=cameras,
-            screwdriver_current_limit=args.screwdriver_current_limit,
-            clutch_ratio=args.clutch_ratio,
-            clutch_cooldown_s=args.clutch_cooldown_s,
-        )
-        robot = KochScrewdriverFollower(robot_config)
-        
-        # Connect robot
+        # Connect robot and cameras while the policy loads
         logger.info("Connecting robot...")
-        robot.connect()
+
+        def connect_robot():
+            with startup.stage("connect robot (parallel)"):
+                robot.connect()
+
+        connect_future = connect_executor.submit(connect_robot)
+        if args.policy_server:
+            with startup.stage("connect to policy server"):
+                policy = client = PolicyClient(args.policy_server, args.model_path)
+                schema = feature_schema(observation_features, action_features, client)
+                client.open(schema.state_keys, schema.camera_names, task=args.task)
+        else:
+            policy, schema = load_policy(args, logger, startup, observation_features, action_features)
+        logger.info(
+            f"Policy reads {len(schema.state_keys)} state values and cameras {schema.camera_names}, "
+            f"drives {schema.action_keys}"
+        )
+        with startup.stage("wait for robot"):
+            connect_future.result()
         
         logger.info(f"Starting inference for {args.duration} seconds at {args.fps} FPS")
         
         total_steps = args.duration * args.fps
-        
+        model_latency = LatencyStats()
+        smoothness = ActionSmoothness()
+        # Converts observations to the policy's batch format: channel first, float32 in [0,1], batch of one.
+        # The policy server packs them on its side
+        packer = None
+        if client is None:
+            packer = ObservationPacker(schema.state_keys, schema.camera_names, args.device, task=args.task)
+        # Packing or server round trip statistics
+        input_stats = client if client is not None else packer
+
+        def pack(observation: dict) -> dict:
+            with profiler.stage("pack"):
+                return packer.pack(observation)
+
+        if args.control_rate_hz > 0 and not args.async_inference and args.chunk_stride == 0:
+            # Interpolation needs the chunk ahead, replan as often as select_action would
+            args.chunk_stride = getattr(policy.config, "n_action_steps", 1)
+            logger.info(f"Interpolated control, running the policy every {args.chunk_stride} ticks")
+
+        # Blending overlapping chunks or replanning every K ticks uses the whole predicted chunk
+        if args.chunk_stride > 0 or args.temporal_ensemble_coeff is not None:
+            horizon = getattr(policy.config, "chunk_size", 1)
+        else:
+            horizon = getattr(policy.config, "n_action_steps", 1)
+        if (args.async_inference or args.chunk_stride > 0) and not predicts_chunks(policy):
+            raise ValueError(
+                "--async_inference, --chunk_stride and --control_rate_hz run on predicted action chunks, but this "
+                "policy only predicts actions through select_action (Diffusion). Run it without them"
+            )
+        if args.chunk_stride > horizon:
+            raise ValueError(f"--chunk_stride {args.chunk_stride} is longer than the policy's chunk of {horizon}")
+
+        # Upcoming actions from a fresh chunk, and the next single action, computed here or by the server
+        if client is not None:
+            def infer_actions(observation: dict) -> np.ndarray:
+                with profiler.stage("policy server"):
+                    return client.predict_actions(observation, horizon)
+
+            def infer_action(observation: dict) -> np.ndarray:
+                with profiler.stage("policy server"):
+                    return client.select_action(observation)
+        else:
+            def infer_actions(observation: dict) -> np.ndarray:
+                return predict_actions(policy, pack(observation), horizon, profiler)
+
+            def infer_action(observation: dict) -> np.ndarray:
+                processed_observation = pack(observation)
+                with profiler.stage("select_action"):
+                    action = policy.select_action(processed_observation)
+                # Remove batch dimension, move to cpu, if not already the case
+                with profiler.stage("device transfer"):
+                    return action.squeeze(0).to("cpu").numpy()
+
+        chunk_queue = None
+        if args.async_inference:
+            runner = AsyncPolicyRunner(
+                infer_actions,
+                action_dim=len(schema.action_keys),
+                max_queue_size=horizon,
+                refill_depth=args.refill_depth,
+                ensemble_coeff=args.temporal_ensemble_coeff,
+            )
+            model_latency = runner.latency
+        elif args.chunk_stride > 0:
+            chunk_queue = ActionQueue(len(schema.action_keys), horizon, ensemble_coeff=args.temporal_ensemble_coeff)
+        action_queue = runner.queue if runner is not None else chunk_queue
+
+        if args.control_rate_hz > 0:
+            controller = InterpolatingController(
+                robot, schema.action_keys, rate_hz=args.control_rate_hz, velocity_mode=args.velocity_mode
+            )
+
+        loop_start_t = time.perf_counter()
+        last_profile_t = loop_start_t
+
         for t in range(total_steps):
             start_time = time.perf_counter()
 
             # Read the follower state and access the frames from the cameras
-            observation = robot.get_observation()
-
-            # Convert to pytorch format: channel first and float32 in [0,1]
-            # with batch dimension
-            processed_observation = {}
-
-            # Collect motor states in the correct order
-            # Based on koch_screwdriver_follower, we have 5 position states + 1 velocity state
-            state_values = []
-            state_values.append(observation["shoulder_pan.pos"])
-            state_values.append(observation["shoulder_lift.pos"])
-            state_values.append(observation["elbow_flex.pos"])
-            state_values.append(observation["wrist_flex.pos"])
-            state_values.append(observation["wrist_roll.pos"])
-            state_values.append(observation["screwdriver.vel"])
-
-            # Combine into a single state tensor
-            state_tensor = torch.tensor(state_values, dtype=torch.float32).unsqueeze(0)
-            processed_observation["observation.state"] = state_tensor.to(args.device)
-
-            # Process images
-            for cam_name in ["screwdriver", "side", "top"]:
-                if cam_name in observation:
-                    # Convert numpy image to tensor: HWC -> CHW, normalize to [0,1]
-                    image = torch.from_numpy(observation[cam_name]).float() / 255.0
-                    image = image.permute(2, 0, 1).contiguous()
-                    image = image.unsqueeze(0)  # Add batch dimension
-                    processed_observation[f"observation.images.{cam_name}"] = image.to(args.device)
-                    
-            processed_observation["task"] = "Move towards the orange panel positioned on the left side of the black rectangular base. Align with the silver screw in the center hole of the orange panel. Place the screwdriver bit on the screw, and turn clockwise until the screw has been fully tightened into the pinewood block below. Once the screw has been tightened, report to the start position."
-
-            # Compute the next action with the policy
-            # based on the current observation
-            action = policy.select_action(processed_observation)
-            # Remove batch dimension
-            action = action.squeeze(0)
-            # Move to cpu, if not already the case
-            action = action.to("cpu")
-
-            # Convert action tensor to dictionary format expected by robot
-            action_dict = {
-                "shoulder_pan.pos": action[0].item(),
-                "shoulder_lift.pos": action[1].item(),
-                "elbow_flex.pos": action[2].item(),
-                "wrist_flex.pos": action[3].item(),
-                "wrist_roll.pos": action[4].item(),
-                "screwdriver.vel": action[5].item(),
-            }
-
-            robot.send_action(action_dict)
+            with profiler.stage("get_observation"):
+                observation = robot.get_observation()
+            profiler.record_spans(robot.read_spans)
+
+            if runner is not None:
+                if runner.error is not None:
+                    raise RuntimeError("Policy thread stopped") from runner.error
+                runner.post(observation, t)
+                action = runner.pop(t)
+            elif chunk_queue is not None:
+                if t % args.chunk_stride == 0:
+                    with model_latency.time():
+                        chunk_queue.push(infer_actions(observation), t)
+                action = chunk_queue.pop(t)
+            else:
+                # Compute the next action with the policy
+                # based on the current observation
+                with model_latency.time():
+                    action = infer_action(observation)
+
+            if action is None:
+                # The model has not caught up yet, keep the arm still rather than repeat a stale action
+                action_dict = hold_action(observation, schema.action_keys)
+            else:
+                # Convert action to dictionary format expected by robot
+                action_dict = schema.unpack_action(action)
+
+            if controller is not None:
+                if controller.error is not None:
+                    raise RuntimeError("Control thread stopped") from controller.error
+                # The action for this tick is reached by the end of it, the ones after at the following ticks.
+                # With no actions queued the controller's goal comes to rest and velocity joints stop
+                controller.update(action_queue.upcoming(t), start_time + 1 / args.fps, 1 / args.fps)
+            else:
+                with profiler.stage("send_action"):
+                    robot.send_action(action_dict)
+            smoothness.record([action_dict[key] for key in schema.action_keys])
+            if t == 0:
+                startup.record("first tick", time.perf_counter() - start_time)
+                logger.info(startup.format())
 
             # Print progress every second
             if t % args.fps == 0:
                 elapsed = t // args.fps
                 logger.info(f"Step: {t}, Time: {elapsed}s / {args.duration}s")
+                if runner is not None:
+                    logger.info(runner.format_stats())
+                elif model_latency.count:
+                    logger.info(f"model {model_latency.format()}")
+                if t:
+                    calls_per_s = model_latency.count / (time.perf_counter() - loop_start_t)
+                    logger.info(f"{calls_per_s:.1f} model calls/s, actions {smoothness.format()}")
+                    logger.info(input_stats.format_stats())
+                    if controller is not None:
+                        logger.info(f"Interpolated control: {controller.format_stats()}")
+
+            end_time = time.perf_counter()
+            profiler.record("tick", start_time, end_time)
+            if profiler.enabled and end_time - last_profile_t >= args.profile_interval_s:
+                logger.info(f"Loop stages over the last {profiler.window} ticks:\n{profiler.format_table()}")
+                last_profile_t = end_time
 
             dt_s = time.perf_counter() - start_time
             busy_wait(1 / args.fps - dt_s)
             
+        calls_per_s = model_latency.count / (time.perf_counter() - loop_start_t)
+        logger.info(f"{calls_per_s:.1f} model calls/s at {args.fps} FPS, actions {smoothness.format()}")
+        logger.info(input_stats.format_stats())
         logger.info("Inference completed successfully!")
         
     except Exception as e:
         logger.error(f"Error during inference: {e}")
         raise
     finally:
+        if controller is not None:
+            controller.stop()
+            logger.info(f"Interpolated control: {controller.format_stats()}")
+        if runner is not None:
+            runner.stop()
+            logger.info(f"Async inference: {runner.format_stats()}")
+        if client is not None:
+            client.close()
+        if profiler.enabled:
+            logger.info(f"Loop stages:\n{profiler.format_table()}")
+        if args.trace_path:
+            profiler.write_chrome_trace(args.trace_path)
+        if connect_future is not None:
+            # Let an interrupted connect finish before disconnecting
+            connect_future.exception()
+        connect_executor.shutdown()
         logger.info("Disconnecting robot...")
         try:
             robot.disconnect()
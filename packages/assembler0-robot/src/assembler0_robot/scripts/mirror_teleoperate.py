@@ -0,0 +1,203 @@
+# Based on LeRobot https://github.com/huggingface/lerobot/blob/main/src/lerobot/teleoperate.py
+# Modified to mirror one Assembler 0 leader onto several screwdriver followers.
+
+"""
+See mirror_teleoperate.sh for example usage
+"""
+
+import argparse
+import logging
+import time
+
+from lerobot.cameras.opencv.configuration_opencv import OpenCVCameraConfig
+from lerobot.utils.robot_utils import busy_wait
+
+from assembler0_robot.robots.koch_screwdriver_follower import KochScrewdriverFollower
+from assembler0_robot.robots.koch_screwdriver_follower import KochScrewdriverFollowerConfig
+from assembler0_robot.teleoperators.koch_screwdriver_leader import KochScrewdriverLeader
+from assembler0_robot.teleoperators.koch_screwdriver_leader import KochScrewdriverLeaderConfig
+from assembler0_robot.utils.fanout import FollowerFanout
+
+
+def parse_cameras(spec: str | None, width: int, height: int, fps: int) -> dict[str, OpenCVCameraConfig]:
+    """Parse a per-follower camera spec such as ``screwdriver=/dev/video0,side=/dev/video2``."""
+    cameras = {}
+    if not spec or spec.lower() == "none":
+        return cameras
+    for item in spec.split(","):
+        name, _, path = item.partition("=")
+        if not path:
+            raise ValueError(f"Invalid camera spec '{item}', expected name=path")
+        cameras[name.strip()] = OpenCVCameraConfig(index_or_path=path.strip(), width=width, height=height, fps=fps)
+    return cameras
+
+
+def mirror_loop(leader, fanout, fps: int, duration: float | None = None, workers=None, log_every_s: float = 5.0):
+    logger = logging.getLogger(__name__)
+    start = time.perf_counter()
+    last_log = start
+    while duration is None or time.perf_counter() - start < duration:
+        loop_start = time.perf_counter()
+
+        # Read the leader once per tick and mirror it onto every follower
+        action = leader.get_action()
+        feedback = fanout.dispatch(action, timeout=1 / fps, workers=workers)
+
+        try:
+            leader.send_feedback(feedback)
+        except Exception as e:
+            logger.debug(f"Feedback warning: {e}")
+
+        if time.perf_counter() - last_log >= log_every_s:
+            logger.info(fanout.latency_report(workers))
+            last_log = time.perf_counter()
+
+        dt_s = time.perf_counter() - loop_start
+        busy_wait(1 / fps - dt_s)
+
+
+def latency_sweep(leader, fanout, fps: int, sweep_s: float) -> list[dict]:
+    """Mirror onto the first 1..N followers for *sweep_s* each and return per-N latency summaries."""
+    results = []
+    for n in range(1, len(fanout.workers) + 1):
+        workers = fanout.workers[:n]
+        fanout.tick_latency.reset()
+        for worker in workers:
+            worker.latency.reset()
+        mirror_loop(leader, fanout, fps, duration=sweep_s, workers=workers, log_every_s=float("inf"))
+
+        per_follower_p50 = [w.latency.summary()["p50_ms"] for w in workers]
+        per_follower_p95 = [w.latency.summary()["p95_ms"] for w in workers]
+        results.append(
+            {
+                "n": n,
+                "follower_p50_ms": sum(per_follower_p50) / n,
+                "follower_p95_ms": max(per_follower_p95),
+                "tick_p95_ms": fanout.tick_latency.summary()["p95_ms"],
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror one screwdriver leader onto several followers")
+
+    # Follower configuration, one entry per follower
+    parser.add_argument("--robot_ports", type=str, nargs="+", required=True,
+                       help="Serial ports of the follower robots")
+    parser.add_argument("--robot_ids", type=str, nargs="+", required=True,
+                       help="IDs of the follower robots, in the same order as --robot_ports")
+    parser.add_argument("--robot_cameras", type=str, nargs="*", default=None,
+                       help="Per-follower cameras, e.g. 'screwdriver=/dev/video0,side=/dev/video2' or 'none'")
+    parser.add_argument("--screwdriver_current_limit", type=int, default=300,
+                       help="Current limit for screwdriver motor")
+    parser.add_argument("--clutch_ratio", type=float, default=0.5,
+                       help="Clutch engagement ratio")
+    parser.add_argument("--clutch_cooldown_s", type=float, default=1.0,
+                       help="Clutch cooldown duration in seconds")
+
+    # Leader configuration
+    parser.add_argument("--leader_port", type=str, default="/dev/servo_585A007782",
+                       help="Serial port for the leader teleoperator")
+    parser.add_argument("--leader_id", type=str, default="koch_screwdriver_leader_testing",
+                       help="ID for the leader teleoperator")
+    parser.add_argument("--gripper_open_pos", type=float, default=50.0,
+                       help="Gripper open position for the leader")
+    parser.add_argument("--haptic_range", type=float, default=4.0,
+                       help="Haptic feedback range")
+
+    # Camera configuration
+    parser.add_argument("--camera_width", type=int, default=800,
+                       help="Camera width")
+    parser.add_argument("--camera_height", type=int, default=600,
+                       help="Camera height")
+    parser.add_argument("--camera_fps", type=int, default=30,
+                       help="Camera FPS")
+
+    # Control parameters
+    parser.add_argument("--fps", type=int, default=30,
+                       help="Control loop frequency")
+    parser.add_argument("--duration", type=int, default=None,
+                       help="Duration in seconds (None for infinite)")
+    parser.add_argument("--latency_sweep_s", type=float, default=0.0,
+                       help="Before teleoperating, mirror onto 1..N followers for this many seconds each and "
+                            "report how per-follower latency scales with N (0 to disable)")
+
+    args = parser.parse_args()
+
+    # Setup logging
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+    if len(args.robot_ports) != len(args.robot_ids):
+        parser.error("--robot_ports and --robot_ids must have the same length")
+    camera_specs = args.robot_cameras or [None] * len(args.robot_ports)
+    if len(camera_specs) != len(args.robot_ports):
+        parser.error("--robot_cameras must have one entry per follower")
+
+    robots = []
+    for port, robot_id, camera_spec in zip(args.robot_ports, args.robot_ids, camera_specs):
+        robot_config = KochScrewdriverFollowerConfig(
+            port=port,
+            id=robot_id,
+            cameras=parse_cameras(camera_spec, args.camera_width, args.camera_height, args.camera_fps),
+            screwdriver_current_limit=args.screwdriver_current_limit,
+            clutch_ratio=args.clutch_ratio,
+            clutch_cooldown_s=args.clutch_cooldown_s,
+        )
+        robots.append(KochScrewdriverFollower(robot_config))
+
+    teleop_config = KochScrewdriverLeaderConfig(
+        port=args.leader_port,
+        id=args.leader_id,
+        gripper_open_pos=args.gripper_open_pos,
+        haptic_range=args.haptic_range,
+    )
+    teleop = KochScrewdriverLeader(teleop_config)
+    fanout = FollowerFanout(robots)
+
+    try:
+        # Connect devices
+        for robot in robots:
+            logger.info(f"Connecting {robot}...")
+            robot.connect()
+        logger.info("Connecting teleoperator...")
+        teleop.connect()
+        fanout.start()
+
+        if args.latency_sweep_s > 0:
+            logger.info(f"Measuring fan-out latency for 1..{len(robots)} followers")
+            results = latency_sweep(teleop, fanout, args.fps, args.latency_sweep_s)
+            logger.info(f"{'N':>3} | {'follower p50':>12} | {'follower p95':>12} | {'tick p95':>9}")
+            for r in results:
+                logger.info(
+                    f"{r['n']:>3} | {r['follower_p50_ms']:>10.1f}ms | {r['follower_p95_ms']:>10.1f}ms | "
+                    f"{r['tick_p95_ms']:>7.1f}ms"
+                )
+
+        logger.info(f"Mirroring leader onto {len(robots)} followers. Press Ctrl+C to stop.")
+        mirror_loop(teleop, fanout, args.fps, duration=args.duration)
+
+    except KeyboardInterrupt:
+        logger.info("\nStopping teleoperation...")
+    except Exception as e:
+        logger.error(f"Error during teleoperation: {e}")
+        raise
+    finally:
+        fanout.stop()
+        logger.info(fanout.latency_report())
+        logger.info("Disconnecting devices...")
+        for robot in robots:
+            try:
+                robot.disconnect()
+            except Exception as e:
+                logger.error(f"Error disconnecting {robot}: {e}")
+        try:
+            teleop.disconnect()
+        except Exception as e:
+            logger.error(f"Error disconnecting teleoperator: {e}")
+        logger.info("Done.")
+
+
+if __name__ == "__main__":
+    main()
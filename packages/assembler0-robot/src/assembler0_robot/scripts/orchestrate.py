@@ -0,0 +1,297 @@
+# Based on scripts/record.py
+# Runs several Assembler 0 leader/follower recording cells in one process.
+
+"""
+See orchestrate.sh and cells.example.json for example usage
+
+The config file is JSON:
+
+    {
+        "fps": 30,
+        "num_workers": 4,
+        "cells": [
+            {
+                "name": "cell_a",
+                "robot": {"port": "/dev/servo_5837053138", "id": "koch_screwdriver_follower_a",
+                          "cameras": {"screwdriver": "/dev/video0", "side": "/dev/video2"}},
+                "leader": {"port": "/dev/servo_585A007782", "id": "koch_screwdriver_leader_a"},
+                "dataset": {"repo_id": "jackvial/cell_a", "single_task": "...", "num_episodes": 10}
+            }
+        ]
+    }
+
+Any option not given falls back to the same default used by scripts/record.py.
+"""
+
+import argparse
+import json
+import logging
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from lerobot.cameras.opencv.configuration_opencv import OpenCVCameraConfig
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.utils import build_dataset_frame, hw_to_dataset_features
+from lerobot.utils.control_utils import sanity_check_dataset_name
+from lerobot.utils.utils import init_logging
+
+from assembler0_robot.robots.koch_screwdriver_follower import KochScrewdriverFollower
+from assembler0_robot.robots.koch_screwdriver_follower import KochScrewdriverFollowerConfig
+from assembler0_robot.teleoperators.koch_screwdriver_leader import KochScrewdriverLeader
+from assembler0_robot.teleoperators.koch_screwdriver_leader import KochScrewdriverLeaderConfig
+from assembler0_robot.utils.resources import ProcessUsage
+from assembler0_robot.utils.scheduler import DeadlineScheduler, PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+
+class RecordingCell:
+    """One leader/follower pair with its own dataset, stepped one tick at a time by the scheduler."""
+
+    def __init__(self, name: str, cfg: dict, fps: int, save_executor: Executor):
+        self.name = name
+        self.fps = fps
+        self.save_executor = save_executor
+
+        robot_cfg = cfg["robot"]
+        camera_width = robot_cfg.get("camera_width", 800)
+        camera_height = robot_cfg.get("camera_height", 600)
+        camera_fps = robot_cfg.get("camera_fps", 30)
+        cameras = {
+            cam_name: OpenCVCameraConfig(
+                index_or_path=path, width=camera_width, height=camera_height, fps=camera_fps
+            )
+            for cam_name, path in robot_cfg.get("cameras", {}).items()
+        }
+        self.robot = KochScrewdriverFollower(
+            KochScrewdriverFollowerConfig(
+                port=robot_cfg["port"],
+                id=robot_cfg["id"],
+                cameras=cameras,
+                screwdriver_current_limit=robot_cfg.get("screwdriver_current_limit", 300),
+                clutch_ratio=robot_cfg.get("clutch_ratio", 0.5),
+                clutch_cooldown_s=robot_cfg.get("clutch_cooldown_s", 1.0),
+            )
+        )
+
+        leader_cfg = cfg["leader"]
+        self.teleop = KochScrewdriverLeader(
+            KochScrewdriverLeaderConfig(
+                port=leader_cfg["port"],
+                id=leader_cfg["id"],
+                gripper_open_pos=leader_cfg.get("gripper_open_pos", 50.0),
+                haptic_range=leader_cfg.get("haptic_range", 4.0),
+            )
+        )
+
+        dataset_cfg = cfg["dataset"]
+        self.single_task = dataset_cfg["single_task"]
+        self.num_episodes = dataset_cfg.get("num_episodes", 50)
+        self.episode_time_s = dataset_cfg.get("episode_time_s", 60)
+        self.reset_time_s = dataset_cfg.get("reset_time_s", 60)
+        self.push_to_hub = dataset_cfg.get("push_to_hub", False)
+        self.private = dataset_cfg.get("private", False)
+        use_videos = dataset_cfg.get("encode_videos_after", True)
+
+        action_features = hw_to_dataset_features(self.robot.action_features, "action", use_videos)
+        obs_features = hw_to_dataset_features(self.robot.observation_features, "observation", use_videos)
+        sanity_check_dataset_name(dataset_cfg["repo_id"], None)
+        self.dataset = LeRobotDataset.create(
+            dataset_cfg["repo_id"],
+            fps,
+            root=dataset_cfg.get("root"),
+            robot_type=self.robot.name,
+            features={**action_features, **obs_features},
+            use_videos=use_videos,
+            image_writer_processes=0,
+            image_writer_threads=dataset_cfg.get("num_image_writer_threads_per_camera", 4) * len(cameras),
+            batch_encoding_size=dataset_cfg.get("batch_encoding_size", 1),
+        )
+
+        self.phase = "idle"
+        self.phase_start = 0.0
+        self.recorded_episodes = 0
+        self.failed_observations = 0
+
+    @property
+    def done(self) -> bool:
+        return self.phase == "done"
+
+    def connect(self) -> None:
+        logger.info(f"[{self.name}] Connecting robot...")
+        self.robot.connect()
+        logger.info(f"[{self.name}] Connecting teleoperator...")
+        self.teleop.connect()
+        self._enter("recording")
+
+    def disconnect(self) -> None:
+        for device in (self.robot, self.teleop):
+            try:
+                device.disconnect()
+            except Exception as e:
+                logger.error(f"[{self.name}] Error disconnecting {device}: {e}")
+
+    def tick(self) -> None:
+        if self.phase in ("saving", "done", "idle"):
+            return
+
+        if time.perf_counter() - self.phase_start >= self._phase_duration():
+            self._advance()
+            return
+
+        recording = self.phase == "recording"
+        if recording:
+            try:
+                observation = self.robot.get_observation()
+            except Exception as e:
+                logger.warning(f"[{self.name}] Failed to get observation: {e}")
+                self.failed_observations += 1
+                return
+
+        action = self.teleop.get_action()
+        sent_action = self.robot.send_action(action)
+
+        try:
+            feedback = self.robot.get_feedback()
+            if feedback:
+                self.teleop.send_feedback(feedback)
+        except Exception as e:
+            logger.debug(f"[{self.name}] Feedback warning: {e}")
+
+        if recording:
+            observation_frame = build_dataset_frame(self.dataset.features, observation, prefix="observation")
+            action_frame = build_dataset_frame(self.dataset.features, sent_action, prefix="action")
+            self.dataset.add_frame({**observation_frame, **action_frame}, task=self.single_task)
+
+    def _phase_duration(self) -> float:
+        return self.episode_time_s if self.phase == "recording" else self.reset_time_s
+
+    def _enter(self, phase: str) -> None:
+        self.phase = phase
+        self.phase_start = time.perf_counter()
+        logger.info(f"[{self.name}] {phase} (episode {self.dataset.num_episodes})")
+
+    def _advance(self) -> None:
+        if self.phase == "recording":
+            # Saving can take seconds (parquet + video encoding). It runs on the save pool, not the tick
+            # pool, so it never keeps a worker from the other cells' ticks; this cell's ticks return
+            # immediately until it is done.
+            self.phase = "saving"
+            self.save_executor.submit(self._save_episode)
+        elif self.phase == "resetting":
+            self._enter("recording")
+
+    def _save_episode(self) -> None:
+        try:
+            self.dataset.save_episode()
+            self.recorded_episodes += 1
+        except Exception as e:
+            logger.error(f"[{self.name}] Failed to save episode: {e}")
+            # save_episode() may already have consumed the buffer, clear_episode_buffer() can't be trusted
+            self.dataset.episode_buffer = self.dataset.create_episode_buffer()
+
+        if self.recorded_episodes >= self.num_episodes:
+            self._finish()
+        else:
+            self._enter("resetting")
+
+    def _finish(self) -> None:
+        # Runs on the save pool where nobody reads the result, so errors are logged here and the cell is
+        # always marked done; otherwise the main loop would wait for it forever
+        try:
+            if self.dataset.batch_encoding_size > 1 and self.dataset.episodes_since_last_encoding > 0:
+                start_ep = self.dataset.num_episodes - self.dataset.episodes_since_last_encoding
+                self.dataset.batch_encode_videos(start_ep, self.dataset.num_episodes)
+                self.dataset.episodes_since_last_encoding = 0
+            if self.push_to_hub:
+                self.dataset.push_to_hub(private=self.private)
+        except Exception as e:
+            logger.error(f"[{self.name}] Failed to finish the dataset: {e}")
+        finally:
+            self.phase = "done"
+        logger.info(f"[{self.name}] done, recorded {self.recorded_episodes} episodes")
+
+
+def format_status(cells: list[RecordingCell], tasks: list[PeriodicTask], usage: ProcessUsage) -> str:
+    lines = [
+        f"{'CELL':<12} | {'PHASE':<9} | {'EP':>4} | {'TICKS':>7} | {'OVERRUN':>7} | {'TICK P95':>9} | "
+        f"{'JITTER P95':>10} | {'CPU':>7}"
+    ]
+    for cell, task in zip(cells, tasks):
+        latency = task.latency.summary()
+        jitter = task.jitter.summary()
+        lines.append(
+            f"{cell.name:<12} | {cell.phase:<9} | {cell.recorded_episodes:>4} | {task.ticks:>7} | "
+            f"{task.overruns:>7} | {latency['p95_ms']:>7.1f}ms | {jitter['p95_ms']:>8.1f}ms | {task.cpu_s:>6.1f}s"
+        )
+    s = usage.summary()
+    n = max(len(cells), 1)
+    lines.append(
+        f"process: cpu {s['cpu_percent']:.0f}% ({s['cpu_percent'] / n:.0f}% per cell), "
+        f"rss {s['rss_mb']:.0f}MB (+{s['rss_delta_mb'] / n:.0f}MB per cell)"
+    )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record with several screwdriver cells from one process")
+    parser.add_argument("--config", type=str, required=True,
+                       help="Path to the JSON cell configuration")
+    parser.add_argument("--num_workers", type=int, default=None,
+                       help="Size of the shared worker pool (defaults to the config value or one per cell)")
+    parser.add_argument("--status_interval_s", type=float, default=5.0,
+                       help="How often to print the combined status view")
+    parser.add_argument("--log_level", type=str, default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                       help="Logging level")
+    args = parser.parse_args()
+
+    init_logging()
+    logging.basicConfig(
+        level=getattr(logging, args.log_level),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        force=True
+    )
+
+    with open(args.config) as f:
+        config = json.load(f)
+    fps = config.get("fps", 30)
+    num_workers = args.num_workers or config.get("num_workers") or len(config["cells"])
+
+    # Baseline after the heavy imports so the per-cell numbers only count what each cell adds
+    usage = ProcessUsage()
+    scheduler = DeadlineScheduler(num_workers)
+    # Episode saves, one thread per cell so a slow save only ever delays its own cell
+    save_executor = ThreadPoolExecutor(max_workers=len(config["cells"]), thread_name_prefix="save")
+    cells = [
+        RecordingCell(cell_cfg.get("name", f"cell_{i}"), cell_cfg, fps, save_executor)
+        for i, cell_cfg in enumerate(config["cells"])
+    ]
+    tasks = [PeriodicTask(cell.name, cell.tick, fps) for cell in cells]
+    for task in tasks:
+        scheduler.add(task)
+
+    try:
+        for cell in cells:
+            cell.connect()
+
+        logger.info(f"Running {len(cells)} cells on {num_workers} worker threads at {fps} FPS")
+        scheduler.start()
+        while not all(cell.done for cell in cells):
+            time.sleep(args.status_interval_s)
+            logger.info("\n" + format_status(cells, tasks, usage))
+
+    except KeyboardInterrupt:
+        logger.info("\nStopping recording...")
+    finally:
+        scheduler.stop()
+        # Let saves in progress finish before the devices go away
+        save_executor.shutdown(wait=True)
+        logger.info("\n" + format_status(cells, tasks, usage))
+        logger.info("Disconnecting devices...")
+        for cell in cells:
+            cell.disconnect()
+        logger.info("Done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Long-lived policy server: loads checkpoints once and serves them to scripts/inference.py --policy_server
+# over a Unix domain socket, so switching between teleop, recording and autonomous runs skips model loading.
+
+"""
+Example usage (or: drex robot serve <pretrained_model> ...):
+python -m assembler0_robot.scripts.policy_server \
+    --model_paths=wandb_downloads/<run>/6000/pretrained_model \
+    --device=cuda
+
+python -m assembler0_robot.scripts.inference --policy_server=/tmp/assembler0_policy.sock \
+    --model_path=wandb_downloads/<run>/6000/pretrained_model
+"""
+
+import argparse
+import logging
+import time
+
+from assembler0_robot.inference.onnx_backend import OnnxPolicy
+from assembler0_robot.inference.registry import checkpoint_policy_type, policy_class
+from assembler0_robot.inference.server import DEFAULT_SOCKET_PATH, PolicyServer, model_key
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve trained policies to inference loops over a Unix socket")
+    parser.add_argument("--model_paths", type=str, required=True,
+                       help="Comma-separated pretrained_model directories (or hub repos) to load and serve")
+    parser.add_argument("--socket_path", type=str, default=DEFAULT_SOCKET_PATH,
+                       help="Unix domain socket to listen on")
+    parser.add_argument("--device", type=str, default="cuda",
+                       help="Device to run the policies on (cuda, mps, cpu)")
+    parser.add_argument("--backend", type=str, default="torch", choices=["torch", "onnx"],
+                       help="Serve the PyTorch checkpoints, or their ONNX exports with ONNX Runtime on CPU")
+    parser.add_argument("--onnx_threads", type=int, default=0,
+                       help="ONNX Runtime intra-op threads, 0 uses all cores")
+    parser.add_argument("--batch_window_ms", type=float, default=None,
+                       help="Batch requests from several robots: gather requests for a model for up to this long and "
+                            "run them as one batch. Unset serves each request on its own")
+    parser.add_argument("--max_batch_size", type=int, default=8,
+                       help="With --batch_window_ms, largest batch run through a model at once")
+    parser.add_argument("--log_level", type=str, default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                       help="Logging level")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level))
+
+    if args.backend == "onnx":
+        args.device = "cpu"
+
+    policies = {}
+    for model_path in args.model_paths.split(","):
+        start = time.perf_counter()
+        if args.backend == "onnx":
+            policy = OnnxPolicy.from_pretrained(model_path, num_threads=args.onnx_threads)
+        else:
+            policy = policy_class(checkpoint_policy_type(model_path)).from_pretrained(model_path)
+            policy.to(args.device)
+            policy.eval()
+        policies[model_key(model_path)] = policy
+        logger.info(f"Loaded {model_path} in {time.perf_counter() - start:.1f}s")
+
+    batch_window_s = args.batch_window_ms / 1000 if args.batch_window_ms is not None else None
+    server = PolicyServer(
+        policies,
+        args.device,
+        socket_path=args.socket_path,
+        batch_window_s=batch_window_s,
+        max_batch_size=args.max_batch_size,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Policy server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,10 +27,26 @@ from lerobot.utils.utils import (
 )
 from lerobot.utils.visualization_utils import _init_rerun, log_rerun_data
 
+from assembler0_robot.cameras import MJPEGCamera, MJPEGCameraConfig, parse_camera_transforms
 from assembler0_robot.robots.koch_screwdriver_follower import KochScrewdriverFollower
 from assembler0_robot.robots.koch_screwdriver_follower import KochScrewdriverFollowerConfig
+from assembler0_robot.recording.async_writer import AsyncFrameWriter
+from assembler0_robot.recording.encoding_service import BackgroundEncoder
+from assembler0_robot.recording.episode_journal import EpisodeJournal
+from assembler0_robot.recording.memory_budget import (
+    MemoryBudget,
+    MetricsReporter,
+    frame_image_bytes,
+    install_memory_budget,
+)
+from assembler0_robot.recording.reset import ObservationCost, format_reset_report, reset_loop
+from assembler0_robot.recording.mjpeg_dataset import MJPEGPassthroughDataset
+from assembler0_robot.recording.streaming_parquet import StreamingParquetWriter
+from assembler0_robot.recording.streaming_video import StreamingVideoDataset
+from assembler0_robot.recording.tick_timing import TIMING_FEATURES, TIMING_KEY, TickTimer, write_episode_timing
 from assembler0_robot.teleoperators.koch_screwdriver_leader import KochScrewdriverLeader
 from assembler0_robot.teleoperators.koch_screwdriver_leader import KochScrewdriverLeaderConfig
+from assembler0_robot.utils.visualization import RerunVisualizer
 
 
 @safe_stop_image_writer
@@ -43,6 +59,13 @@ def record_loop(
     control_time_s=None,
     single_task=None,
     display_data: bool = False,
+    frame_writer: AsyncFrameWriter | None = None,
+    visualizer: RerunVisualizer | None = None,
+    journal: EpisodeJournal | None = None,
+    observation_cost: ObservationCost | None = None,
+    memory_budget: MemoryBudget | None = None,
+    tick_timer: TickTimer | None = None,
+    timing_columns: bool = False,
 ):
     if dataset is not None and dataset.fps != fps:
         raise ValueError(f"The dataset fps should be equal to requested fps ({dataset.fps} != {fps}).")
@@ -58,7 +81,10 @@ def record_loop(
 
         # Try to get observation with retry logic
         try:
+            read_cpu_t = time.thread_time()
             observation = robot.get_observation()
+            if observation_cost is not None:
+                observation_cost.record_read(time.thread_time() - read_cpu_t)
         except Exception as e:
             logger.warning(f"Failed to get observation, retrying... Error: {e}")
             time.sleep(0.1)
@@ -68,26 +94,48 @@ def record_loop(
                 logger.error(f"Failed to get observation after retry: {e}")
                 events["exit_early"] = True
                 continue
+        # Includes the retry, so a tick that needed one shows up with its full read time
+        observation_s = time.perf_counter() - start_loop_t
 
-        if dataset is not None:
+        if dataset is not None and frame_writer is None:
             observation_frame = build_dataset_frame(dataset.features, observation, prefix="observation")
 
         # Get action from teleoperator
+        action_start_t = time.perf_counter()
         action = teleop.get_action()
 
         # Action can eventually be clipped using `max_relative_target`,
         # so action actually sent is saved in the dataset.
         sent_action = robot.send_action(action)
+        action_s = time.perf_counter() - action_start_t
 
-        if dataset is not None:
-            action_frame = build_dataset_frame(dataset.features, sent_action, prefix="action")
-            frame = {**observation_frame, **action_frame}
-            dataset.add_frame(frame, task=single_task)
+        extra_columns = None
+        if tick_timer is not None:
+            timing_row = tick_timer.row(start_loop_t, observation_s, action_s)
+            if timing_columns:
+                extra_columns = {TIMING_KEY: timing_row}
 
-        if display_data:
+        if dataset is not None:
+            if frame_writer is not None:
+                # Frame building and image enqueueing happen on the writer thread
+                frame_writer.push(observation, sent_action, single_task, extra_columns)
+            elif memory_budget is not None and not memory_budget.admit(frame_image_bytes(observation)):
+                memory_budget.mark_dropped(dataset)
+            else:
+                action_frame = build_dataset_frame(dataset.features, sent_action, prefix="action")
+                frame = {**observation_frame, **action_frame, **(extra_columns or {})}
+                dataset.add_frame(frame, task=single_task)
+                if journal is not None:
+                    journal.append(frame, single_task)
+
+        if visualizer is not None:
+            visualizer.post(observation, action)
+        elif display_data:
             log_rerun_data(observation, action)
 
         dt_s = time.perf_counter() - start_loop_t
+        if tick_timer is not None:
+            tick_timer.end_tick(dt_s)
         busy_wait(1 / fps - dt_s)
 
         timestamp = time.perf_counter() - start_episode_t
@@ -131,6 +179,13 @@ def main():
                        help="Camera height") 
     parser.add_argument("--camera_fps", type=int, default=30,
                        help="Camera FPS")
+    parser.add_argument("--camera_backend", type=str, default="opencv", choices=["opencv", "mjpeg"],
+                       help="'mjpeg' keeps the cameras' MJPEG frames compressed and only decodes them when pixels "
+                            "are needed (video encoding, display)")
+    parser.add_argument("--camera_transforms", type=str, default=None,
+                       help="JSON capture transforms per camera, e.g. "
+                            "'{\"screwdriver\": {\"crop\": [200, 150, 400, 300], \"resize\": [224, 224]}}'. "
+                            "Keys: crop [x, y, width, height], resize [height, width], grayscale")
     
     # Dataset configuration
     parser.add_argument("--dataset_repo_id", type=str, required=True,
@@ -155,18 +210,69 @@ def main():
                        help="Number of image writer processes")
     parser.add_argument("--num_image_writer_threads_per_camera", type=int, default=4,
                        help="Number of image writer threads per camera")
+    parser.add_argument("--streaming_video_encoding", type=lambda x: x.lower() in ['true', '1', 'yes'], default=False,
+                       help="Pipe camera frames straight into per-camera ffmpeg encoders instead of writing images "
+                            "and encoding after each episode")
+    parser.add_argument("--streaming_vcodec", type=str, default="libsvtav1",
+                       help="ffmpeg video codec used by --streaming_video_encoding (e.g. libsvtav1, libx264)")
+    parser.add_argument("--streaming_preset", type=str, default=None,
+                       help="Optional ffmpeg encoder preset used by --streaming_video_encoding")
+    parser.add_argument("--async_dataset_writer", type=lambda x: x.lower() in ['true', '1', 'yes'], default=False,
+                       help="Build and add dataset frames on a writer thread instead of inside the control tick")
+    parser.add_argument("--stream_parquet", type=lambda x: x.lower() in ['true', '1', 'yes'], default=False,
+                       help="Flush joint data to Parquet in row groups while recording so saving an episode only "
+                            "finalizes it (requires --encode_videos_after=true)")
+    parser.add_argument("--parquet_row_group_size", type=int, default=300,
+                       help="Frames per Parquet row group flushed by --stream_parquet")
+    parser.add_argument("--writer_queue_size", type=int, default=256,
+                       help="Maximum samples queued for the dataset writer before samples are dropped and marked "
+                            "in meta/dropped_frames.jsonl")
+    parser.add_argument("--writer_queue_mb", type=int, default=512,
+                       help="Maximum MB of camera frames queued for the dataset writer before samples are dropped "
+                            "(0 = only --writer_queue_size applies)")
+    parser.add_argument("--memory_budget_mb", type=int, default=0,
+                       help="Memory budget in MB for camera frames waiting to be written to disk, including samples "
+                            "queued for the dataset writer (0 = unlimited)")
+    parser.add_argument("--memory_budget_policy", type=str, default="block", choices=["block", "drop", "spill"],
+                       help="When the memory budget is exceeded: 'block' the dataset writer, 'drop' the frame and "
+                            "mark it in meta/dropped_frames.jsonl, or 'spill' images to a compressed in-RAM buffer")
+    parser.add_argument("--metrics_interval_s", type=float, default=10.0,
+                       help="Interval between live recording memory and queue metrics logs (0 = off)")
     parser.add_argument("--batch_encoding_size", type=int, default=1,
                        help="Number of episodes to accumulate before batch encoding videos. Set to 1 for immediate encoding (default), or higher for batched encoding")
+    parser.add_argument("--background_encoding", type=str, default="off", choices=["off", "always", "reset"],
+                       help="Encode saved episodes in background worker processes: 'always' encodes while the next "
+                            "episode records and during resets, 'reset' only runs the encoders during reset phases")
+    parser.add_argument("--encoding_workers", type=int, default=1,
+                       help="Number of background encoding processes")
+    parser.add_argument("--max_pending_encodes", type=int, default=2,
+                       help="Maximum episodes waiting for background encoding before saving blocks")
     
     # Control parameters
     parser.add_argument("--fps", type=int, default=30,
                        help="Control loop frequency")
     parser.add_argument("--display_data", type=lambda x: x.lower() in ['true', '1', 'yes'], default=False,
                        help="Display camera feeds during recording")
+    parser.add_argument("--display_fps", type=float, default=10.0,
+                       help="Maximum rate at which --display_data updates the viewer, independent of --fps")
+    parser.add_argument("--display_max_width", type=int, default=320,
+                       help="Camera images are downsampled to at most this width for display (0 = full resolution)")
     parser.add_argument("--play_sounds", type=lambda x: x.lower() in ['true', '1', 'yes'], default=True,
                        help="Play audio notifications")
     parser.add_argument("--resume", type=lambda x: x.lower() in ['true', '1', 'yes'], default=False,
                        help="Resume recording on existing dataset")
+    parser.add_argument("--lightweight_reset", type=lambda x: x.lower() in ['true', '1', 'yes'], default=True,
+                       help="During resets only forward leader actions to the follower, without reading observations "
+                            "(ignored with --display_data)")
+    parser.add_argument("--idle_cameras_during_reset", type=lambda x: x.lower() in ['true', '1', 'yes'], default=True,
+                       help="With --lightweight_reset, stop decoding camera frames until the next episode starts")
+    parser.add_argument("--journal", type=lambda x: x.lower() in ['true', '1', 'yes'], default=False,
+                       help="Journal every recorded tick to a memory-mapped file so a crashed episode can be recovered")
+    parser.add_argument("--journal_recovery", type=str, default="replay", choices=["replay", "discard"],
+                       help="With --resume, replay a journaled partial episode into the dataset or discard it")
+    parser.add_argument("--timing_columns", type=lambda x: x.lower() in ['true', '1', 'yes'], default=False,
+                       help="Save a 'timing' column with each frame: loop start, observation read time, action time "
+                            "and a late-tick flag")
     parser.add_argument("--log_level", type=str, default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
                        help="Logging level")
     
@@ -181,27 +287,31 @@ def main():
     )
     logger = logging.getLogger(__name__)
 
+    visualizer = None
     if args.display_data:
         _init_rerun(session_name="recording")
+        # Displayed from its own thread so the control loop keeps the same timing as without display
+        visualizer = RerunVisualizer(display_fps=args.display_fps, max_image_width=args.display_max_width)
 
     # Create camera configurations
+    camera_config_cls = MJPEGCameraConfig if args.camera_backend == "mjpeg" else OpenCVCameraConfig
     cameras = {}
     if args.screwdriver_camera:
-        cameras["screwdriver"] = OpenCVCameraConfig(
+        cameras["screwdriver"] = camera_config_cls(
             index_or_path=args.screwdriver_camera, 
             width=args.camera_width, 
             height=args.camera_height, 
             fps=args.camera_fps
         )
     if args.side_camera:
-        cameras["side"] = OpenCVCameraConfig(
+        cameras["side"] = camera_config_cls(
             index_or_path=args.side_camera, 
             width=args.camera_width, 
             height=args.camera_height, 
             fps=args.camera_fps
         )
     if args.top_camera:
-        cameras["top"] = OpenCVCameraConfig(
+        cameras["top"] = camera_config_cls(
             index_or_path=args.top_camera, 
             width=args.camera_width, 
             height=args.camera_height, 
@@ -213,6 +323,7 @@ def main():
         port=args.robot_port,
         id=args.robot_id,
         cameras=cameras,
+        camera_transforms=parse_camera_transforms(args.camera_transforms),
         screwdriver_current_limit=args.screwdriver_current_limit,
         clutch_ratio=args.clutch_ratio,
         clutch_cooldown_s=args.clutch_cooldown_s,
@@ -232,23 +343,47 @@ def main():
     action_features = hw_to_dataset_features(robot.action_features, "action", args.encode_videos_after)
     obs_features = hw_to_dataset_features(robot.observation_features, "observation", args.encode_videos_after)
     dataset_features = {**action_features, **obs_features}
+    if args.timing_columns:
+        dataset_features.update(TIMING_FEATURES)
+
+    dataset_cls = LeRobotDataset
+    dataset_kwargs = {}
+    image_writer_threads = args.num_image_writer_threads_per_camera * len(robot.cameras)
+    if args.streaming_video_encoding:
+        if not args.encode_videos_after:
+            parser.error("--streaming_video_encoding requires --encode_videos_after=true")
+        if args.journal:
+            # Journal recovery finds the surviving frames by their image files, and streamed frames have none
+            parser.error("--journal cannot be combined with --streaming_video_encoding")
+        # Frames go to the encoders instead of image files, so no image writer is needed
+        dataset_cls = StreamingVideoDataset
+        dataset_kwargs["streaming_options"] = {"vcodec": args.streaming_vcodec, "preset": args.streaming_preset}
+        image_writer_threads = 0
+    if args.camera_backend == "mjpeg":
+        if args.streaming_video_encoding:
+            parser.error("--camera_backend=mjpeg cannot be combined with --streaming_video_encoding")
+        dataset_cls = MJPEGPassthroughDataset
+        if args.encode_videos_after:
+            # Compressed frames are written as they arrive, there is nothing for image writer threads to do
+            image_writer_threads = 0
 
     if args.resume:
-        dataset = LeRobotDataset(
+        dataset = dataset_cls(
             args.dataset_repo_id,
             root=args.dataset_root,
+            **dataset_kwargs,
         )
 
-        if hasattr(robot, "cameras") and len(robot.cameras) > 0:
+        if hasattr(robot, "cameras") and len(robot.cameras) > 0 and image_writer_threads > 0:
             dataset.start_image_writer(
                 num_processes=args.num_image_writer_processes,
-                num_threads=args.num_image_writer_threads_per_camera * len(robot.cameras),
+                num_threads=image_writer_threads,
             )
         sanity_check_dataset_robot_compatibility(dataset, robot, args.fps, dataset_features)
     else:
         # Create empty dataset or load existing saved episodes
         sanity_check_dataset_name(args.dataset_repo_id, None)
-        dataset = LeRobotDataset.create(
+        dataset = dataset_cls.create(
             args.dataset_repo_id,
             args.fps,
             root=args.dataset_root,
@@ -256,9 +391,69 @@ def main():
             features=dataset_features,
             use_videos=args.encode_videos_after,
             image_writer_processes=args.num_image_writer_processes,
-            image_writer_threads=args.num_image_writer_threads_per_camera * len(robot.cameras),
-            batch_encoding_size=args.batch_encoding_size,
+            image_writer_threads=image_writer_threads,
+            # Streamed videos are finalized per episode, there is nothing left to batch
+            batch_encoding_size=1 if args.streaming_video_encoding else args.batch_encoding_size,
+            **dataset_kwargs,
+        )
+
+    if args.background_encoding != "off" and (args.streaming_video_encoding or not args.encode_videos_after):
+        parser.error("--background_encoding requires --encode_videos_after=true and no --streaming_video_encoding")
+
+    memory_budget = None
+    if args.memory_budget_mb > 0:
+        if image_writer_threads == 0 or args.num_image_writer_processes > 0:
+            parser.error(
+                "--memory_budget_mb requires image writer threads, without --num_image_writer_processes "
+                "or --streaming_video_encoding"
+            )
+        memory_budget = MemoryBudget(args.memory_budget_mb * 1_000_000, policy=args.memory_budget_policy)
+        install_memory_budget(dataset, memory_budget, num_threads=image_writer_threads)
+
+    journal = None
+    if args.journal:
+        journal = EpisodeJournal(dataset)
+        if args.resume:
+            recovered_frames = journal.recover(args.journal_recovery)
+            if recovered_frames:
+                logger.info(f"Recovered {recovered_frames} frames from the journal as episode {dataset.num_episodes - 1}")
+        else:
+            journal.clear()
+
+    parquet_writer = None
+    if args.stream_parquet:
+        parquet_writer = StreamingParquetWriter(dataset, row_group_size=args.parquet_row_group_size)
+
+    frame_writer = None
+    encoder = None
+    # The reset phase is only visualized by the full record loop
+    lightweight_reset = args.lightweight_reset and not args.display_data
+    observation_cost = ObservationCost(robot) if lightweight_reset else None
+    tick_timer = TickTimer(args.fps, max_ticks=args.episode_time_s * args.fps + 1)
+    if args.async_dataset_writer:
+        frame_writer = AsyncFrameWriter(
+            dataset,
+            max_queue_size=args.writer_queue_size,
+            journal=journal,
+            memory_budget=memory_budget,
+            max_queue_bytes=args.writer_queue_mb * 1_000_000,
         )
+    # Frames left out by the dataset writer or the memory budget, saved with each episode
+    drop_marks = None
+    if frame_writer is not None:
+        drop_marks = frame_writer.drop_marks
+    elif memory_budget is not None:
+        drop_marks = memory_budget.drop_marks
+
+    metrics_reporter = None
+    metrics_sources = []
+    if memory_budget is not None:
+        metrics_sources.append(memory_budget.format_metrics)
+        metrics_sources.append(lambda: f"image writer: depth={dataset.image_writer.depth}")
+    if frame_writer is not None:
+        metrics_sources.append(frame_writer.format_stats)
+    if metrics_sources and args.metrics_interval_s > 0:
+        metrics_reporter = MetricsReporter(metrics_sources, args.metrics_interval_s)
 
     try:
         # Connect devices
@@ -275,6 +470,11 @@ def main():
         listener = None
         events = {"stop_recording": False, "exit_early": False, "rerecord_episode": False}
 
+        if args.background_encoding != "off":
+            encoder = BackgroundEncoder(
+                dataset, num_workers=args.encoding_workers, max_pending=args.max_pending_encodes
+            )
+
         # Give the robot a moment to stabilize after connection
         logger.info("Waiting for robot to stabilize...")
         time.sleep(2.0)
@@ -282,6 +482,11 @@ def main():
         recorded_episodes = 0
         while recorded_episodes < args.num_episodes and not events["stop_recording"]:
             log_say(f"Recording episode {dataset.num_episodes}", args.play_sounds)
+            if encoder is not None and args.background_encoding == "reset":
+                encoder.pause()
+            if observation_cost is not None:
+                observation_cost.start()
+            tick_timer.reset()
             record_loop(
                 robot=robot,
                 teleop=teleop,
@@ -291,7 +496,21 @@ def main():
                 control_time_s=args.episode_time_s,
                 single_task=args.single_task,
                 display_data=args.display_data,
+                frame_writer=frame_writer,
+                visualizer=visualizer,
+                journal=journal,
+                observation_cost=observation_cost,
+                memory_budget=memory_budget,
+                tick_timer=tick_timer,
+                timing_columns=args.timing_columns,
             )
+            episode_timing = tick_timer.summary()
+            logger.info(tick_timer.format_summary())
+            if observation_cost is not None:
+                observation_cost.stop()
+            if frame_writer is not None:
+                frame_writer.flush()
+                logger.info(frame_writer.format_stats())
 
             # Execute a few seconds without recording to give time to manually reset the environment
             # Skip reset for the last episode to be recorded
@@ -299,36 +518,83 @@ def main():
                 (recorded_episodes < args.num_episodes - 1) or events["rerecord_episode"]
             ):
                 log_say("Reset the environment", args.play_sounds)
-                record_loop(
-                    robot=robot,
-                    teleop=teleop,
-                    events=events,
-                    fps=args.fps,
-                    control_time_s=args.reset_time_s,
-                    single_task=args.single_task,
-                    display_data=args.display_data,
-                )
+                if encoder is not None:
+                    encoder.resume()
+                if lightweight_reset:
+                    reset_report = reset_loop(
+                        robot=robot,
+                        teleop=teleop,
+                        events=events,
+                        fps=args.fps,
+                        control_time_s=args.reset_time_s,
+                        idle_cameras=args.idle_cameras_during_reset,
+                        observation_cost=observation_cost,
+                    )
+                    logger.info(format_reset_report(reset_report))
+                else:
+                    record_loop(
+                        robot=robot,
+                        teleop=teleop,
+                        events=events,
+                        fps=args.fps,
+                        control_time_s=args.reset_time_s,
+                        single_task=args.single_task,
+                        display_data=args.display_data,
+                        visualizer=visualizer,
+                    )
 
             if events["rerecord_episode"]:
                 log_say("Re-record episode", args.play_sounds)
                 events["rerecord_episode"] = False
                 events["exit_early"] = False
                 dataset.clear_episode_buffer()
+                if journal is not None:
+                    journal.clear()
+                if drop_marks is not None:
+                    drop_marks.discard()
                 continue
 
-            dataset.save_episode()
+            episode_index = dataset.episode_buffer["episode_index"]
+            save_start_t = time.perf_counter()
+            if encoder is not None:
+                encoder.save_episode()
+            else:
+                dataset.save_episode()
+            logger.info(f"Saved episode {episode_index} in {time.perf_counter() - save_start_t:.2f}s")
+            write_episode_timing(dataset, episode_index, episode_timing)
+            if parquet_writer is not None:
+                logger.info(parquet_writer.format_stats())
+            if journal is not None:
+                journal.clear()
+            if drop_marks is not None:
+                dropped = drop_marks.save(dataset, episode_index)
+                if dropped:
+                    logger.warning(
+                        f"Episode {episode_index} is missing {dropped} dropped frames, see meta/dropped_frames.jsonl"
+                    )
+            if memory_budget is not None:
+                logger.info(memory_budget.format_metrics())
             recorded_episodes += 1
 
         log_say("Stop recording", args.play_sounds, blocking=True)
 
+        if encoder is not None:
+            encoder.wait()
+
         # Handle any pending episodes that haven't been batch encoded yet
-        if args.batch_encoding_size > 1 and hasattr(dataset, 'episodes_since_last_encoding') and dataset.episodes_since_last_encoding > 0:
+        if encoder is None and args.batch_encoding_size > 1 and hasattr(dataset, 'episodes_since_last_encoding') and dataset.episodes_since_last_encoding > 0:
             logger.info(f"Encoding remaining {dataset.episodes_since_last_encoding} episodes...")
             start_ep = dataset.num_episodes - dataset.episodes_since_last_encoding
             end_ep = dataset.num_episodes
             dataset.batch_encode_videos(start_ep, end_ep)
             dataset.episodes_since_last_encoding = 0
 
+        if isinstance(dataset, StreamingVideoDataset):
+            logger.info(dataset.format_streaming_stats())
+        for cam in robot.cameras.values():
+            if isinstance(cam, MJPEGCamera):
+                logger.info(cam.format_stats())
+
         if args.push_to_hub:
             dataset.push_to_hub(private=args.private)
 
@@ -340,6 +606,25 @@ def main():
         logger.error(f"Error during recording: {e}")
         raise
     finally:
+        if visualizer is not None:
+            visualizer.stop()
+        if parquet_writer is not None:
+            parquet_writer.stop()
+        if metrics_reporter is not None:
+            metrics_reporter.stop()
+        if encoder is not None:
+            encoder.close()
+        if frame_writer is not None:
+            try:
+                frame_writer.stop()
+            except Exception as e:
+                logger.error(f"Error stopping dataset writer: {e}")
+        if journal is not None:
+            # Keep the journal on disk so an interrupted episode can be recovered with --resume
+            journal.close()
+        if isinstance(dataset, StreamingVideoDataset):
+            # Drop the partial videos of an interrupted episode
+            dataset.abort_streaming()
         logger.info("Disconnecting devices...")
         try:
             robot.disconnect()
@@ -0,0 +1 @@
+# Shared helpers for the Assembler 0 control, recording and inference scripts.
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+
+import logging
+import time
+
+from .resources import thread_cpu_seconds
+
+logger = logging.getLogger(__name__)
+
+
+def pause_cameras(cameras: dict) -> None:
+    """Stop the background read threads so frames are no longer decoded.
+
+    The devices stay open and keep capturing; the next `async_read()` restarts the thread.
+    """
+    for name, cam in cameras.items():
+        stop = getattr(cam, "_stop_read_thread", None)
+        if stop is None:
+            continue
+        try:
+            stop()
+        except Exception as e:
+            logger.warning(f"Failed to pause camera {name}: {e}")
+
+
+def resume_cameras(cameras: dict, max_stale_frames: int = 8) -> None:
+    """Drop frames the driver buffered while paused and wait for a fresh frame from every camera."""
+    for name, cam in cameras.items():
+        videocapture = getattr(cam, "videocapture", None)
+        if videocapture is not None:
+            # Buffered frames come back immediately, a fresh one takes about a frame period
+            frame_period_s = 1 / cam.fps if getattr(cam, "fps", None) else 1 / 30
+            for _ in range(max_stale_frames):
+                start_t = time.perf_counter()
+                if not videocapture.grab() or time.perf_counter() - start_t > frame_period_s / 2:
+                    break
+        try:
+            cam.async_read()
+        except Exception as e:
+            logger.warning(f"Failed to resume camera {name}: {e}")
+
+
+def camera_threads_cpu_seconds(cameras: dict) -> float:
+    """CPU time used so far by the cameras' background read threads."""
+    total_s = 0.0
+    for cam in cameras.values():
+        thread = getattr(cam, "thread", None)
+        if thread is not None and thread.is_alive():
+            total_s += thread_cpu_seconds(thread)
+    return total_s
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+import logging
+import threading
+import time
+from typing import Any
+
+from lerobot.robots.robot import Robot
+
+from .timing import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+class FollowerWorker:
+    """Persistent worker thread that owns one follower arm (and therefore one serial port).
+
+    The control thread hands the worker an action with `submit()` and later collects the result with
+    `wait()`. The worker sends the action, reads the follower's clutch feedback and records how long
+    the round trip took. Each follower keeps its own bus, clutch state and cameras; the only thing
+    shared between workers is the action being mirrored.
+    """
+
+    def __init__(self, robot: Robot, name: str | None = None):
+        self.robot = robot
+        self.name = name or str(robot)
+        self.latency = LatencyStats()
+        self.missed_deadlines = 0
+
+        self.sent_action: dict[str, Any] | None = None
+        self.feedback: dict[str, float] = {}
+        self.error: Exception | None = None
+
+        self._action: dict[str, Any] | None = None
+        self._lock = threading.Lock()
+        self._request = threading.Event()
+        self._done = threading.Event()
+        self._done.set()
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name=f"follower-{self.name}", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def submit(self, action: dict[str, Any]) -> None:
+        """Queue *action* for the worker. If the previous action is still being sent it is replaced."""
+        with self._lock:
+            self._action = action
+            self._done.clear()
+        self._request.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the last submitted action has been sent. Returns False on timeout."""
+        if self._done.wait(timeout):
+            return True
+        self.missed_deadlines += 1
+        return False
+
+    def stop(self) -> None:
+        self._stop = True
+        self._request.set()
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while True:
+            self._request.wait()
+            self._request.clear()
+            if self._stop:
+                return
+
+            with self._lock:
+                action, self._action = self._action, None
+            if action is None:
+                continue
+
+            start = time.perf_counter()
+            try:
+                self.sent_action = self.robot.send_action(action)
+                self.feedback = self.robot.get_feedback() if hasattr(self.robot, "get_feedback") else {}
+                self.error = None
+            except Exception as e:
+                logger.warning(f"{self.name} failed to send action: {e}")
+                self.error = e
+                self.feedback = {}
+            self.latency.record(time.perf_counter() - start)
+
+            with self._lock:
+                # A newer action may have arrived while this one was being sent
+                if self._action is None:
+                    self._done.set()
+                else:
+                    self._request.set()
+
+
+class FollowerFanout:
+    """Mirror one action to several followers concurrently, one persistent worker per follower."""
+
+    def __init__(self, robots: list[Robot]):
+        self.workers = [FollowerWorker(robot, name=robot.config.id or robot.config.port) for robot in robots]
+        self.tick_latency = LatencyStats()
+
+    def start(self) -> None:
+        for worker in self.workers:
+            worker.start()
+
+    def stop(self) -> None:
+        for worker in self.workers:
+            worker.stop()
+
+    def dispatch(
+        self, action: dict[str, Any], timeout: float | None = None, workers: list[FollowerWorker] | None = None
+    ) -> dict[str, float]:
+        """Send *action* to every worker and return the aggregated haptic feedback.
+
+        Feedback is aggregated as the maximum over the followers, so the operator feels the clutch of
+        whichever arm is closest to stalling. Workers that miss *timeout* are left running and do not
+        contribute feedback for this tick.
+        """
+        workers = self.workers if workers is None else workers
+        start = time.perf_counter()
+        for worker in workers:
+            worker.submit(action)
+
+        haptic = 0.0
+        deadline = None if timeout is None else start + timeout
+        for worker in workers:
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            if worker.wait(remaining):
+                haptic = max(haptic, float(worker.feedback.get("haptic", 0.0)))
+        self.tick_latency.record(time.perf_counter() - start)
+        return {"haptic": haptic}
+
+    def latency_report(self, workers: list[FollowerWorker] | None = None) -> str:
+        workers = self.workers if workers is None else workers
+        lines = [f"Fan-out to {len(workers)} follower(s), tick {self.tick_latency.format()}"]
+        for worker in workers:
+            lines.append(f"  {worker.name}: {worker.latency.format()} missed={worker.missed_deadlines}")
+        return "\n".join(lines)
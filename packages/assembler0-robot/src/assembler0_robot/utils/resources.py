@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+
+import os
+import resource
+import time
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB (falls back to the peak RSS off Linux)."""
+    try:
+        with open("/proc/self/statm") as f:
+            rss_pages = int(f.read().split()[1])
+        return rss_pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+class ProcessUsage:
+    """CPU time and memory used by this process since the snapshot was taken."""
+
+    def __init__(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.rss_start_mb = current_rss_mb()
+
+    def summary(self) -> dict[str, float]:
+        wall_s = time.perf_counter() - self.wall_start
+        cpu_s = time.process_time() - self.cpu_start
+        rss_mb = current_rss_mb()
+        return {
+            "wall_s": wall_s,
+            "cpu_s": cpu_s,
+            "cpu_percent": 100.0 * cpu_s / wall_s if wall_s > 0 else 0.0,
+            "rss_mb": rss_mb,
+            "rss_delta_mb": rss_mb - self.rss_start_mb,
+        }
+
+
+def thread_cpu_seconds(thread) -> float:
+    """CPU time consumed so far by another thread of this process (Linux only, 0.0 elsewhere)."""
+    native_id = getattr(thread, "native_id", None)
+    if native_id is None:
+        return 0.0
+    try:
+        with open(f"/proc/self/task/{native_id}/stat") as f:
+            # Fields after the parenthesised thread name; utime and stime are fields 14 and 15
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return 0.0
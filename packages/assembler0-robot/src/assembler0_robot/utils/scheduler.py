@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from .timing import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """A callable run at a fixed rate by `DeadlineScheduler`, with its own timing stats."""
+
+    def __init__(self, name: str, fn: Callable[[], None], fps: int):
+        self.name = name
+        self.fn = fn
+        self.period_s = 1 / fps
+        self.latency = LatencyStats()
+        self.jitter = LatencyStats()
+        self.ticks = 0
+        self.overruns = 0
+        self.cpu_s = 0.0
+        self.error: Exception | None = None
+        self._future: Future | None = None
+
+    @property
+    def busy(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def _run(self, scheduled_t: float) -> None:
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        self.jitter.record(max(0.0, start - scheduled_t))
+        try:
+            self.fn()
+        except Exception as e:
+            logger.error(f"{self.name} tick failed: {e}")
+            self.error = e
+        self.cpu_s += time.thread_time() - cpu_start
+        self.latency.record(time.perf_counter() - start)
+        self.ticks += 1
+
+
+class DeadlineScheduler:
+    """Run many periodic tasks on a shared thread pool.
+
+    One scheduler thread sleeps until the next deadline and hands the due task to the pool, instead of
+    every control loop spinning in its own `busy_wait`. A task whose previous tick is still running when
+    its next deadline arrives is counted as an overrun and skipped for that period.
+    """
+
+    def __init__(self, num_workers: int):
+        self.pool = ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="cell")
+        self.tasks: list[PeriodicTask] = []
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(self, task: PeriodicTask) -> None:
+        self.tasks.append(task)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.pool.shutdown(wait=True)
+
+    def _run(self) -> None:
+        now = time.perf_counter()
+        heap = [(now, i) for i in range(len(self.tasks))]
+        heapq.heapify(heap)
+        while not self._stop.is_set() and heap:
+            deadline, i = heapq.heappop(heap)
+            delay = deadline - time.perf_counter()
+            # Sleeping (rather than busy waiting) is what keeps per-cell CPU low. Cap the sleep so
+            # stop() stays responsive.
+            if delay > 0:
+                self._stop.wait(min(delay, 0.1))
+                if time.perf_counter() < deadline:
+                    heapq.heappush(heap, (deadline, i))
+                    continue
+
+            task = self.tasks[i]
+            if task.busy:
+                task.overruns += 1
+            else:
+                task._future = self.pool.submit(task._run, deadline)
+
+            next_deadline = deadline + task.period_s
+            # Don't try to catch up on missed ticks, resynchronise on the current time instead
+            if next_deadline < time.perf_counter():
+                next_deadline = time.perf_counter() + task.period_s
+            heapq.heappush(heap, (next_deadline, i))
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class LatencyStats:
+    """Rolling window of latency samples (seconds) with cheap percentile summaries.
+
+    Samples are appended from the hot loop with `record()`. Summaries are computed on demand, so
+    calling `summary()` once per second from a logging path does not slow the control loop down.
+    """
+
+    def __init__(self, window: int = 1024):
+        self._samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def record(self, dt_s: float) -> None:
+        self._samples.append(dt_s)
+        self.count += 1
+        self.total_s += dt_s
+        if dt_s > self.max_s:
+            self.max_s = dt_s
+
+    def time(self) -> "_Timer":
+        """Context manager that records the elapsed time of the block."""
+        return _Timer(self)
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def summary(self) -> dict[str, float]:
+        """Return mean/p50/p95/p99/max in milliseconds over the current window."""
+        if not self._samples:
+            return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+        samples_ms = np.fromiter(self._samples, dtype=np.float64) * 1e3
+        p50, p95, p99 = np.percentile(samples_ms, [50, 95, 99])
+        return {
+            "count": self.count,
+            "mean_ms": float(samples_ms.mean()),
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": self.max_s * 1e3,
+        }
+
+    def format(self) -> str:
+        s = self.summary()
+        return f"p50={s['p50_ms']:.1f}ms p95={s['p95_ms']:.1f}ms p99={s['p99_ms']:.1f}ms max={s['max_ms']:.1f}ms"
+
+
+class StageTimes:
+    """Wall-clock durations of named one-off stages, e.g. startup, which may overlap across threads.
+
+    `total_s()` is the time elapsed since `start_t`, so stages that ran in parallel are not double counted
+    there even though each is reported with its full duration.
+    """
+
+    def __init__(self, start_t: float | None = None):
+        self.start_t = time.perf_counter() if start_t is None else start_t
+        self.durations: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str) -> "_StageTimer":
+        """Context manager that records the elapsed time of the block under `name`."""
+        return _StageTimer(self, name)
+
+    def record(self, name: str, duration_s: float) -> None:
+        with self._lock:
+            self.durations[name] = self.durations.get(name, 0.0) + duration_s
+
+    def total_s(self) -> float:
+        return time.perf_counter() - self.start_t
+
+    def format(self, title: str = "Startup") -> str:
+        width = max((len(name) for name in self.durations), default=0)
+        lines = [f"{title} took {self.total_s():.2f}s:"]
+        lines += [f"  {name:<{width}}  {duration:6.2f}s" for name, duration in self.durations.items()]
+        return "\n".join(lines)
+
+
+class _StageTimer:
+    def __init__(self, times: StageTimes, name: str):
+        self._times = times
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> "_StageTimer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._times.record(self._name, time.perf_counter() - self._start)
+
+
+class _Timer:
+    def __init__(self, stats: LatencyStats):
+        self._stats = stats
+        self._start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stats.record(time.perf_counter() - self._start)
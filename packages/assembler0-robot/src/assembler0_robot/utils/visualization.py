@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+import logging
+import threading
+import time
+from typing import Any
+
+import numpy as np
+from lerobot.utils.visualization_utils import log_rerun_data
+
+from assembler0_robot.cameras.mjpeg import MJPEGFrame
+
+logger = logging.getLogger(__name__)
+
+
+def downsample_image(image, max_width: int) -> np.ndarray:
+    """Shrink an HWC image by an integer stride until it is at most `max_width` wide."""
+    if isinstance(image, MJPEGFrame):
+        # Scaled down while decoding, which is much cheaper than a full decode
+        image = image.decode_reduced(max_width)
+    if max_width <= 0 or image.ndim != 3 or image.shape[1] <= max_width:
+        return image
+    step = -(-image.shape[1] // max_width)
+    return np.ascontiguousarray(image[::step, ::step])
+
+
+class RerunVisualizer:
+    """Log observations and actions to rerun from a background thread.
+
+    The control loop calls `post()`, which only replaces the sample in a single-slot mailbox and sets an
+    event, so displaying costs the loop next to nothing. The display thread takes the latest sample,
+    downsamples the camera images and logs it, at most `display_fps` times per second. Samples posted in
+    between are overwritten, never queued.
+    """
+
+    def __init__(self, display_fps: float = 10.0, max_image_width: int = 320):
+        self.period_s = 1 / display_fps
+        self.max_image_width = max_image_width
+        self.posted = 0
+        self.displayed = 0
+
+        self._slot: tuple[dict[str, Any], dict[str, Any]] | None = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rerun-visualizer", daemon=True)
+        self._thread.start()
+
+    def post(self, observation: dict[str, Any], action: dict[str, Any]) -> None:
+        # A single attribute store, atomic under the GIL
+        self._slot = (observation, action)
+        self.posted += 1
+        self._ready.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._ready.set()
+        self._thread.join()
+        logger.debug(f"Visualizer displayed {self.displayed} of {self.posted} posted samples")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._ready.wait()
+            self._ready.clear()
+            sample, self._slot = self._slot, None
+            if sample is None:
+                continue
+
+            start = time.perf_counter()
+            observation, action = sample
+            observation = {
+                key: downsample_image(value, self.max_image_width)
+                if isinstance(value, (np.ndarray, MJPEGFrame))
+                else value
+                for key, value in observation.items()
+            }
+            try:
+                log_rerun_data(observation, action)
+                self.displayed += 1
+            except Exception as e:
+                logger.debug(f"Failed to log rerun data: {e}")
+
+            # Throttle to the display rate, whatever arrives meanwhile replaces the slot
+            self._stop.wait(max(0.0, self.period_s - (time.perf_counter() - start)))
@@ -0,0 +1,58 @@
+import shutil
+
+import numpy as np
+import pytest
+
+pytest.importorskip("lerobot")
+
+from assembler0_robot.recording.streaming_video import FrameSample, StreamingVideoDataset  # noqa: E402
+
+IMAGE_KEY = "observation.images.top"
+FEATURES = {
+    "observation.state": {"dtype": "float32", "shape": (2,), "names": ["a", "b"]},
+    "action": {"dtype": "float32", "shape": (2,), "names": ["a", "b"]},
+    IMAGE_KEY: {"dtype": "video", "shape": (48, 64, 3), "names": ["height", "width", "channels"]},
+}
+
+
+def test_frame_sample_spans_the_episode():
+    sample = FrameSample(size=10)
+    for i in range(1000):
+        sample.add(i, np.full((600, 800, 3), i % 256, dtype=np.uint8))
+
+    indices = [i for i, _ in sample.frames]
+    assert 10 <= len(indices) < 20
+    assert indices[0] == 0 and indices[-1] >= 1000 - sample.stride
+    # Downsampled like LeRobot's `sample_images`
+    assert sample.frames[0][1].shape == (120, 160, 3)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs the ffmpeg binary")
+def test_save_streamed_episode(tmp_path):
+    dataset = StreamingVideoDataset.create(
+        "test/streaming",
+        fps=30,
+        root=tmp_path / "dataset",
+        features=FEATURES,
+        use_videos=True,
+        streaming_options={"vcodec": "libx264"},
+    )
+    rng = np.random.default_rng(0)
+    for _ in range(40):
+        dataset.add_frame(
+            {
+                "observation.state": rng.random(2, dtype=np.float32),
+                "action": rng.random(2, dtype=np.float32),
+                IMAGE_KEY: rng.integers(0, 256, (48, 64, 3), dtype=np.uint8),
+            },
+            task="screw",
+        )
+    dataset.save_episode()
+
+    assert (dataset.root / dataset.meta.get_video_file_path(0, IMAGE_KEY)).stat().st_size > 0
+    image_stats = dataset.meta.episodes_stats[0][IMAGE_KEY]
+    assert image_stats["mean"].shape == (3, 1, 1)
+    assert 0.4 < float(image_stats["mean"].mean()) < 0.6
+    img_dir = dataset._get_image_file_path(episode_index=0, image_key=IMAGE_KEY, frame_index=0).parent
+    assert not img_dir.exists()
+    assert dataset.streamed_frames == 40
@@ -343,11 +343,15 @@ def robot():
 @click.option("--clutch-ratio", default=0.5, help="Clutch ratio")
 @click.option("--clutch-cooldown-s", default=1.0, help="Clutch cooldown in seconds")
 @click.option("--base-dir", default="wandb_downloads", help="Base directory for downloaded artifacts")
+@click.option("--backend", default="torch", type=click.Choice(["torch", "onnx"]),
+              help="Inference backend, onnx needs a prior 'drex robot export-onnx'")
+@click.option("--policy-server", default=None,
+              help="Socket of a running 'drex robot serve' serving these weights, instead of loading them here")
 def run(wandb_weights_path: str, robot_port: str, robot_id: str, screwdriver_camera: str,
         side_camera: str, top_camera: str, camera_width: int, camera_height: int,
         camera_fps: int, duration: int, fps: int, device: str,
         screwdriver_current_limit: int, clutch_ratio: float, clutch_cooldown_s: float,
-        base_dir: str):
+        base_dir: str, backend: str, policy_server: str):
     """Run robot inference with Weights & Biases model weights.
     
     Downloads the weights if not already present, then runs inference.
@@ -518,8 +522,11 @@ def run(wandb_weights_path: str, robot_port: str, robot_id: str, screwdriver_cam
         f"--device={device}",
         f"--screwdriver_current_limit={screwdriver_current_limit}",
         f"--clutch_ratio={clutch_ratio}",
-        f"--clutch_cooldown_s={clutch_cooldown_s}"
+        f"--clutch_cooldown_s={clutch_cooldown_s}",
+        f"--backend={backend}",
     ]
+    if policy_server:
+        cmd.append(f"--policy_server={policy_server}")
     
     console.print(f"\n📋 Running command:", style="dim")
     console.print(" ".join(cmd), style="dim")
@@ -533,6 +540,83 @@ def run(wandb_weights_path: str, robot_port: str, robot_id: str, screwdriver_cam
         console.print(f"\n⚠️  Inference interrupted by user", style="yellow")
 
 
+@robot.command("export-onnx")
+@click.argument("model_path", required=True)
+@click.option("--output", default=None, help="Output ONNX file (default: <model_path>/model.onnx)")
+@click.option("--opset", default=17, help="ONNX opset version")
+@click.option("--num-samples", default=8, help="Sample observations for the PyTorch parity check")
+@click.option("--atol", default=1e-3, help="Largest action difference allowed between PyTorch and ONNX")
+@click.option("--benchmark-iterations", default=50, help="Timed steps per backend, 0 to skip the comparison")
+def export_onnx(model_path: str, output: str, opset: int, num_samples: int, atol: float,
+                benchmark_iterations: int):
+    """Export an ACT pretrained_model directory to ONNX for CPU inference.
+
+    Normalization is baked into the exported model, its output is checked against
+    PyTorch, and both are timed on this machine's CPU.
+
+    Example: drex robot export-onnx wandb_downloads/my_run/6000/pretrained_model
+    """
+    import subprocess
+
+    if not Path(model_path).is_dir():
+        console.print(f"❌ Error: {model_path} is not a pretrained_model directory", style="red")
+        return
+
+    cmd = [
+        "python", "-m", "assembler0_robot.scripts.export_onnx",
+        f"--model_path={model_path}",
+        f"--opset={opset}",
+        f"--num_samples={num_samples}",
+        f"--atol={atol}",
+        f"--benchmark_iterations={benchmark_iterations}",
+    ]
+    if output:
+        cmd.append(f"--output={output}")
+
+    console.print(f"\n📦 Exporting {model_path} to ONNX", style="green")
+    try:
+        subprocess.run(cmd, check=True)
+        console.print(f"\n✅ Export completed, run it with: drex robot run ... --backend onnx", style="green")
+    except subprocess.CalledProcessError as e:
+        console.print(f"\n❌ Error exporting model: {e}", style="red")
+
+
+@robot.command()
+@click.argument("model_paths", nargs=-1, required=True)
+@click.option("--socket-path", default="/tmp/assembler0_policy.sock", help="Unix socket to listen on")
+@click.option("--device", default="cuda", help="Device (cuda/cpu)")
+@click.option("--backend", default="torch", type=click.Choice(["torch", "onnx"]),
+              help="Inference backend, onnx needs a prior 'drex robot export-onnx'")
+@click.option("--batch-window-ms", default=None, type=float,
+              help="Batch requests from several robots sharing a model, waiting up to this long for a batch")
+def serve(model_paths: tuple[str, ...], socket_path: str, device: str, backend: str, batch_window_ms: float | None):
+    """Load pretrained_model directories once and serve them to 'drex robot run --policy-server'.
+
+    Runs until interrupted, so switching between runs skips loading the model.
+
+    Example: drex robot serve wandb_downloads/my_run/6000/pretrained_model
+    """
+    import subprocess
+
+    cmd = [
+        "python", "-m", "assembler0_robot.scripts.policy_server",
+        f"--model_paths={','.join(model_paths)}",
+        f"--socket_path={socket_path}",
+        f"--device={device}",
+        f"--backend={backend}",
+    ]
+    if batch_window_ms is not None:
+        cmd.append(f"--batch_window_ms={batch_window_ms}")
+
+    console.print(f"\n🛰️  Serving {len(model_paths)} model(s) on {socket_path}", style="green")
+    try:
+        subprocess.run(cmd, check=True)
+    except subprocess.CalledProcessError as e:
+        console.print(f"\n❌ Error running the policy server: {e}", style="red")
+    except KeyboardInterrupt:
+        console.print(f"\n⚠️  Policy server stopped", style="yellow")
+
+
 @cli.group()
 def wandb():
     """Weights & Biases commands."""
@@ -36,4 +36,6 @@ python -m assembler0_robot.scripts.record \
     --display_data=false \
     --play_sounds=false \
     --log_level=INFO \
+    --async_dataset_writer=true \
+    --journal=true \
     --batch_encoding_size=${NUM_EPISODES}
\ No newline at end of file